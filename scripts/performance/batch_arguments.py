@@ -0,0 +1,104 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Compares loading the arguments of batch data plane commands with and without the argument cache.
+
+Usage: python scripts/performance/batch_arguments.py [--count N]
+
+Reports the time to load the arguments of a few large operations by inspecting the SDK and from the cache in a
+temporary config dir, and checks that both produce the same arguments. Requires azure-cli-batch to be installed,
+the cache is keyed on its version.
+"""
+
+from __future__ import print_function
+
+import argparse
+import importlib
+import shutil
+import sys
+import tempfile
+import timeit
+
+OPERATIONS = [
+    ('azure.batch.operations.pool_operations#PoolOperations.add', {}),
+    ('azure.batch.operations.job_operations#JobOperations.add', {}),
+    ('azure.batch.operations.job_schedule_operations#JobScheduleOperations.add', {'flatten': 4}),
+    ('azure.batch.operations.task_operations#TaskOperations.add', {'flatten': 1}),
+    ('azure.batch.operations.job_operations#JobOperations.list', {}),
+]
+
+
+class _Config(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+
+class _CliContext(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, config_dir):
+        self.config = _Config(config_dir)
+
+
+class _CommandLoader(object):  # pylint: disable=too-few-public-methods
+    """Resolves operations like AzCommandsLoader, with a CLI context to cache the arguments in if config_dir is set."""
+
+    def __init__(self, config_dir=None):
+        if config_dir:
+            self.cli_ctx = _CliContext(config_dir)
+
+    @staticmethod
+    def get_op_handler(operation):
+        module_name, attrs = operation.split('#')
+        handler = importlib.import_module(module_name)
+        for attr in attrs.split('.'):
+            handler = getattr(handler, attr)
+        return handler
+
+
+def load_arguments(loader):
+    from azure.cli.command_modules.batch._command_type import AzureBatchDataPlaneCommand
+    return [list(AzureBatchDataPlaneCommand(operation, loader, **kwargs).argument_loader())
+            for operation, kwargs in OPERATIONS]
+
+
+def describe(arguments):
+    def _setting(value):
+        return getattr(value, '__name__', value) if callable(value) else value
+    return [(name, sorted((k, _setting(v)) for k, v in argument.type.settings.items() if k != 'completer'))
+            for name, argument in arguments]
+
+
+def measure(loader, count):
+    return timeit.timeit(lambda: load_arguments(loader), number=count) / count
+
+
+def main():
+    from azure.cli.command_modules.batch._command_type import ARGUMENT_CACHE, _get_argument_cache_prefix
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--count', type=int, default=50, help='times the arguments are loaded')
+    args = arg_parser.parse_args()
+
+    if not _get_argument_cache_prefix():
+        print('azure-cli-batch is not installed, its arguments are not cached.')
+        sys.exit(1)
+
+    config_dir = tempfile.mkdtemp()
+    try:
+        uncached, cached = _CommandLoader(), _CommandLoader(config_dir)
+        load_arguments(cached)  # fill the cache
+        for (operation, _), expected, actual in zip(OPERATIONS, load_arguments(uncached), load_arguments(cached)):
+            if describe(expected) != describe(actual):
+                print('Cached arguments differ for: {}'.format(operation))
+                sys.exit(1)
+
+        print('{:<10}{:>22}'.format('arguments', 'load {} ops (ms)'.format(len(OPERATIONS))))
+        for name, loader in [('uncached', uncached), ('cached', cached)]:
+            print('{:<10}{:>22.2f}'.format(name, measure(loader, args.count) * 1000))
+    finally:
+        ARGUMENT_CACHE.flush()
+        shutil.rmtree(config_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Compares the hand-written metric alert condition parser with the generated ANTLR parser.
+
+Usage: python scripts/performance/metric_alert_condition.py [--loop N] [--count N]
+
+Reports the time to import each parser in a fresh interpreter and the number of conditions each parser handles per
+second, and checks that both parsers agree on the conditions used for the measurement.
+"""
+
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+import timeit
+
+CONDITIONS = [
+    'avg Percentage CPU > 90',
+    "max 'Disk Read Bytes' >= 1048576",
+    'total transactions > 5 where ResponseType includes Success and ApiName includes GetBlob',
+    'avg SuccessE2ELatency > 250 where ApiName includes GetBlob or PutBlob',
+    'min Storage.Availability < 99.9 where GeoType includes Primary',
+]
+
+IMPORT_STATEMENTS = {
+    'antlr': 'import antlr4; from azure.cli.command_modules.monitor.grammar import ('
+             'MetricAlertConditionLexer, MetricAlertConditionParser, MetricAlertConditionValidator)',
+    'hand-written': 'from azure.cli.command_modules.monitor._metric_alert_condition import '
+                    'parse_metric_alert_condition'
+}
+
+
+def parse_with_antlr(text):
+    import antlr4
+    from azure.cli.command_modules.monitor.grammar import (
+        MetricAlertConditionLexer, MetricAlertConditionParser, MetricAlertConditionValidator)
+    lexer = MetricAlertConditionLexer(antlr4.InputStream(text))
+    parser = MetricAlertConditionParser(antlr4.CommonTokenStream(lexer))
+    validator = MetricAlertConditionValidator()
+    antlr4.ParseTreeWalker().walk(validator, parser.expression())
+    return validator.result()
+
+
+def parse_with_hand_written(text):
+    from azure.mgmt.monitor.models import MetricCriteria, MetricDimension
+    from azure.cli.command_modules.monitor._metric_alert_condition import parse_metric_alert_condition
+    parameters = parse_metric_alert_condition(text)
+    parameters['dimensions'] = [MetricDimension(**d) for d in parameters['dimensions']]
+    return MetricCriteria(**parameters)
+
+
+def measure_import(statement, loop):
+    script = 'import time; start = time.time(); {}; print(time.time() - start)'.format(statement)
+    timings = [float(subprocess.check_output([sys.executable, '-c', script])) for _ in range(loop)]
+    return min(timings)
+
+
+def measure_throughput(parse, count):
+    elapsed = timeit.timeit(lambda: [parse(c) for c in CONDITIONS], number=max(count // len(CONDITIONS), 1))
+    return count / elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--loop', type=int, default=5, help='interpreters started to measure import time')
+    arg_parser.add_argument('--count', type=int, default=5000, help='conditions parsed to measure throughput')
+    args = arg_parser.parse_args()
+
+    for condition in CONDITIONS:
+        if parse_with_antlr(condition).serialize() != parse_with_hand_written(condition).serialize():
+            print('Parsers disagree on: {}'.format(condition))
+            sys.exit(1)
+
+    print('{:<14}{:>16}{:>22}'.format('parser', 'import (ms)', 'conditions / second'))
+    for name, parse in [('antlr', parse_with_antlr), ('hand-written', parse_with_hand_written)]:
+        import_time = measure_import(IMPORT_STATEMENTS[name], args.loop) * 1000
+        print('{:<14}{:>16.1f}{:>22.0f}'.format(name, import_time, measure_throughput(parse, args.count)))
+
+
+if __name__ == '__main__':
+    main()
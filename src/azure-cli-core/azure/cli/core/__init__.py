@@ -36,7 +36,7 @@ class AzCli(CLI):
         from azure.cli.core.commands.arm import add_id_parameters, register_global_subscription_parameter
         from azure.cli.core.cloud import get_active_cloud
         from azure.cli.core.extensions import register_extensions
-        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
 
         import knack.events as events
         from knack.util import ensure_dir
@@ -52,6 +52,7 @@ class AzCli(CLI):
         ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
         CONFIG.load(os.path.join(azure_folder, 'az.json'))
         SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+        INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
         self.cloud = get_active_cloud(self)
         logger.debug('Current cloud config:\n%s', str(self.cloud.name))
 
@@ -60,6 +61,12 @@ class AzCli(CLI):
         register_global_subscription_parameter(self)
 
         self.progress_controller = None
+        self.invocation_out_file = None
+
+    def invoke(self, args, initial_invocation_data=None, out_file=None):
+        # kept for the output of the invocations which succeeded when a command fails
+        self.invocation_out_file = out_file or self.out_file
+        return super(AzCli, self).invoke(args, initial_invocation_data=initial_invocation_data, out_file=out_file)
 
     def refresh_request_id(self):
         """Assign a new random GUID as x-ms-client-request-id
@@ -85,8 +92,13 @@ class AzCli(CLI):
         from azure.cli.core.util import get_az_version_string
         print(get_az_version_string())
 
-    def exception_handler(self, ex):  # pylint: disable=no-self-use
+    def exception_handler(self, ex):
         from azure.cli.core.util import handle_exception
+        from azure.cli.core.commands import InvocationsFailedError
+        if isinstance(ex, InvocationsFailedError) and ex.result.result is not None:
+            # Output the results of the invocations which succeeded before reporting the failures.
+            formatter = self.output.get_formatter(self.invocation.data['output'])
+            self.output.out(ex.result, formatter=formatter, out_file=self.invocation_out_file or self.out_file)
         return handle_exception(ex)
 
 
@@ -104,7 +116,7 @@ class MainCommandsLoader(CLICommandsLoader):
                 loader.command_table = self.command_table
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
-    def load_command_table(self, args):
+    def load_command_table(self, args):  # pylint: disable=too-many-statements
         from importlib import import_module
         import pkgutil
         import traceback
@@ -113,11 +125,7 @@ class MainCommandsLoader(CLICommandsLoader):
         from azure.cli.core.extension import (
             get_extensions, get_extension_path, get_extension_modname)
 
-        def _update_command_table_from_modules(args):
-            '''Loads command table(s)
-            When `module_name` is specified, only commands from that module will be loaded.
-            If the module is not found, all commands are loaded.
-            '''
+        def _get_installed_command_modules():
             installed_command_modules = []
             try:
                 mods_ns_pkg = import_module('azure.cli.command_modules')
@@ -127,8 +135,14 @@ class MainCommandsLoader(CLICommandsLoader):
             except ImportError:
                 pass
             logger.debug('Installed command modules %s', installed_command_modules)
+            return installed_command_modules
+
+        def _update_command_table_from_modules(args, command_modules):
+            '''Loads command table(s)
+            Only the commands from the given `command_modules` are loaded.
+            '''
             cumulative_elapsed_time = 0
-            for mod in [m for m in installed_command_modules if m not in BLACKLISTED_MODS]:
+            for mod in [m for m in command_modules if m not in BLACKLISTED_MODS]:
                 try:
                     start_time = timeit.default_timer()
                     module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
@@ -136,6 +150,7 @@ class MainCommandsLoader(CLICommandsLoader):
                         cmd.command_source = mod
                     self.command_table.update(module_command_table)
                     self.command_group_table.update(module_group_table)
+                    _add_to_index_entries(module_command_table, 'modules', mod)
                     elapsed_time = timeit.default_timer() - start_time
                     logger.debug("Loaded module '%s' in %.3f seconds.", mod, elapsed_time)
                     cumulative_elapsed_time += elapsed_time
@@ -151,7 +166,7 @@ class MainCommandsLoader(CLICommandsLoader):
                          "(note: there's always an overhead with the first module loaded)",
                          cumulative_elapsed_time)
 
-        def _update_command_table_from_extensions(ext_suppressions):
+        def _update_command_table_from_extensions(ext_suppressions, extensions):
 
             def _handle_extension_suppressions(extensions):
                 filtered_extensions = []
@@ -164,7 +179,6 @@ class MainCommandsLoader(CLICommandsLoader):
                         filtered_extensions.append(ext)
                 return filtered_extensions
 
-            extensions = get_extensions()
             if extensions:
                 logger.debug("Found %s extensions: %s", len(extensions), [e.name for e in extensions])
                 allowed_extensions = _handle_extension_suppressions(extensions)
@@ -190,6 +204,7 @@ class MainCommandsLoader(CLICommandsLoader):
 
                         self.command_table.update(extension_command_table)
                         self.command_group_table.update(extension_group_table)
+                        _add_to_index_entries(extension_command_table, 'extensions', ext_name)
                         elapsed_time = timeit.default_timer() - start_time
                         logger.debug("Loaded extension '%s' in %.3f seconds.", ext_name, elapsed_time)
                     except Exception:  # pylint: disable=broad-except
@@ -197,6 +212,12 @@ class MainCommandsLoader(CLICommandsLoader):
                         logger.warning("Unable to load extension '%s'. Use --debug for more information.", ext_name)
                         logger.debug(traceback.format_exc())
 
+        def _add_to_index_entries(command_table, source_type, source_name):
+            for cmd_name in command_table:
+                entry = index_entries.setdefault(cmd_name.split()[0], {'modules': [], 'extensions': []})
+                if source_name not in entry[source_type]:
+                    entry[source_type].append(source_name)
+
         def _wrap_suppress_extension_func(func, ext):
             """ Wrapper method to handle centralization of log messages for extension filters """
             res = func(ext)
@@ -223,16 +244,40 @@ class MainCommandsLoader(CLICommandsLoader):
                     res.append(sup)
             return res
 
-        _update_command_table_from_modules(args)
+        index_entries = {}
+        installed_command_modules = _get_installed_command_modules()
+        try:
+            extensions = get_extensions()
+        except Exception:  # pylint: disable=broad-except
+            extensions = None
+            logger.warning("Unable to load extensions. Use --debug for more information.")
+            logger.debug(traceback.format_exc())
+
+        command_index = None
+        if args and not args[0].startswith('-') and extensions is not None and \
+                self.cli_ctx.config.getboolean('core', 'use_command_index', fallback=True):
+            command_index = CommandIndex(self.cli_ctx, installed_command_modules, extensions)
+        index_result = command_index.get(args) if command_index else None
+        if index_result:
+            index_modules, index_extensions = index_result
+            command_modules = [m for m in index_modules if m in installed_command_modules]
+            extensions = [e for e in extensions if e.name in index_extensions]
+        else:
+            command_modules = installed_command_modules
+
+        _update_command_table_from_modules(args, command_modules)
         try:
             ext_suppressions = _get_extension_suppressions(self.loaders)
             # We always load extensions even if the appropriate module has been loaded
             # as an extension could override the commands already loaded.
-            _update_command_table_from_extensions(ext_suppressions)
+            _update_command_table_from_extensions(ext_suppressions, extensions)
         except Exception:  # pylint: disable=broad-except
             logger.warning("Unable to load extensions. Use --debug for more information.")
             logger.debug(traceback.format_exc())
 
+        if command_index and not index_result:
+            command_index.update(index_entries)
+
         return self.command_table
 
     def load_arguments(self, command):
@@ -257,6 +302,66 @@ class MainCommandsLoader(CLICommandsLoader):
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
 
+class CommandIndex(object):
+    """ A persistent map of top-level command names to the command modules and extensions that provide them.
+
+    The index lets a command such as `az vm show` import only the `vm` command loader instead of every installed
+    command module and extension. It is keyed on the core version, the active cloud profile and the installed
+    command modules and extensions, so any change to those invalidates it and the next full load rebuilds it.
+    """
+
+    _COMMAND_INDEX = 'commandIndex'
+    _COMMAND_INDEX_KEY = 'key'
+
+    def __init__(self, cli_ctx, installed_command_modules, extensions):
+        from azure.cli.core._session import INDEX
+        from azure.cli.core.extension import get_extension_path
+        self.INDEX = INDEX
+        # Installing, upgrading or removing a command module or extension touches these directories.
+        self.key = {
+            'version': __version__,
+            'cloudProfile': cli_ctx.cloud.profile,
+            'modules': sorted(installed_command_modules),
+            'modulePaths': {path: CommandIndex._get_mtime(path) for path in CommandIndex._get_command_module_paths()},
+            'extensions': {ext.name: CommandIndex._get_mtime(get_extension_path(ext.name)) for ext in extensions}
+        }
+
+    @staticmethod
+    def _get_command_module_paths():
+        from importlib import import_module
+        try:
+            return list(import_module('azure.cli.command_modules').__path__)
+        except ImportError:
+            return []
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except (OSError, IOError):
+            return None
+
+    def get(self, args):
+        """ Returns a tuple of (command modules, extension names) that provide the top-level command in `args`,
+        or None if the index is stale or does not know the command. """
+        if self.INDEX.get(self._COMMAND_INDEX_KEY) != self.key:
+            logger.debug("Command index is missing or out of date.")
+            return None
+        entry = self.INDEX.get(self._COMMAND_INDEX, {}).get(args[0])
+        if not entry:
+            logger.debug("Command '%s' not found in command index.", args[0])
+            return None
+        logger.debug("Command index found modules %s and extensions %s for '%s'.",
+                     entry['modules'], entry['extensions'], args[0])
+        return entry['modules'], entry['extensions']
+
+    def update(self, index_entries):
+        self.INDEX.data[self._COMMAND_INDEX_KEY] = self.key
+        self.INDEX.data[self._COMMAND_INDEX] = index_entries
+        self.INDEX.save_with_retry()
+        logger.debug("Updated command index with %s top-level commands.", len(index_entries))
+
+
 class ModExtensionSuppress(object):  # pylint: disable=too-few-public-methods
 
     def __init__(self, mod_name, suppress_extension_name, suppress_up_to_version, reason=None, recommend_remove=False):
@@ -10,6 +10,8 @@ import errno
 import json
 import os
 import os.path
+import threading
+import time
 from copy import deepcopy
 from enum import Enum
 from six.moves import BaseHTTPServer
@@ -19,7 +21,8 @@ from knack.util import CLIError
 
 from azure.cli.core._environment import get_config_dir
 from azure.cli.core._session import ACCOUNT
-from azure.cli.core.util import get_file_json, in_cloud_console, open_page_in_browser, can_launch_browser
+from azure.cli.core.util import (get_file_json, in_cloud_console, open_page_in_browser, can_launch_browser,
+                                 write_file_atomically)
 from azure.cli.core.cloud import get_active_cloud, set_cloud_subscription
 
 logger = get_logger(__name__)
@@ -53,6 +56,16 @@ _TOKEN_ENTRY_TOKEN_TYPE = 'tokenType'
 _ACCESS_TOKEN = 'accessToken'
 _REFRESH_TOKEN = 'refreshToken'
 
+# Service principal access tokens are reused until they are within this many seconds of expiring
+_SERVICE_PRINCIPAL_TOKEN_REFRESH_AHEAD_SECONDS = 300
+_SERVICE_PRINCIPAL_TOKEN_FILE = 'servicePrincipalTokens.json'
+_SERVICE_PRINCIPAL_TOKEN_RESOURCE = 'resource'
+_SERVICE_PRINCIPAL_TOKEN_ENTRY = 'tokenEntry'
+_SERVICE_PRINCIPAL_TOKEN_EXPIRES_AT = 'expiresAt'
+
+# Tokens handed out by TokenProvider are reused until they are within this many seconds of expiring
+_TOKEN_PROVIDER_REFRESH_AHEAD_SECONDS = 300
+
 TOKEN_FIELDS_EXCLUDED_FROM_PERSISTENCE = ['familyName',
                                           'givenName',
                                           'isUserIdDisplayable',
@@ -653,6 +666,69 @@ class Profile(object):
         return installation_id
 
 
+def get_token_provider(cli_ctx):
+    """ Get the bearer token provider shared by the clients created with the CLI context. """
+    with TokenProvider.lock:
+        provider = cli_ctx.data['token_provider']
+        if provider is None:
+            provider = cli_ctx.data['token_provider'] = TokenProvider(cli_ctx)
+        return provider
+
+
+def _get_token_expiration(token_entry):
+    """ Seconds since the epoch at which the token expires, 0 when unknown. """
+    expires_on = token_entry.get('expires_on')  # MSI and Cloud Shell tokens, in seconds since the epoch
+    if expires_on:
+        try:
+            return float(expires_on)
+        except (TypeError, ValueError):
+            pass
+    expires_on = token_entry.get('expiresOn')  # ADAL tokens, in local time
+    if expires_on:
+        import calendar
+        from dateutil import parser
+        try:
+            expires_on = parser.parse(expires_on)
+        except (TypeError, ValueError, OverflowError):
+            return 0
+        if expires_on.tzinfo:
+            return calendar.timegm(expires_on.utctimetuple())
+        return time.mktime(expires_on.timetuple())
+    return 0
+
+
+class TokenProvider(object):
+    """ Thread safe cache of the bearer tokens of the accounts in the profile per user, tenant and resource.
+
+    Data-plane clients authenticate every request, or every challenge, with a callback. The callbacks get their
+    tokens from here instead of building a Profile and looking the token up in the ADAL cache each time, so that a
+    command issuing many requests only retrieves a token once and again when it is about to expire.
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, cli_ctx):
+        self.cli_ctx = cli_ctx
+        self._tokens = {}
+        self._tokens_lock = threading.Lock()
+
+    def get_raw_token(self, resource=None, subscription=None):
+        """ Same as `Profile.get_raw_token`, reusing the token until it is about to expire. """
+        profile = Profile(cli_ctx=self.cli_ctx)
+        account = profile.get_subscription(subscription)
+        resource = resource or self.cli_ctx.cloud.endpoints.active_directory_resource_id
+        key = (account[_USER_ENTITY][_USER_NAME], account[_TENANT_ID], resource)
+        with self._tokens_lock:
+            expires_at, creds = self._tokens.get(key, (0, None))
+            if expires_at <= time.time() + _TOKEN_PROVIDER_REFRESH_AHEAD_SECONDS:
+                creds = profile.get_raw_token(resource, account[_SUBSCRIPTION_ID])[0]
+                expires_at = _get_token_expiration(creds[2])
+                self._tokens[key] = (expires_at, creds)
+        return (creds,
+                str(account[_SUBSCRIPTION_ID]),
+                str(account[_TENANT_ID]))
+
+
 class MsiAccountTypes(object):
     # pylint: disable=no-method-argument,no-self-argument
     system_assigned = 'MSI'
@@ -822,6 +898,10 @@ class CredsCache(object):
         self._token_file = (os.environ.get('AZURE_ACCESS_TOKEN_FILE', None) or
                             os.path.join(get_config_dir(), 'accessTokens.json'))
         self._service_principal_creds = []
+        self._service_principal_token_file = os.path.join(os.path.dirname(self._token_file),
+                                                          _SERVICE_PRINCIPAL_TOKEN_FILE)
+        self._service_principal_tokens_attr = None
+        self._service_principal_tokens_lock = threading.Lock()
         self._auth_ctx_factory = auth_ctx_factory
         self._adal_token_cache_attr = None
         self._should_flush_to_disk = False
@@ -869,12 +949,77 @@ class CredsCache(object):
         if not matched:
             raise CLIError("Please run 'az account set' to select active account.")
         cred = matched[0]
-        context = self._auth_ctx_factory(self._ctx, cred[_SERVICE_PRINCIPAL_TENANT], None)
-        sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
-                                       cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None))
-        token_entry = sp_auth.acquire_token(context, resource, sp_id)
+        tenant = cred[_SERVICE_PRINCIPAL_TENANT]
+        with self._service_principal_tokens_lock:
+            token_entry = self._find_service_principal_token(sp_id, tenant, resource)
+            if not token_entry:
+                context = self._auth_ctx_factory(self._ctx, tenant, None)
+                sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
+                                               cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None))
+                token_entry = sp_auth.acquire_token(context, resource, sp_id)
+                self._save_service_principal_token(sp_id, tenant, resource, token_entry)
         return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
 
+    @property
+    def service_principal_tokens(self):
+        if self._service_principal_tokens_attr is None:
+            self._service_principal_tokens_attr = self._load_service_principal_tokens()
+        return self._service_principal_tokens_attr
+
+    def _load_service_principal_tokens(self):
+        try:
+            entries = _load_tokens_from_file(self._service_principal_token_file)
+        except CLIError as ex:
+            # the tokens can always be acquired again, so a corrupted file is not fatal
+            logger.debug("Ignoring cached service principal tokens: %s", ex)
+            return []
+        now = time.time()
+        return [x for x in entries if x.get(_SERVICE_PRINCIPAL_TOKEN_EXPIRES_AT, 0) > now]
+
+    def _find_service_principal_token(self, sp_id, tenant, resource):
+        refresh_after = time.time() + _SERVICE_PRINCIPAL_TOKEN_REFRESH_AHEAD_SECONDS
+        for entry in self.service_principal_tokens:
+            if (entry[_SERVICE_PRINCIPAL_ID] == sp_id and entry[_SERVICE_PRINCIPAL_TENANT] == tenant and
+                    entry[_SERVICE_PRINCIPAL_TOKEN_RESOURCE] == resource and
+                    entry[_SERVICE_PRINCIPAL_TOKEN_EXPIRES_AT] > refresh_after):
+                return entry[_SERVICE_PRINCIPAL_TOKEN_ENTRY]
+        return None
+
+    def _save_service_principal_token(self, sp_id, tenant, resource, token_entry):
+        try:
+            expires_in = int(token_entry.get('expiresIn', 0))
+        except (TypeError, ValueError):
+            expires_in = 0
+        if expires_in <= _SERVICE_PRINCIPAL_TOKEN_REFRESH_AHEAD_SECONDS:
+            return
+        expires_at = time.time() + expires_in
+        # merge with tokens persisted by other az processes since this one loaded the file
+        self._service_principal_tokens_attr = [
+            x for x in self._load_service_principal_tokens()
+            if not (x[_SERVICE_PRINCIPAL_ID] == sp_id and x[_SERVICE_PRINCIPAL_TENANT] == tenant and
+                    x[_SERVICE_PRINCIPAL_TOKEN_RESOURCE] == resource)]
+        self._service_principal_tokens_attr.append({
+            _SERVICE_PRINCIPAL_ID: sp_id,
+            _SERVICE_PRINCIPAL_TENANT: tenant,
+            _SERVICE_PRINCIPAL_TOKEN_RESOURCE: resource,
+            _SERVICE_PRINCIPAL_TOKEN_EXPIRES_AT: expires_at,
+            _SERVICE_PRINCIPAL_TOKEN_ENTRY: token_entry
+        })
+        self._persist_service_principal_tokens()
+
+    def _remove_service_principal_tokens(self, sp_id):
+        remaining = [x for x in self.service_principal_tokens if x[_SERVICE_PRINCIPAL_ID] != sp_id]
+        if len(remaining) != len(self.service_principal_tokens):
+            self._service_principal_tokens_attr = remaining
+            self._persist_service_principal_tokens()
+
+    def _persist_service_principal_tokens(self):
+        try:
+            write_file_atomically(self._service_principal_token_file,
+                                  json.dumps(self._service_principal_tokens_attr))
+        except (OSError, IOError) as ex:
+            logger.debug("Failed to persist service principal tokens: %s", ex)
+
     def retrieve_secret_of_service_principal(self, sp_id):
         self.load_adal_token_cache()
         matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
@@ -908,6 +1053,7 @@ class CredsCache(object):
                     sp_entry.get(_SERVICE_PRINCIPAL_CERT_FILE, None) != matched[0].get(_SERVICE_PRINCIPAL_CERT_FILE, None)):
                 self._service_principal_creds.remove(matched[0])
                 self._service_principal_creds.append(sp_entry)
+                self._remove_service_principal_tokens(sp_entry[_SERVICE_PRINCIPAL_ID])
                 state_changed = True
         else:
             self._service_principal_creds.append(sp_entry)
@@ -937,6 +1083,7 @@ class CredsCache(object):
             state_changed = True
             self._service_principal_creds = [x for x in self._service_principal_creds
                                              if x not in matched]
+            self._remove_service_principal_tokens(user_or_sp)
 
         if state_changed:
             self.persist_cached_creds()
@@ -944,6 +1091,8 @@ class CredsCache(object):
     def remove_all_cached_creds(self):
         # we can clear file contents, but deleting it is simpler
         _delete_file(self._token_file)
+        _delete_file(self._service_principal_token_file)
+        self._service_principal_tokens_attr = []
 
 
 class ServicePrincipalAuth(object):
@@ -1068,8 +1217,6 @@ def _get_authorization_code_worker(authority_url, resource, results):
 
 
 def _get_authorization_code(resource, authority_url):
-    import threading
-    import time
     results = {}
     t = threading.Thread(target=_get_authorization_code_worker,
                          args=(authority_url, resource, results))
@@ -3,8 +3,10 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import atexit
 import json
 import os
+import threading
 import time
 
 try:
@@ -13,6 +15,7 @@ except ImportError:
     import collections
 
 from codecs import open as codecs_open
+from contextlib import contextmanager
 
 from knack.log import get_logger
 
@@ -22,12 +25,46 @@ except AttributeError:  # in Python 2.7
     t_JSONDecodeError = ValueError
 
 
+@contextmanager
+def _file_lock(filename):
+    """ Holds an exclusive lock on `<filename>.lock` so that concurrent processes read and write the file in turn. """
+    try:
+        lock_file = open(filename + '.lock', 'a')
+    except (OSError, IOError):
+        # e.g. a read-only configuration directory, proceed without the lock
+        yield
+        return
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
+
+
 class Session(collections.MutableMapping):
     """
     A simple dict-like class that is backed by a JSON file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    Direct modifications are written once, when the process exits or `flush` is called. Indirect modifications should
+    be followed by a call to `save_with_retry` or `save`, which write immediately.
+
+    The file is read and written under an inter-process lock and replaced atomically. When another process changed
+    the file in the meantime, only the keys modified by this process are written over its content. The file is not
+    parsed again when it is loaded a second time without having changed.
     """
 
     def __init__(self, encoding=None):
@@ -35,26 +72,43 @@ class Session(collections.MutableMapping):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        self._lock = threading.RLock()
+        self._file_stat = None
+        self._modified_keys = set()
+        self._deleted_keys = set()
+        self._accessed_keys = set()
+        self._flush_registered = False
 
     def load(self, filename, max_age=0):
-        self.filename = filename
-        self.data = {}
-        try:
-            if max_age > 0:
-                st = os.stat(self.filename)
-                if st.st_mtime + max_age < time.clock():
+        with self._lock:
+            if self.filename and self._modified_keys | self._deleted_keys:
+                self.flush()
+            if filename == self.filename and self._file_stat is not None and \
+                    self._file_stat == self._get_file_stat():
+                return
+            self.filename = filename
+            self.data = {}
+            self._file_stat = None
+            self._accessed_keys.clear()
+            try:
+                if max_age > 0:
+                    st = os.stat(self.filename)
+                    if st.st_mtime + max_age < time.clock():
+                        self.save()
+                with _file_lock(self.filename):
+                    self.data = self._read()
+            except (OSError, IOError, t_JSONDecodeError):
+                if not os.path.isfile(self.filename):
                     self.save()
-            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
-                self.data = json.load(f)
-        except (OSError, IOError, t_JSONDecodeError):
-            get_logger(__name__).warning("Fail to load or parse file %s. It is overridden by default settings.",
-                                         self.filename)
-            self.save()
+                    return
+                get_logger(__name__).warning("Fail to load or parse file %s. It is overridden by default settings.",
+                                             self.filename)
+                self.save()
 
     def save(self):
-        if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+        """ Writes the modified and the accessed keys, which may have been modified indirectly, to the file. """
+        with self._lock:
+            self._write(self._modified_keys | self._accessed_keys)
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -66,19 +120,36 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    def flush(self):
+        """ Writes the pending direct modifications to the file. """
+        with self._lock:
+            if self._modified_keys or self._deleted_keys:
+                try:
+                    self._write(self._modified_keys)
+                except (OSError, IOError) as ex:
+                    get_logger(__name__).warning("Failed to save file %s: %s", self.filename, ex)
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
     def __getitem__(self, key):
-        return self.data.setdefault(key, {})
+        with self._lock:
+            self._accessed_keys.add(key)
+            return self.data.setdefault(key, {})
 
     def __setitem__(self, key, value):
-        self.data[key] = value
-        self.save_with_retry()
+        with self._lock:
+            self.data[key] = value
+            self._modified_keys.add(key)
+            self._deleted_keys.discard(key)
+            self._defer_flush()
 
     def __delitem__(self, key):
-        del self.data[key]
-        self.save_with_retry()
+        with self._lock:
+            del self.data[key]
+            self._deleted_keys.add(key)
+            self._modified_keys.discard(key)
+            self._defer_flush()
 
     def __iter__(self):
         return iter(self.data)
@@ -86,6 +157,56 @@ class Session(collections.MutableMapping):
     def __len__(self):
         return len(self.data)
 
+    def _defer_flush(self):
+        if not self._flush_registered:
+            atexit.register(self.flush)
+            self._flush_registered = True
+
+    @staticmethod
+    def _to_file_stat(st):
+        # the file is replaced on every write, so the inode changes even when the time and size do not
+        return st.st_ino, st.st_mtime, st.st_size
+
+    def _get_file_stat(self):
+        try:
+            return self._to_file_stat(os.stat(self.filename))
+        except (OSError, IOError):
+            return None
+
+    def _read(self):
+        with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+            file_stat = self._to_file_stat(os.fstat(f.fileno()))
+            data = json.load(f)
+        self._file_stat = file_stat
+        return data
+
+    def _write(self, keys):
+        if not self.filename:
+            return
+        from azure.cli.core.util import write_file_atomically
+        with _file_lock(self.filename):
+            if self._file_stat is not None and self._file_stat != self._get_file_stat():
+                # another process changed the file since it was read, keep its changes to the other keys
+                try:
+                    data = self._read()
+                except (OSError, IOError, t_JSONDecodeError):
+                    data = {}
+                for key in self._deleted_keys:
+                    data.pop(key, None)
+                for key in keys:
+                    if key in self.data:
+                        data[key] = self.data[key]
+                self.data = data
+            try:
+                permissions = os.stat(self.filename).st_mode & 0o777
+            except (OSError, IOError):
+                permissions = 0o600
+            write_file_atomically(self.filename, json.dumps(self.data), encoding=self._encoding,
+                                  permissions=permissions)
+            self._file_stat = self._get_file_stat()
+        self._modified_keys.clear()
+        self._deleted_keys.clear()
+
 
 # ACCOUNT contains subscriptions information
 ACCOUNT = Session()
@@ -95,3 +216,12 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# INDEX maps top-level command names to the command modules and extensions that provide them
+INDEX = Session()
+
+# PROVIDER_CACHE keeps the resource types and API versions of resource providers
+PROVIDER_CACHE = Session()
+
+# GRAPH_CACHE keeps the names of directory objects and role definitions
+GRAPH_CACHE = Session()
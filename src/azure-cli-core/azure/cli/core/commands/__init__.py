@@ -202,15 +202,23 @@ class AzCliCommand(CLICommand):
 
 
 # pylint: disable=too-few-public-methods
+class InvocationsFailedError(CLIError):
+    """ Raised when some of the expanded invocations of a command fail. `result` holds the
+    CommandResultItem of the invocations which succeeded. """
+
+    def __init__(self, message, result):
+        super(InvocationsFailedError, self).__init__(message)
+        self.result = result
+
+
 class AzCliCommandInvoker(CommandInvoker):
 
     # pylint: disable=too-many-statements,too-many-locals,too-many-branches
     def execute(self, args):
         from knack.events import (EVENT_INVOKER_PRE_CMD_TBL_CREATE, EVENT_INVOKER_POST_CMD_TBL_CREATE,
                                   EVENT_INVOKER_CMD_TBL_LOADED, EVENT_INVOKER_PRE_PARSE_ARGS,
-                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_TRANSFORM_RESULT,
-                                  EVENT_INVOKER_FILTER_RESULT)
-        from knack.util import CommandResultItem, todict
+                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_FILTER_RESULT)
+        from knack.util import CommandResultItem
         from azure.cli.core.commands.events import EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE
 
         # TODO: Can't simply be invoked as an event because args are transformed
@@ -288,7 +296,42 @@ class AzCliCommandInvoker(CommandInvoker):
 
         # TODO: This fundamentally alters the way Knack.invocation works here. Cannot be customized
         # with an event. Would need to be customized via inheritance.
-        results = []
+        jobs = self._prepare_jobs(parsed_args, args, command)
+
+        max_parallel = self._get_max_parallel(parsed_args)
+        if max_parallel > 1:
+            jobs = list(jobs)
+        error = None
+        if max_parallel > 1 and len(jobs) > 1:
+            results, error = self._run_jobs_concurrently(jobs, getattr(parsed_args, '_ids', None), max_parallel)
+        else:
+            results = []
+            for expanded_arg, cmd in jobs:
+                try:
+                    results.append(self._run_job(expanded_arg, cmd))
+                except Exception as ex:  # pylint: disable=broad-except
+                    if cmd.exception_handler:
+                        cmd.exception_handler(ex)
+                        return None
+                    else:
+                        six.reraise(*sys.exc_info())
+
+        if results and len(results) == 1:
+            results = results[0]
+
+        event_data = {'result': results}
+        self.cli_ctx.raise_event(EVENT_INVOKER_FILTER_RESULT, event_data=event_data)
+
+        result = CommandResultItem(
+            event_data['result'],
+            table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
+            is_query_active=self.data['query_active'])
+        if error:
+            raise InvocationsFailedError(error, result)
+        return result
+
+    def _prepare_jobs(self, parsed_args, args, command):
+        """ Yields an (expanded_arg, cmd) pair for each expanded invocation of the parsed command """
         for expanded_arg in _explode_list_args(parsed_args):
             cmd = expanded_arg.func
             if hasattr(expanded_arg, 'cmd'):
@@ -298,8 +341,6 @@ class AzCliCommandInvoker(CommandInvoker):
 
             self._validation(expanded_arg)
 
-            params = self._filter_params(expanded_arg)
-
             command_source = self.commands_loader.command_table[command].command_source
 
             extension_version = None
@@ -339,45 +380,82 @@ class AzCliCommandInvoker(CommandInvoker):
             for d in deprecations:
                 logger.warning(d.message)
 
+            yield expanded_arg, cmd
+
+    def _run_job(self, expanded_arg, cmd, progress_bar=True):
+        from knack.events import EVENT_INVOKER_TRANSFORM_RESULT
+        from knack.util import todict
+
+        params = self._filter_params(expanded_arg)
+        result = cmd(params)
+        if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
+            result = None
+        elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
+            result = None
+
+        transform_op = cmd.command_kwargs.get('transform', None)
+        if transform_op:
+            result = transform_op(result)
+
+        if _is_poller(result):
+            result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name),
+                                          progress_bar=progress_bar)(result)
+        elif _is_paged(result):
+            result = list(result)
+
+        result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
+        event_data = {'result': result}
+        self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
+        return event_data['result']
+
+    def _get_max_parallel(self, parsed_args):
+        max_parallel = getattr(parsed_args, '_max_parallel', None)
+        if max_parallel is None:
             try:
-                result = cmd(params)
-                if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
-                    result = None
-                elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
-                    result = None
-
-                transform_op = cmd.command_kwargs.get('transform', None)
-                if transform_op:
-                    result = transform_op(result)
-
-                if _is_poller(result):
-                    result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name))(result)
-                elif _is_paged(result):
-                    result = list(result)
-
-                result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
-                event_data = {'result': result}
-                self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
-                result = event_data['result']
-                results.append(result)
-
+                max_parallel = self.cli_ctx.config.getint('core', 'max_parallel', fallback=1)
+            except ValueError:
+                raise CLIError("Configuration 'core.max_parallel' must be a positive integer.")
+        if max_parallel < 1:
+            raise CLIError('usage error: --max-parallel must be a positive integer.')
+        return max_parallel
+
+    def _run_jobs_concurrently(self, jobs, ids, max_parallel):
+        """ Runs the expanded invocations on a bounded thread pool. Results are returned in the order of the
+        invocations, along with an error message if some of them failed; failures are reported per resource
+        rather than aborting the remaining invocations. """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _run_job_with_handler(expanded_arg, cmd):
+            try:
+                return self._run_job(expanded_arg, cmd, progress_bar=False)
             except Exception as ex:  # pylint: disable=broad-except
                 if cmd.exception_handler:
                     cmd.exception_handler(ex)
                     return None
-                else:
-                    six.reraise(*sys.exc_info())
+                raise
 
-        if results and len(results) == 1:
-            results = results[0]
+        if not ids or len(ids) != len(jobs):
+            ids = [str(index) for index in range(len(jobs))]
 
-        event_data = {'result': results}
-        self.cli_ctx.raise_event(EVENT_INVOKER_FILTER_RESULT, event_data=event_data)
-
-        return CommandResultItem(
-            event_data['result'],
-            table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
-            is_query_active=self.data['query_active'])
+        logger.info('Running %s invocations with up to %s in parallel.', len(jobs), max_parallel)
+        results, errors = [], []
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(jobs))) as executor:
+            tasks = [executor.submit(_run_job_with_handler, expanded_arg, cmd) for expanded_arg, cmd in jobs]
+            for id_value, task in zip(ids, tasks):
+                try:
+                    results.append(task.result())
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.debug('Invocation for %s failed.', id_value, exc_info=True)
+                    errors.append((id_value, ex))
+
+        if not errors:
+            return results, None
+        for id_value, ex in errors:
+            logger.error('%s: %s', id_value, ex)
+        error = '{} of {} invocations failed.'.format(len(errors), len(jobs))
+        if not results:
+            raise CLIError(error)
+        return results, error
 
     def _build_kwargs(self, func, ns):  # pylint: disable=no-self-use
         arg_list = get_arg_list(func)
@@ -441,7 +519,7 @@ class AzCliCommandInvoker(CommandInvoker):
 
 
 class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
-    def __init__(self, cli_ctx, start_msg='', finish_msg='', poller_done_interval_ms=1000.0):
+    def __init__(self, cli_ctx, start_msg='', finish_msg='', poller_done_interval_ms=1000.0, progress_bar=True):
 
         self.cli_ctx = cli_ctx
         self.start_msg = start_msg
@@ -449,6 +527,15 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         self.poller_done_interval_ms = poller_done_interval_ms
         self.deploy_dict = {}
         self.last_progress_report = datetime.datetime.now()
+        self.progress_controller = None
+        if not progress_bar:
+            # operations polled concurrently would interleave their progress on stderr
+            import azure.cli.core.commands.progress as progress
+            self.progress_controller = progress.ProgressHook()
+            self.progress_controller.init_progress(progress.NullProgressView())
+
+    def _get_progress_controller(self):
+        return self.progress_controller or self.cli_ctx.get_progress_controller()
 
     def _delay(self):
         time.sleep(self.poller_done_interval_ms / 1000.0)
@@ -524,14 +611,14 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         colorama.init()
 
         correlation_message = ''
-        self.cli_ctx.get_progress_controller().begin()
+        self._get_progress_controller().begin()
         correlation_id = None
 
         cli_logger = get_logger()  # get CLI logger which has the level set through command lines
         is_verbose = any(handler.level <= logs.INFO for handler in cli_logger.handlers)
 
         while not poller.done():
-            self.cli_ctx.get_progress_controller().add(message='Running')
+            self._get_progress_controller().add(message='Running')
             try:
                 # pylint: disable=protected-access
                 correlation_id = json.loads(
@@ -551,7 +638,7 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
             try:
                 self._delay()
             except KeyboardInterrupt:
-                self.cli_ctx.get_progress_controller().stop()
+                self._get_progress_controller().stop()
                 logger.error('Long-running operation wait cancelled.  %s', correlation_message)
                 raise
 
@@ -559,10 +646,10 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
             result = poller.result()
         except ClientException as client_exception:
             from azure.cli.core.commands.arm import handle_long_running_operation_exception
-            self.cli_ctx.get_progress_controller().stop()
+            self._get_progress_controller().stop()
             handle_long_running_operation_exception(client_exception)
 
-        self.cli_ctx.get_progress_controller().end()
+        self._get_progress_controller().end()
         colorama.deinit()
 
         return result
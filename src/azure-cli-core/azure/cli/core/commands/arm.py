@@ -9,6 +9,8 @@ import argparse
 from collections import OrderedDict
 import json
 import re
+import threading
+import time
 from six import string_types
 
 from knack.arguments import CLICommandArgument, ignore_type
@@ -26,6 +28,10 @@ from azure.cli.core.profiles import ResourceType, get_sdk
 logger = get_logger(__name__)
 EXCLUDED_NON_CLIENT_PARAMS = list(set(EXCLUDED_PARAMS) - set(['self', 'client']))
 
+_PROVIDER_CACHE_FILE = 'providerCache.json'
+_PROVIDER_CACHE_TTL = 24 * 60 * 60
+_PROVIDER_CACHE_LOCK = threading.Lock()
+
 
 # pylint:disable=too-many-lines
 class ArmTemplateBuilder(object):
@@ -172,6 +178,70 @@ def resource_exists(cli_ctx, resource_group, name, namespace, type, **_):  # pyl
     return existing
 
 
+def _load_provider_cache(cli_ctx):
+    import os
+    from azure.cli.core._session import PROVIDER_CACHE
+    cache_file = os.path.join(cli_ctx.config.config_dir, _PROVIDER_CACHE_FILE)
+    if PROVIDER_CACHE.filename != cache_file:
+        PROVIDER_CACHE.load(cache_file)
+    return PROVIDER_CACHE
+
+
+def get_provider_resource_types(cli_ctx, client, namespace):
+    """ Returns the (resource type, API versions) pairs of a resource provider.
+
+    The provider metadata is cached per cloud, subscription and namespace in the configuration directory for
+    `core.provider_cache_ttl` seconds (one day by default, 0 disables the cache).
+    """
+    ttl = cli_ctx.config.getint('core', 'provider_cache_ttl', fallback=_PROVIDER_CACHE_TTL)
+    key = '{}/{}/{}'.format(cli_ctx.cloud.name, client.config.subscription_id, namespace).lower()
+    now = time.time()
+    if ttl > 0:
+        with _PROVIDER_CACHE_LOCK:
+            entry = _load_provider_cache(cli_ctx).get(key)
+        if entry and entry['expiresAt'] > now:
+            return [(t, v) for t, v in entry['resourceTypes']]
+
+    provider = client.providers.get(namespace)
+    resource_types = [(t.resource_type, t.api_versions or []) for t in provider.resource_types]
+
+    if ttl > 0:
+        with _PROVIDER_CACHE_LOCK:
+            cache = _load_provider_cache(cli_ctx)
+            for expired in [k for k, v in cache.data.items() if v.get('expiresAt', 0) <= now]:
+                del cache[expired]
+            cache[key] = {'expiresAt': now + ttl, 'resourceTypes': resource_types}
+    return resource_types
+
+
+def clear_provider_cache(cli_ctx):
+    """ Drops the cached provider metadata so the API versions are resolved from the service again. """
+    with _PROVIDER_CACHE_LOCK:
+        cache = _load_provider_cache(cli_ctx)
+        for key in list(cache):
+            del cache[key]
+        cache.flush()
+
+
+def resolve_api_version(cli_ctx, client, namespace, resource_type, parent_path=None):
+    """ Returns the latest non-preview API version of a resource type, or the latest preview when there is no
+    other. The parent resource's API version is used for child resources. """
+    from azure.cli.core.parser import IncorrectUsageError
+
+    # If available, we will use parent resource's api-version
+    resource_type_str = (parent_path.split('/')[0] if parent_path else resource_type)
+
+    rt = [api_versions for t, api_versions in get_provider_resource_types(cli_ctx, client, namespace)
+          if t.lower() == resource_type_str.lower()]
+    if not rt:
+        raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
+    if len(rt) == 1 and rt[0]:
+        npv = [v for v in rt[0] if 'preview' not in v.lower()]
+        return npv[0] if npv else rt[0][0]
+    raise IncorrectUsageError('API version is required and could not be resolved for resource {}'
+                              .format(resource_type))
+
+
 def add_id_parameters(_, **kwargs):  # pylint: disable=unused-argument
 
     command_table = kwargs.get('commands_loader').command_table
@@ -213,6 +283,8 @@ def add_id_parameters(_, **kwargs):  # pylint: disable=unused-argument
                             self.set_argument_value(namespace, arg, parts)
                 except Exception as ex:
                     raise ValueError(ex)
+                # keep the raw IDs so that failures of the expanded invocations can be reported per ID
+                setattr(namespace, '_ids', getattr(namespace, '_ids', []) + expanded_values)
 
                 if deprecate_info:
                     if not hasattr(namespace, '_argument_deprecations'):
@@ -288,6 +360,9 @@ def add_id_parameters(_, **kwargs):  # pylint: disable=unused-argument
             'arg_group': group_name
         }
         command.add_argument('ids', '--ids', **id_kwargs)
+        command.add_argument('_max_parallel', '--max-parallel', type=int, metavar='N', arg_group=group_name,
+                             help='Maximum number of resources from --ids to process in parallel. Defaults to the '
+                                  '`core.max_parallel` configuration value, or 1 to process them sequentially.')
 
     for command in command_table.values():
         command_loaded_handler(command)
@@ -0,0 +1,172 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import time
+
+from knack.util import CLIError
+
+_GRAPH_CACHE_FILE = 'graphCache.json'
+_GRAPH_CACHE_TTL = 60 * 60
+_GRAPH_CACHE_LOCK = threading.Lock()
+
+# get_objects_by_object_ids accepts up to 1000 object IDs per request
+GRAPH_OBJECTS_BATCH_SIZE = 1000
+DEFAULT_MAX_PARALLEL = 4
+
+
+def _load_graph_cache(cli_ctx):
+    import os
+    from azure.cli.core._session import GRAPH_CACHE
+    cache_file = os.path.join(cli_ctx.config.config_dir, _GRAPH_CACHE_FILE)
+    if GRAPH_CACHE.filename != cache_file:
+        GRAPH_CACHE.load(cache_file)
+    return GRAPH_CACHE
+
+
+def _get_graph_cache_ttl(cli_ctx):
+    return cli_ctx.config.getint('core', 'graph_cache_ttl', fallback=_GRAPH_CACHE_TTL)
+
+
+def _get_cache_key(cli_ctx, tenant_id, kind, name):
+    return '{}/{}/{}/{}'.format(cli_ctx.cloud.name, tenant_id, kind, name).lower()
+
+
+def _get_cached_values(cli_ctx, keys):
+    """ Returns the unexpired cached values of `keys`, keyed by cache key. """
+    if _get_graph_cache_ttl(cli_ctx) <= 0:
+        return {}
+    now = time.time()
+    with _GRAPH_CACHE_LOCK:
+        cache = _load_graph_cache(cli_ctx)
+        entries = {k: cache.get(k) for k in keys}
+    return {k: v['value'] for k, v in entries.items() if v and v['expiresAt'] > now}
+
+
+def _cache_values(cli_ctx, values):
+    ttl = _get_graph_cache_ttl(cli_ctx)
+    if ttl <= 0 or not values:
+        return
+    now = time.time()
+    with _GRAPH_CACHE_LOCK:
+        cache = _load_graph_cache(cli_ctx)
+        for expired in [k for k, v in cache.data.items() if v.get('expiresAt', 0) <= now]:
+            del cache[expired]
+        for key, value in values.items():
+            cache[key] = {'expiresAt': now + ttl, 'value': value}
+
+
+def clear_graph_cache(cli_ctx):
+    """ Drops the cached directory object and role definition names. """
+    with _GRAPH_CACHE_LOCK:
+        cache = _load_graph_cache(cli_ctx)
+        cache.data.clear()
+        cache.save_with_retry()
+
+
+def get_displayable_name(graph_object):
+    """ Returns the user principal name, the first service principal name or the display name of a directory
+    object. """
+    if getattr(graph_object, 'user_principal_name', None):
+        return graph_object.user_principal_name
+    elif getattr(graph_object, 'service_principal_names', None):
+        return graph_object.service_principal_names[0]
+    return getattr(graph_object, 'display_name', None) or ''
+
+
+def get_objects_by_object_ids(graph_client, object_ids, max_parallel=DEFAULT_MAX_PARALLEL):
+    """ Returns the directory objects of `object_ids`, requested in batches of 1000 IDs `max_parallel` at a time.
+
+    Object IDs which do not exist in the directory are left out of the result.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from azure.graphrbac.models import GetObjectsParameters
+
+    def _get_batch(batch):
+        params = GetObjectsParameters(include_directory_object_references=True, object_ids=batch)
+        return list(graph_client.objects.get_objects_by_object_ids(params))
+
+    object_ids = list(object_ids)  # callers could pass in a set
+    batches = [object_ids[i:i + GRAPH_OBJECTS_BATCH_SIZE]
+               for i in range(0, len(object_ids), GRAPH_OBJECTS_BATCH_SIZE)]
+    if len(batches) <= 1 or max_parallel <= 1:
+        return [o for batch in batches for o in _get_batch(batch)]
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(batches))) as executor:
+        return [o for objects in executor.map(_get_batch, batches) for o in objects]
+
+
+def resolve_principal_names(cli_ctx, graph_client, object_ids):
+    """ Returns the displayable names of the directory objects `object_ids` as a dict keyed by object ID.
+
+    Names are cached per cloud and tenant for `core.graph_cache_ttl` seconds (one hour by default, 0 disables the
+    cache), only the object IDs missing from the cache are requested from the graph. Objects which do not exist are
+    left out of the result.
+    """
+    tenant_id = graph_client.config.tenant_id
+    keys = {_get_cache_key(cli_ctx, tenant_id, 'principals', i): i for i in set(object_ids)}
+    cached = _get_cached_values(cli_ctx, keys)
+    names = {keys[k]: v for k, v in cached.items()}
+
+    missing = [i for k, i in keys.items() if k not in cached]
+    if missing:
+        resolved = {o.object_id: get_displayable_name(o) for o in get_objects_by_object_ids(graph_client, missing)}
+        _cache_values(cli_ctx, {_get_cache_key(cli_ctx, tenant_id, 'principals', i): n for i, n in resolved.items()})
+        # the graph returns the object IDs in their canonical case
+        for i in missing:
+            name = resolved.get(i, resolved.get(i.lower()))
+            if name is not None:
+                names[i] = name
+    return names
+
+
+def resolve_object_id(cli_ctx, graph_client, assignee, use_cache=False):
+    """ Returns the object ID of a user principal name, a service principal name or an object ID.
+
+    Resolved object IDs are cached like the principal names of `resolve_principal_names`. The cached object ID is
+    only returned with `use_cache`, which is meant for reads: a name may have been given to another principal since
+    it was cached, so commands creating or deleting role assignments resolve it from the graph.
+    """
+    key = _get_cache_key(cli_ctx, graph_client.config.tenant_id, 'assignees', assignee)
+    cached = _get_cached_values(cli_ctx, [key]) if use_cache else {}
+    if key in cached:
+        return cached[key]
+
+    result = None
+    if assignee.find('@') >= 0:  # looks like a user principal name
+        result = list(graph_client.users.list(filter="userPrincipalName eq '{}'".format(assignee)))
+    if not result:
+        result = list(graph_client.service_principals.list(
+            filter="servicePrincipalNames/any(c:c eq '{}')".format(assignee)))
+    if not result:  # assume an object id, let us verify it
+        result = get_objects_by_object_ids(graph_client, [assignee])
+
+    # 2+ matches should never happen, so we only check 'no match' here
+    if not result:
+        raise CLIError("No matches in graph database for '{}'".format(assignee))
+
+    _cache_values(cli_ctx, {key: result[0].object_id})
+    return result[0].object_id
+
+
+def resolve_role_definition_names(cli_ctx, tenant_id, definitions_client, scope, role_definition_ids):
+    """ Returns the role names of `role_definition_ids` as a dict keyed by role definition ID.
+
+    The role definitions of `scope` are listed once for all the IDs missing from the cache and all of them are cached
+    like the principal names of `resolve_principal_names`. Role definitions which do not exist are left out of the
+    result.
+    """
+    keys = {_get_cache_key(cli_ctx, tenant_id, 'roleDefinitions', i): i for i in set(role_definition_ids)}
+    cached = _get_cached_values(cli_ctx, keys)
+    names = {keys[k]: v for k, v in cached.items()}
+
+    if len(cached) < len(keys):
+        role_defs = {}
+        for role_def in definitions_client.list(scope=scope):
+            # role definitions of the 2015-07-01 API keep their name in the properties
+            properties = getattr(role_def, 'properties', None) or role_def
+            role_defs[_get_cache_key(cli_ctx, tenant_id, 'roleDefinitions', role_def.id)] = properties.role_name
+        _cache_values(cli_ctx, role_defs)
+        names.update({i: role_defs[k] for k, i in keys.items() if k not in cached and k in role_defs})
+    return names
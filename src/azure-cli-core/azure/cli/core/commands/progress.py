@@ -28,6 +28,18 @@ class ProgressViewBase(object):
         pass
 
 
+class NullProgressView(ProgressViewBase):
+    """ a view which discards the progress, for operations running alongside others """
+    def __init__(self, out=None):
+        super(NullProgressView, self).__init__(out)
+
+    def write(self, args):
+        pass
+
+    def flush(self):
+        pass
+
+
 class ProgressReporter(object):
     """ generic progress reporter """
     def __init__(self, message='', value=None, total_value=None):
@@ -55,6 +55,55 @@ class TestApplication(unittest.TestCase):
         self.assertIn('x-ms-client-request-id', cli.data['headers'])
         self.assertNotEquals(old_id, cli.data['headers']['x-ms-client-request-id'])
 
+    def test_expanded_arguments_run_in_parallel(self):
+        import json
+        import time
+        from six import StringIO
+
+        def _handler(args):
+            name = args['names']
+            if name == 'bad':
+                raise CLIError('bad name')
+            time.sleep(0.01 * (5 - len(name)))  # finish out of order
+            return name.upper()
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                super(TestCommandsLoader, self).load_command_table(args)
+                self.command_table = {'test': AzCliCommand(self, 'test', _handler)}
+                self.command_table['test'].add_argument('names', '--names', nargs='+', action=IterateAction)
+                return self.command_table
+
+        with mock.patch.dict('os.environ', {'AZURE_CORE_MAX_PARALLEL': '4', 'AZURE_CORE_OUTPUT': 'json'}):
+            cli = DummyCli(commands_loader_cls=TestCommandsLoader)
+            out = StringIO()
+            self.assertEqual(cli.invoke(['test', '--names', 'a', 'bb', 'ccc', 'dddd'], out_file=out), 0)
+            self.assertEqual(json.loads(out.getvalue()), ['A', 'BB', 'CCC', 'DDDD'])
+
+            # failures are reported after the results of the successful invocations
+            cli = DummyCli(commands_loader_cls=TestCommandsLoader)
+            out = StringIO()
+            self.assertEqual(cli.invoke(['test', '--names', 'a', 'bad', 'ccc'], out_file=out), 1)
+            self.assertEqual(json.loads(out.getvalue()), ['A', 'CCC'])
+
+            # all invocations failing fails the command without output
+            out = StringIO()
+            self.assertEqual(cli.invoke(['test', '--names', 'bad', 'bad'], out_file=out), 1)
+            self.assertEqual(out.getvalue(), '')
+
+    def test_long_running_operation_without_progress_bar(self):
+        from azure.cli.core.commands import LongRunningOperation
+
+        cli = mock.MagicMock()
+        poller = mock.MagicMock()
+        poller.done.side_effect = [False, True]
+        poller.result.return_value = 'result'
+        operation = LongRunningOperation(cli, poller_done_interval_ms=0, progress_bar=False)
+        self.assertEqual(operation(poller), 'result')
+        # the progress of operations polled concurrently is not written
+        self.assertFalse(cli.get_progress_controller.called)
+
     def test_application_register_and_call_handlers(self):
         handler_called = [False]
 
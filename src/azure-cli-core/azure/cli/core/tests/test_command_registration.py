@@ -220,6 +220,63 @@ class TestCommandRegistration(unittest.TestCase):
         self.assertTrue(isinstance(ext2.command_source, ExtensionCommandSource))
         self.assertTrue(ext2.command_source.overrides_command)
 
+    def test_load_command_table_with_command_index(self):
+        from azure.cli.core import CommandIndex
+        from azure.cli.core._session import Session
+
+        loaded_modules = []
+
+        def _mock_iter_modules(_):
+            return [(None, 'hello_mod', None), (None, 'other_mod', None)]
+
+        def _mock_load_command_loader(loader, args, name, prefix):
+            loaded_modules.append(name)
+            group_name = name.split('_')[0]
+
+            class TestCommandsLoader(AzCommandsLoader):
+
+                def load_command_table(self, args):
+                    super(TestCommandsLoader, self).load_command_table(args)
+                    with self.command_group(group_name, operations_tmpl='{}#TestCommandRegistration.{{}}'.format(__name__)) as g:
+                        g.command('world', 'sample_vm_get')
+                    return self.command_table
+
+            command_loader = TestCommandsLoader(cli_ctx=loader.cli_ctx)
+            loader.loaders.append(command_loader)
+            return command_loader.load_command_table(args), {}
+
+        cli = DummyCli()
+        index = Session()
+        with mock.patch('importlib.import_module', TestCommandRegistration._mock_import_lib), \
+                mock.patch('pkgutil.iter_modules', _mock_iter_modules), \
+                mock.patch('azure.cli.core.commands._load_command_loader', _mock_load_command_loader), \
+                mock.patch('azure.cli.core.extension.get_extensions', lambda: []), \
+                mock.patch.object(CommandIndex, '_get_command_module_paths', staticmethod(lambda: [])), \
+                mock.patch('azure.cli.core._session.INDEX', index):
+
+            # the first invocation loads every module and builds the index
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(loaded_modules, ['hello_mod', 'other_mod'])
+            self.assertEqual(set(cmd_tbl), {'hello world', 'other world'})
+            self.assertEqual(index['commandIndex']['hello'], {'modules': ['hello_mod'], 'extensions': []})
+
+            # subsequent invocations only load the module which provides the command
+            del loaded_modules[:]
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(loaded_modules, ['hello_mod'])
+            self.assertEqual(set(cmd_tbl), {'hello world'})
+
+            # unknown commands fall back to loading every module
+            del loaded_modules[:]
+            MainCommandsLoader(cli).load_command_table(['unknown'])
+            self.assertEqual(loaded_modules, ['hello_mod', 'other_mod'])
+
+            # a change in the installed command modules invalidates the index
+            del loaded_modules[:]
+            index['key']['modules'] = ['hello_mod']
+            MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(loaded_modules, ['hello_mod', 'other_mod'])
+
     def test_argument_with_overrides(self):
 
         global_vm_name_type = CLIArgumentType(
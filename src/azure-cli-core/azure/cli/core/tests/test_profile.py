@@ -4,8 +4,11 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=protected-access
+import datetime
 import json
 import os
+import shutil
+import tempfile
 import unittest
 import mock
 import re
@@ -17,8 +20,9 @@ from azure.mgmt.resource.subscriptions.models import \
     (SubscriptionState, Subscription, SubscriptionPolicies, SpendingLimit)
 
 from azure.cli.core._profile import (Profile, CredsCache, SubscriptionFinder,
-                                     ServicePrincipalAuth, _AUTH_CTX_FACTORY)
+                                     ServicePrincipalAuth, _AUTH_CTX_FACTORY, get_token_provider)
 from azure.cli.core.mock import DummyCli
+from azure.cli.core.util import get_file_json
 
 from knack.util import CLIError
 
@@ -768,7 +772,9 @@ class TestProfile(unittest.TestCase):
 
         # verify
         self.assertEqual([], storage_mock['subscriptions'])
-        self.assertEqual(mock_delete_cred_file.call_count, 1)
+        # both the token file and the service principal token file are deleted
+        self.assertEqual(mock_delete_cred_file.call_count, 2)
+        self.assertTrue(mock_delete_cred_file.call_args[0][0].endswith('servicePrincipalTokens.json'))
 
     @mock.patch('adal.AuthenticationContext', autospec=True)
     def test_find_subscriptions_thru_username_password(self, mock_auth_context):
@@ -1432,6 +1438,56 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    def test_credscache_reuse_sp_token(self, mock_read_file):
+        cli = DummyCli()
+        test_sp = {
+            "servicePrincipalId": "myapp",
+            "servicePrincipalTenant": "mytenant",
+            "accessToken": "Secret"
+        }
+        token_dir = tempfile.mkdtemp()
+        token_file = os.path.join(token_dir, 'accessTokens.json')
+        sp_token_file = os.path.join(token_dir, 'servicePrincipalTokens.json')
+        mock_auth_context = mock.MagicMock()
+        mock_auth_context.acquire_token_with_client_credentials.return_value = self.token_entry1
+
+        def _load_tokens(file_path):
+            if file_path == token_file:
+                return [test_sp]
+            return get_file_json(file_path) if os.path.isfile(file_path) else []
+
+        mock_read_file.side_effect = _load_tokens
+        mgmt_resource = 'https://management.core.windows.net/'
+        try:
+            with mock.patch.dict('os.environ', {'AZURE_ACCESS_TOKEN_FILE': token_file}):
+                creds_cache = CredsCache(cli, auth_ctx_factory=lambda *_: mock_auth_context, async_persist=False)
+
+                # action #1, the first retrieval acquires a token from AAD and persists it
+                token_type, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+                self.assertEqual((token_type, token), ('Bearer', self.token_entry1['accessToken']))
+                self.assertEqual(mock_auth_context.acquire_token_with_client_credentials.call_count, 1)
+                if os.name != 'nt':
+                    self.assertEqual(os.stat(sp_token_file).st_mode & 0o777, 0o600)
+
+                # action #2, a new process reuses the persisted token
+                creds_cache = CredsCache(cli, auth_ctx_factory=lambda *_: mock_auth_context, async_persist=False)
+                _, token, _ = creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+                self.assertEqual(token, self.token_entry1['accessToken'])
+                self.assertEqual(mock_auth_context.acquire_token_with_client_credentials.call_count, 1)
+
+                # action #3, a token within the refresh-ahead window is acquired again
+                with mock.patch('azure.cli.core._profile._SERVICE_PRINCIPAL_TOKEN_REFRESH_AHEAD_SECONDS', 3600):
+                    creds_cache.retrieve_token_for_service_principal('myapp', mgmt_resource)
+                self.assertEqual(mock_auth_context.acquire_token_with_client_credentials.call_count, 2)
+
+                # action #4, logging out the service principal removes its tokens
+                with mock.patch('azure.cli.core._profile.CredsCache.persist_cached_creds', autospec=True):
+                    creds_cache.remove_cached_creds('myapp')
+                self.assertEqual(get_file_json(sp_token_file), [])
+        finally:
+            shutil.rmtree(token_dir)
+
     @mock.patch('azure.cli.core._profile.get_file_json', autospec=True)
     def test_credscache_good_error_on_file_corruption(self, mock_read_file):
         mock_read_file.side_effect = ValueError('a bad error for you')
@@ -1491,6 +1547,41 @@ class TestProfile(unittest.TestCase):
         r = profile.auth_ctx_factory(cli, 'common', None)
         self.assertEqual(r.authority.url, aad_url + '/common')
 
+    @mock.patch('azure.cli.core._profile.Profile.get_raw_token', autospec=True)
+    @mock.patch('azure.cli.core._profile.Profile.get_subscription', autospec=True)
+    def test_token_provider_reuses_token_until_it_expires(self, mock_get_subscription, mock_get_raw_token):
+        cli = DummyCli()
+        mock_get_subscription.return_value = {'id': '1', 'tenantId': self.tenant_id,
+                                              'user': {'name': self.user1, 'type': 'user'}}
+        expires_on = [datetime.datetime.now() + datetime.timedelta(hours=1)]
+
+        def _get_raw_token(_, resource, subscription):
+            token_entry = {'expiresOn': str(expires_on[0])}
+            token = 'token{}'.format(mock_get_raw_token.call_count)
+            return ('Bearer', token, token_entry), subscription, self.tenant_id
+        mock_get_raw_token.side_effect = _get_raw_token
+
+        provider = get_token_provider(cli)
+        self.assertIs(get_token_provider(cli), provider)
+        creds, sub, tenant = provider.get_raw_token('https://vault.azure.net')
+        self.assertEqual((creds[1], sub, tenant), ('token1', '1', self.tenant_id))
+        self.assertEqual(provider.get_raw_token('https://vault.azure.net')[0][1], 'token1')
+        self.assertEqual(provider.get_raw_token('https://storage.azure.com')[0][1], 'token2')
+        mock_get_raw_token.assert_called_with(mock.ANY, 'https://storage.azure.com', '1')
+
+        # tokens within 5 minutes of expiring are refreshed
+        expires_on[0] = datetime.datetime.now() + datetime.timedelta(minutes=4)
+        provider._tokens.clear()
+        self.assertEqual(provider.get_raw_token('https://vault.azure.net')[0][1], 'token3')
+        self.assertEqual(provider.get_raw_token('https://vault.azure.net')[0][1], 'token4')
+
+        # MSI tokens carry their expiration in seconds since the epoch
+        mock_get_raw_token.side_effect = lambda _, r, s: (('Bearer', 'msi', {'expires_on': '9999999999'}), s, '')
+        mock_get_subscription.return_value['user']['name'] = 'systemAssignedIdentity'
+        self.assertEqual(provider.get_raw_token('https://vault.azure.net')[0][1], 'msi')
+        self.assertEqual(provider.get_raw_token('https://vault.azure.net')[0][1], 'msi')
+        self.assertEqual(mock_get_raw_token.call_count, 5)
+
 
 class FileHandleStub(object):  # pylint: disable=too-few-public-methods
 
@@ -0,0 +1,100 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import codecs
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'session.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read_file(self):
+        with codecs.open(self.filename, 'r', encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    def test_session_defers_direct_modifications_until_flush(self):
+        session = Session()
+        session.load(self.filename)
+        self.assertEqual(self._read_file(), {})
+
+        session['a'] = 1
+        session['b'] = 2
+        self.assertEqual(self._read_file(), {})
+
+        session.flush()
+        self.assertEqual(self._read_file(), {'a': 1, 'b': 2})
+        self.assertEqual(os.stat(self.filename).st_mode & 0o777, 0o600)
+
+        del session['a']
+        session.flush()
+        self.assertEqual(self._read_file(), {'b': 2})
+
+    def test_session_keeps_changes_of_other_processes(self):
+        first, second = Session(), Session()
+        first.load(self.filename)
+        second.load(self.filename)
+
+        first['mine'] = {'value': 1}
+        first.flush()
+        second['other'] = 'value'
+        second['shared'] = {}
+        second['shared']['nested'] = True
+        second.save()
+
+        self.assertEqual(self._read_file(), {'mine': {'value': 1}, 'other': 'value', 'shared': {'nested': True}})
+        self.assertEqual(second['mine'], {'value': 1})
+
+    def test_session_skips_parsing_unchanged_file(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = 1
+        session.flush()
+
+        with mock.patch('json.load', side_effect=json.load) as load_mock:
+            session.load(self.filename)
+            load_mock.assert_not_called()
+
+            other = Session()
+            other.load(self.filename)
+            other['a'] = 2
+            other.flush()
+
+            session.load(self.filename)
+            self.assertEqual(load_mock.call_count, 2)
+        self.assertEqual(session['a'], 2)
+
+    def test_session_file_is_not_left_partially_written(self):
+        session = Session()
+        session.load(self.filename)
+        session['a'] = 1
+        session.flush()
+
+        session['b'] = 'x' * 100
+        with mock.patch('json.dumps', return_value=object()):
+            with self.assertRaises(Exception):
+                session.save()
+        self.assertEqual(self._read_file(), {'a': 1})
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['session.json', 'session.json.lock'])
+
+        session.flush()
+        self.assertEqual(self._read_file(), {'a': 1, 'b': 'x' * 100})
+
+
+if __name__ == '__main__':
+    unittest.main()
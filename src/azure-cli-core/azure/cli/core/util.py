@@ -117,6 +117,30 @@ def get_file_json(file_path, throw_on_empty=True, preserve_order=False):
     return shell_safe_json_parse(content, preserve_order)
 
 
+def write_file_atomically(file_path, content, encoding='utf-8', permissions=0o600):
+    """ Writes the content to a temporary file in the same directory and renames it over the target, so that
+    concurrent readers never observe a partially written file. """
+    import codecs
+    import os
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or None, prefix=os.path.basename(file_path) + '.')
+    try:
+        os.close(fd)
+        os.chmod(temp_path, permissions)
+        with codecs.open(temp_path, 'w', encoding=encoding) as temp_file:
+            temp_file.write(content)
+        try:
+            os.replace(temp_path, file_path)
+        except AttributeError:  # Python 2.7
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            os.rename(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def read_file_content(file_path, allow_binary=False):
     from codecs import open as codecs_open
     # Note, always put 'utf-8-sig' first, so that BOM in WinOS won't cause trouble.
@@ -0,0 +1,139 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+COMPRESS_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+UPLOAD_BLOCK_SIZE = 4 * 1024 * 1024  # 4 MiB
+DEFAULT_UPLOAD_CONNECTIONS = 4
+
+
+def _get_default_compress_workers():
+    from multiprocessing import cpu_count
+    try:
+        return min(8, cpu_count())
+    except NotImplementedError:
+        return 1
+
+
+def _gzip_compress(data, compresslevel):
+    # wbits 31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ParallelGzipWriter(object):
+    """ A write-only stream which gzip compresses its content into `fileobj`.
+
+    The content is split into chunks compressed concurrently, each into its own gzip member. A gzip file made of
+    several members decompresses to the concatenation of their content, so readers see a single gzip stream.
+    """
+
+    def __init__(self, fileobj, chunk_size=COMPRESS_CHUNK_SIZE, max_workers=None, compresslevel=6):
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self._compresslevel = compresslevel
+        self._max_workers = max_workers or _get_default_compress_workers()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._pending = deque()
+        self._buffer = []
+        self._buffer_size = 0
+        self.size = 0
+
+    def write(self, data):
+        self._buffer.append(data)
+        self._buffer_size += len(data)
+        if self._buffer_size >= self._chunk_size:
+            self._submit()
+
+    def _submit(self):
+        chunk = b''.join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
+        self._pending.append(self._executor.submit(_gzip_compress, chunk, self._compresslevel))
+        # keep a bounded number of chunks in memory, written in their original order
+        while len(self._pending) > 2 * self._max_workers:
+            self._write_compressed(self._pending.popleft().result())
+
+    def _write_compressed(self, data):
+        self.size += len(data)
+        self._fileobj.write(data)
+
+    def close(self):
+        try:
+            if self._buffer_size:
+                self._submit()
+            while self._pending:
+                self._write_compressed(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def abort(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
+
+
+class BlockBlobWriter(object):
+    """ A write-only stream which uploads its content to a block blob without staging it on disk.
+
+    The content is cut into blocks of `block_size` bytes, uploaded `max_connections` at a time. The blob is created
+    when the writer is closed, by committing the list of blocks.
+    """
+
+    def __init__(self, blob_service, container_name, blob_name, block_size=UPLOAD_BLOCK_SIZE,
+                 max_connections=DEFAULT_UPLOAD_CONNECTIONS):
+        self._blob_service = blob_service
+        self._container_name = container_name
+        self._blob_name = blob_name
+        self._block_size = block_size
+        self._max_connections = max_connections
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        self._pending = deque()
+        self._block_ids = []
+        self._buffer = b''
+        self.size = 0
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block, self._buffer = self._buffer[:self._block_size], self._buffer[self._block_size:]
+            self._put_block(block)
+
+    def _put_block(self, block):
+        # block IDs of a blob must all have the same length
+        block_id = '{0:08d}'.format(len(self._block_ids))
+        self._block_ids.append(block_id)
+        self.size += len(block)
+        self._pending.append(self._executor.submit(
+            self._blob_service.put_block, container_name=self._container_name, blob_name=self._blob_name,
+            block=block, block_id=block_id))
+        while len(self._pending) > self._max_connections:
+            self._pending.popleft().result()
+
+    def close(self):
+        from azure.storage.blob.models import BlobBlock
+        try:
+            if self._buffer:
+                self._put_block(self._buffer)
+                self._buffer = b''
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(wait=True)
+        self._blob_service.put_block_list(
+            container_name=self._container_name,
+            blob_name=self._blob_name,
+            block_list=[BlobBlock(id=block_id) for block_id in self._block_ids])
+
+    def abort(self):
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=True)
@@ -9,8 +9,9 @@ except ImportError:
     from urllib import urlencode
     from urlparse import urlparse, urlunparse
 
+import time
 from json import loads
-from base64 import b64encode
+from base64 import b64encode, urlsafe_b64decode
 import requests
 from requests.utils import to_native_string
 from msrest.http_logger import log_request, log_response
@@ -24,7 +25,12 @@ from azure.cli.core.cloud import CloudSuffixNotSetException
 
 from ._client_factory import cf_acr_registries
 from ._constants import MANAGED_REGISTRY_SKU
-from ._utils import get_registry_by_name
+from ._utils import (
+    get_registry_by_name,
+    get_cached_registry,
+    get_acr_cache_entry,
+    set_acr_cache_entry
+)
 
 
 logger = get_logger(__name__)
@@ -32,16 +38,75 @@ logger = get_logger(__name__)
 
 ACCESS_TOKEN_PERMISSION = ['*', 'pull']
 
+TOKEN_CACHE_KEY = 'token'
+# Registry tokens are reused until they are within this many seconds of expiring
+TOKEN_REFRESH_AHEAD_SECONDS = 300
+
 
 def _get_aad_token(cli_ctx, login_server, only_refresh_token, repository=None, permission=None):
-    """Obtains refresh and access tokens for an AAD-enabled registry.
+    """Obtains refresh and access tokens for an AAD-enabled registry. Tokens are reused from the cache until
+    shortly before they expire.
     :param str login_server: The registry login server URL to log in to
     :param bool only_refresh_token: Whether to ask for only refresh token, or for both refresh and access tokens
     :param str repository: Repository for which the access token is requested
     :param str permission: The requested permission on the repository, '*' or 'pull'
     """
     login_server = login_server.rstrip('/')
+    identity = _get_aad_identity(cli_ctx)
+    scope = _get_token_scope(repository, permission)
+
+    if not only_refresh_token:
+        access_token = _get_cached_token(cli_ctx, login_server, identity, scope)
+        if access_token:
+            return access_token
+
+    refresh_token, realm = _get_cached_aad_refresh_token(cli_ctx, login_server, identity)
+
+    if only_refresh_token:
+        return refresh_token
+
+    return _get_aad_access_token(cli_ctx, login_server, identity, realm, refresh_token, scope)
+
+
+def _get_cached_aad_refresh_token(cli_ctx, login_server, identity):
+    """Returns the cached refresh token issued by a registry and the realm of its authentication service, or
+    obtains new ones.
+    """
+    refresh_entry = _get_cached_token_entry(cli_ctx, login_server, identity, None)
+    if refresh_entry:
+        return refresh_entry['token'], refresh_entry['realm']
+    refresh_token, realm = _get_aad_refresh_token(cli_ctx, login_server)
+    _cache_token(cli_ctx, login_server, identity, None, refresh_token, realm=realm)
+    return refresh_token, realm
+
+
+def _get_aad_access_token(cli_ctx, login_server, identity, realm, refresh_token, scope, session=None):
+    """Exchanges a registry refresh token for an access token to the scope.
+    :param Session session: The HTTP session to send the request with
+    """
+    authurl = urlparse(realm)
+    authhost = urlunparse((authurl[0], authurl[1], '/oauth2/token', '', '', ''))
+
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    content = {
+        'grant_type': 'refresh_token',
+        'service': login_server,
+        'scope': scope,
+        'refresh_token': refresh_token
+    }
+    response = (session or requests).post(authhost, urlencode(content), headers=headers,
+                                          verify=(not should_disable_connection_verify()))
+    access_token = loads(response.content.decode("utf-8"))["access_token"]
+    _cache_token(cli_ctx, login_server, identity, scope, access_token)
+
+    return access_token
+
 
+def _get_aad_refresh_token(cli_ctx, login_server):
+    """Exchanges an AAD access token for a registry refresh token. Returns the refresh token and the realm of the
+    registry authentication service.
+    :param str login_server: The registry login server URL to log in to
+    """
     challenge = requests.get('https://' + login_server + '/v2/', verify=(not should_disable_connection_verify()))
     if challenge.status_code not in [401] or 'WWW-Authenticate' not in challenge.headers:
         raise CLIError("Registry '{}' did not issue a challenge.".format(login_server))
@@ -80,28 +145,70 @@ def _get_aad_token(cli_ctx, login_server, only_refresh_token, repository=None, p
             "Access to registry '{}' was denied. Response code: {}.".format(
                 login_server, response.status_code))
 
-    refresh_token = loads(response.content.decode("utf-8"))["refresh_token"]
-    if only_refresh_token:
-        return refresh_token
+    return loads(response.content.decode("utf-8"))["refresh_token"], params['realm']
 
-    authhost = urlunparse((authurl[0], authurl[1], '/oauth2/token', '', '', ''))
 
+def _get_token_scope(repository=None, permission=None):
     if repository is None:
-        scope = 'registry:catalog:*'
-    else:
-        scope = 'repository:{}:{}'.format(repository, permission)
+        return 'registry:catalog:*'
+    return 'repository:{}:{}'.format(repository, permission)
 
-    content = {
-        'grant_type': 'refresh_token',
-        'service': login_server,
-        'scope': scope,
-        'refresh_token': refresh_token
-    }
-    response = requests.post(authhost, urlencode(content), headers=headers,
-                             verify=(not should_disable_connection_verify()))
-    access_token = loads(response.content.decode("utf-8"))["access_token"]
 
-    return access_token
+def _get_aad_identity(cli_ctx):
+    """Returns the tenant and user the registry tokens are issued to, or None if there is no current account."""
+    from azure.cli.core._profile import Profile
+    try:
+        account = Profile(cli_ctx=cli_ctx).get_subscription()
+        return account['tenantId'], account['user']['name']
+    except (CLIError, KeyError, TypeError):
+        return None
+
+
+def _get_token_expiration(token):
+    """Returns the time a registry token expires at in seconds since the epoch, or 0 when unknown.
+    :param str token: The registry token, a JWT
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(loads(urlsafe_b64decode(payload.encode('ascii')).decode('utf-8'))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+
+def _get_token_cache_key(login_server, identity, scope):
+    return '{}/{}/{}/{}/{}'.format(TOKEN_CACHE_KEY, login_server, identity[0], identity[1],
+                                   scope or 'refresh').lower()
+
+
+def _get_cached_token_entry(cli_ctx, login_server, identity, scope):
+    if identity is None:
+        return None
+    return get_acr_cache_entry(cli_ctx, _get_token_cache_key(login_server, identity, scope))
+
+
+def _get_cached_token(cli_ctx, login_server, identity, scope):
+    entry = _get_cached_token_entry(cli_ctx, login_server, identity, scope)
+    return entry['token'] if entry else None
+
+
+def _cache_token(cli_ctx, login_server, identity, scope, token, **kwargs):
+    expires_at = _get_token_expiration(token) - TOKEN_REFRESH_AHEAD_SECONDS
+    if identity is None or expires_at <= time.time():
+        return
+    entry = dict(kwargs, token=token, loginServer=login_server.lower())
+    set_acr_cache_entry(cli_ctx, _get_token_cache_key(login_server, identity, scope), entry, expires_at)
+
+
+def _get_cached_aad_token(cli_ctx, login_server, only_refresh_token, repository=None, permission=None):
+    """Returns the cached refresh token, or access token, issued by a registry to the current account, or None.
+    :param str login_server: The registry login server URL
+    :param bool only_refresh_token: Whether to return the refresh token, or the access token
+    :param str repository: Repository for which the access token is requested
+    :param str permission: The requested permission on the repository, '*' or 'pull'
+    """
+    scope = None if only_refresh_token else _get_token_scope(repository, permission)
+    return _get_cached_token(cli_ctx, login_server.rstrip('/'), _get_aad_identity(cli_ctx), scope)
 
 
 def _get_credentials(cli_ctx,
@@ -141,6 +248,16 @@ def _get_credentials(cli_ctx,
 
         return login_server, username, password
 
+    # a managed registry with cached tokens needs no management or token request
+    if not password:
+        cached_registry = get_cached_registry(cli_ctx, registry_name, resource_group_name)
+        if cached_registry and cached_registry.get('skuName') in MANAGED_REGISTRY_SKU:
+            password = _get_cached_aad_token(cli_ctx, cached_registry['loginServer'], only_refresh_token,
+                                             repository, permission)
+            if password:
+                username = '00000000-0000-0000-0000-000000000000' if only_refresh_token else None
+                return cached_registry['loginServer'], username, password
+
     registry, resource_group_name = get_registry_by_name(cli_ctx, registry_name, resource_group_name)
     login_server = registry.login_server
 
@@ -225,6 +342,51 @@ def get_access_credentials(cli_ctx,
                             permission=permission)
 
 
+def get_repository_credentials_getter(cli_ctx,
+                                      registry_name,
+                                      resource_group_name=None,
+                                      username=None,
+                                      password=None,
+                                      permission='pull',
+                                      session=None):
+    """Try to get AAD authorization tokens or admin user credentials to access many repositories of a registry.
+    Returns the login server and a function returning the username and password to access a repository, or the
+    catalog if the repository is None. With AAD, the refresh token is obtained once and exchanged for an access token
+    to each repository.
+    :param str registry_name: The name of container registry
+    :param str resource_group_name: The name of resource group
+    :param str username: The username used to log into the container registry
+    :param str password: The password used to log into the container registry
+    :param str permission: The requested permission on the repositories, '*' or 'pull'
+    :param Session session: The HTTP session to request the access tokens with
+    """
+    if permission not in ACCESS_TOKEN_PERMISSION:
+        raise ValueError("Allowed access token permission: {}".format(ACCESS_TOKEN_PERMISSION))
+
+    login_server, username, password = get_access_credentials(cli_ctx,
+                                                              registry_name,
+                                                              resource_group_name,
+                                                              username,
+                                                              password)
+    if username or not password:
+        # admin user, user provided or anonymous credentials are the same for all repositories
+        return login_server, lambda _: (username, password)
+
+    catalog_token = password
+    login_server = login_server.rstrip('/')
+    identity = _get_aad_identity(cli_ctx)
+    refresh_token, realm = _get_cached_aad_refresh_token(cli_ctx, login_server, identity)
+
+    def _get_repository_credentials(repository):
+        if repository is None:
+            return None, catalog_token
+        scope = _get_token_scope(repository, permission)
+        return None, (_get_cached_token(cli_ctx, login_server, identity, scope) or
+                      _get_aad_access_token(cli_ctx, login_server, identity, realm, refresh_token, scope, session))
+
+    return login_server, _get_repository_credentials
+
+
 def log_registry_response(response):
     """Log the HTTP request and response of a registry API call.
     :param Response response: The response object
@@ -177,10 +177,16 @@ helps['acr credential renew'] = """
 helps['acr repository list'] = """
     type: command
     short-summary: List repositories in a container registry.
+    long-summary: >
+        With --show-tags or --show-manifests, the tags or manifests of all the repositories are listed concurrently,
+        starting as soon as each page of repositories is received.
     examples:
         - name: List repositories in a given container registry.
           text:
             az acr repository list -n MyRegistry
+        - name: List repositories in a given container registry with the details of their tags and manifests.
+          text:
+            az acr repository list -n MyRegistry --show-tags --show-manifests --detail
 """
 
 helps['acr repository show-tags'] = """
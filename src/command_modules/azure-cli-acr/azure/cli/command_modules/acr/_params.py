@@ -102,6 +102,12 @@ def load_arguments(self, _):  # pylint: disable=too-many-statements
         c.argument('read_enabled', help='Indicates whether read operation is allowed.', arg_type=get_three_state_flag())
         c.argument('write_enabled', help='Indicates whether write or delete operation is allowed.', arg_type=get_three_state_flag())
 
+    with self.argument_context('acr repository list') as c:
+        c.argument('show_tags', help='Show the tags of each repository.', action='store_true')
+        c.argument('show_manifests', help='Show the manifests of each repository.', action='store_true')
+        c.argument('detail', help='Show detailed information about the tags and manifests.', action='store_true')
+        c.argument('max_parallel', type=int, help='The maximum number of repositories crawled concurrently.')
+
     with self.argument_context('acr repository delete') as c:
         c.argument('manifest', nargs='?', required=False, const='', default=None, help=argparse.SUPPRESS)
         c.argument('tag', help=argparse.SUPPRESS)
@@ -3,9 +3,14 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import threading
+import time
+
 from knack.util import CLIError
 from knack.log import get_logger
+from msrestazure.azure_exceptions import CloudError
 from azure.cli.core.commands.parameters import get_resources_in_subscription
+from azure.cli.core._session import Session
 
 from azure.mgmt.containerregistry.v2018_02_01_preview.models import SkuName, Sku
 
@@ -24,6 +29,126 @@ from ._client_factory import (
 
 logger = get_logger(__name__)
 
+# ACR_CACHE keeps the registries resolved by name and the tokens issued by them
+ACR_CACHE = Session()
+_ACR_CACHE_FILE = 'acrCache.json'
+_ACR_CACHE_TTL = 24 * 60 * 60
+_ACR_CACHE_LOCK = threading.Lock()
+_REGISTRY_CACHE_KEY = 'registry'
+
+
+def _load_acr_cache(cli_ctx):
+    import os
+    cache_file = os.path.join(cli_ctx.config.config_dir, _ACR_CACHE_FILE)
+    if ACR_CACHE.filename != cache_file:
+        ACR_CACHE.load(cache_file)
+    return ACR_CACHE
+
+
+def get_acr_cache_ttl(cli_ctx):
+    """Returns for how many seconds resolved registries are cached, 0 when caching is disabled.
+    The cache is configured by `acr.cache_ttl` (one day by default).
+    """
+    return cli_ctx.config.getint('acr', 'cache_ttl', fallback=_ACR_CACHE_TTL)
+
+
+def get_acr_cache_entry(cli_ctx, key):
+    """Returns the unexpired entry of the ACR cache stored under key, or None.
+    :param str key: The cache key
+    """
+    if get_acr_cache_ttl(cli_ctx) <= 0:
+        return None
+    with _ACR_CACHE_LOCK:
+        entry = _load_acr_cache(cli_ctx).get(key)
+    if entry and entry.get('expiresAt', 0) > time.time():
+        return entry
+    return None
+
+
+def set_acr_cache_entry(cli_ctx, key, entry, expires_at):
+    """Stores entry under key in the ACR cache until expires_at. Expired entries are pruned.
+    :param str key: The cache key
+    :param dict entry: The entry to cache
+    :param float expires_at: The time, in seconds since the epoch, at which the entry expires
+    """
+    if get_acr_cache_ttl(cli_ctx) <= 0:
+        return
+    now = time.time()
+    with _ACR_CACHE_LOCK:
+        cache = _load_acr_cache(cli_ctx)
+        for expired in [k for k, v in cache.data.items() if v.get('expiresAt', 0) <= now]:
+            del cache[expired]
+        entry['expiresAt'] = expires_at
+        cache[key] = entry
+
+
+def remove_acr_cache_entries(predicate):
+    """Removes the entries of the ACR cache for which predicate(key, entry) is true. Entries are only used once the
+    cache has been loaded, so there is nothing to remove before.
+    :param callable predicate: Selects the entries to remove
+    """
+    with _ACR_CACHE_LOCK:
+        if not ACR_CACHE.filename:
+            return
+        for key in [k for k, v in ACR_CACHE.data.items() if predicate(k, v)]:
+            del ACR_CACHE[key]
+
+
+def _get_registry_cache_key(cli_ctx, registry_name):
+    # registries are resolved by name in the current subscription, nothing is cached without one
+    from azure.cli.core.commands.client_factory import get_subscription_id
+    try:
+        subscription_id = get_subscription_id(cli_ctx)
+    except CLIError:
+        return None
+    return '{}/{}/{}/{}'.format(_REGISTRY_CACHE_KEY, cli_ctx.cloud.name, subscription_id, registry_name).lower()
+
+
+def get_cached_registry(cli_ctx, registry_name, resource_group_name=None):
+    """Returns the cached resource group, id, login server and SKU of a registry, or None.
+    :param str registry_name: The name of container registry
+    :param str resource_group_name: The name of resource group, the cached registry must be in it if specified
+    """
+    key = _get_registry_cache_key(cli_ctx, registry_name)
+    entry = get_acr_cache_entry(cli_ctx, key) if key else None
+    if entry and (not resource_group_name or entry['resourceGroup'] == resource_group_name.lower()):
+        return entry
+    return None
+
+
+def _cache_registry(cli_ctx, registry_name, registry_id, registry=None):
+    ttl = get_acr_cache_ttl(cli_ctx)
+    key = _get_registry_cache_key(cli_ctx, registry_name)
+    if ttl <= 0 or not registry_id or not key:
+        return
+    entry = {
+        'id': registry_id,
+        'resourceGroup': get_resource_group_name_by_resource_id(registry_id)
+    }
+    if registry is not None:
+        entry['loginServer'] = registry.login_server
+        entry['skuName'] = registry.sku.name if registry.sku else None
+    set_acr_cache_entry(cli_ctx, key, entry, time.time() + ttl)
+
+
+def remove_cached_registry(cli_ctx, registry_name):
+    """Removes a registry and the tokens issued by it from the cache.
+    :param str registry_name: The name of container registry
+    """
+    entry = get_cached_registry(cli_ctx, registry_name)
+    registry_key = _get_registry_cache_key(cli_ctx, registry_name)
+    remove_acr_cache_entries(lambda k, _: k == registry_key)
+    if entry and entry.get('loginServer'):
+        remove_cached_tokens(entry['loginServer'])
+
+
+def remove_cached_tokens(login_server):
+    """Removes the tokens issued by a registry from the cache, e.g. once it rejected one of them.
+    :param str login_server: The registry login server
+    """
+    login_server = login_server.rstrip('/').lower()
+    remove_acr_cache_entries(lambda _, v: 'token' in v and v.get('loginServer') == login_server)
+
 
 def _arm_get_resource_by_name(cli_ctx, resource_name, resource_type):
     """Returns the ARM resource in the current subscription with resource_name.
@@ -63,14 +188,21 @@ def get_resource_group_name_by_resource_id(resource_id):
 
 
 def get_resource_group_name_by_registry_name(cli_ctx, registry_name,
-                                             resource_group_name=None):
+                                             resource_group_name=None,
+                                             use_cache=False):
     """Returns the resource group name for the container registry.
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
+    :param bool use_cache: Return the cached resource group, which is stale if the registry has moved or been deleted.
+    The caller must resolve the registry again when it is not found in the cached resource group.
     """
     if not resource_group_name:
+        cached_registry = get_cached_registry(cli_ctx, registry_name) if use_cache else None
+        if cached_registry:
+            return cached_registry['resourceGroup']
         arm_resource = _arm_get_resource_by_name(cli_ctx, registry_name, REGISTRY_RESOURCE_TYPE)
         resource_group_name = get_resource_group_name_by_resource_id(arm_resource.id)
+        _cache_registry(cli_ctx, registry_name, arm_resource.id)
     return resource_group_name
 
 
@@ -87,11 +219,23 @@ def get_registry_by_name(cli_ctx, registry_name, resource_group_name=None):
     :param str registry_name: The name of container registry
     :param str resource_group_name: The name of resource group
     """
+    is_cached = not resource_group_name and get_cached_registry(cli_ctx, registry_name) is not None
     resource_group_name = get_resource_group_name_by_registry_name(
-        cli_ctx, registry_name, resource_group_name)
+        cli_ctx, registry_name, resource_group_name, use_cache=True)
     client = get_acr_service_client(cli_ctx).registries
 
-    return client.get(resource_group_name, registry_name), resource_group_name
+    try:
+        registry = client.get(resource_group_name, registry_name)
+    except CloudError as e:
+        if not is_cached or e.status_code != 404:
+            raise
+        # the registry has moved or been deleted since it was cached
+        logger.debug("Registry '%s' was not found in cached resource group '%s'.", registry_name, resource_group_name)
+        remove_cached_registry(cli_ctx, registry_name)
+        return get_registry_by_name(cli_ctx, registry_name)
+
+    _cache_registry(cli_ctx, registry_name, registry.id, registry)
+    return registry, resource_group_name
 
 
 def get_registry_from_name_or_login_server(cli_ctx, login_server, registry_name=None):
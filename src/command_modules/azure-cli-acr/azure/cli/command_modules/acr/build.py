@@ -6,10 +6,13 @@
 import re
 import time
 import os
+import stat
+import json
+import hashlib
 from random import uniform
 from io import BytesIO
-import tempfile
 import tarfile
+from codecs import open as codecs_open
 from builtins import open as bltn_open
 import requests
 import colorama
@@ -30,6 +33,7 @@ from azure.mgmt.containerregistry.v2018_02_01_preview.models import (
 from ._utils import validate_managed_registry
 from ._client_factory import cf_acr_registries
 from ._build_polling import get_build_with_polling
+from ._archive_utils import ParallelGzipWriter, BlockBlobWriter
 
 
 logger = get_logger(__name__)
@@ -37,6 +41,10 @@ logger = get_logger(__name__)
 
 BUILD_NOT_SUPPORTED = 'Builds are only supported for managed registries.'
 
+# uploaded build contexts are reused for this many seconds, unless overridden by `acr.build_source_cache_ttl`
+_DEFAULT_SOURCE_CACHE_TTL = 60 * 60
+_SOURCE_CACHE_DIR = 'acrBuildSourceCache'
+
 
 def acr_build_show_logs(client,
                         build_id,
@@ -258,8 +266,6 @@ def acr_build(cmd,
 
     client_registries = cf_acr_registries(cmd.cli_ctx)
 
-    tar_file_path = os.path.join(tempfile.gettempdir(), 'source_archive_{}.tar.gz'.format(hash(os.times())))
-
     if os.path.exists(source_location):
         if not os.path.isdir(source_location):
             raise CLIError("Source location should be a local directory path or remote URL.")
@@ -268,15 +274,9 @@ def acr_build(cmd,
 
         try:
             source_location = _upload_source_code(
-                client_registries, registry_name, resource_group_name, source_location, tar_file_path, docker_file_path)
+                cmd.cli_ctx, client_registries, registry_name, resource_group_name, source_location, docker_file_path)
         except Exception as err:
             raise CLIError(err)
-        finally:
-            try:
-                logger.debug("Deleting the archived source code from '%s'.", tar_file_path)
-                os.remove(tar_file_path)
-            except OSError:
-                pass
     else:
         source_location = _check_remote_source_code(source_location)
         logger.warning("Sending build context to ACR...")
@@ -342,19 +342,17 @@ def _check_remote_source_code(source_location):
     raise CLIError("'{}' is not a valid remote URL for git or tarball.".format(source_location))
 
 
-def _upload_source_code(client, registry_name, resource_group_name, source_location, tar_file_path, docker_file_path):
-    _pack_source_code(source_location, tar_file_path, docker_file_path)
-
-    size = os.path.getsize(tar_file_path)
-    unit = 'GiB'
-    for S in ['Bytes', 'KiB', 'MiB', 'GiB']:
-        if size < 1024:
-            unit = S
-            break
-        size = size / 1024.0
+def _upload_source_code(cli_ctx, client, registry_name, resource_group_name, source_location, docker_file_path):
+    logger.warning("Packing source code into tar file to upload...")
+    entries = _collect_source_entries(source_location, docker_file_path)
 
-    logger.debug("Uploading archived source code from '%s'.", tar_file_path)
-    logger.warning("Sending build context ({0:.3f} {1}) to ACR...".format(size, unit))
+    cache_path = _get_source_cache_path(cli_ctx, client, registry_name, resource_group_name,
+                                        _get_source_fingerprint(entries, docker_file_path))
+    cache_ttl = cli_ctx.config.getint('acr', 'build_source_cache_ttl', fallback=_DEFAULT_SOURCE_CACHE_TTL)
+    relative_path = _read_cached_source(cache_path, cache_ttl)
+    if relative_path:
+        logger.warning("Source code is unchanged since it was last sent to ACR. Reusing the uploaded build context.")
+        return relative_path
 
     upload_url = None
     relative_path = None
@@ -372,82 +370,189 @@ def _upload_source_code(client, registry_name, resource_group_name, source_locat
         raise CLIError(error_message)
 
     account_name, endpoint_suffix, container_name, blob_name, sas_token = _get_blob_info(upload_url)
-    BlockBlobService(account_name=account_name,
-                     sas_token=sas_token,
-                     endpoint_suffix=endpoint_suffix).create_blob_from_path(
-                         container_name=container_name,
-                         blob_name=blob_name,
-                         file_path=tar_file_path)
-    return relative_path
+    blob_writer = BlockBlobWriter(BlockBlobService(account_name=account_name,
+                                                   sas_token=sas_token,
+                                                   endpoint_suffix=endpoint_suffix),
+                                  container_name=container_name,
+                                  blob_name=blob_name)
 
+    logger.warning("Sending build context to ACR...")
+    _pack_source_code(entries, blob_writer)
+
+    size = blob_writer.size
+    unit = 'GiB'
+    for S in ['Bytes', 'KiB', 'MiB', 'GiB']:
+        if size < 1024:
+            unit = S
+            break
+        size = size / 1024.0
+    logger.warning("Sent build context ({0:.3f} {1}) to ACR.".format(size, unit))
+
+    if cache_ttl > 0:
+        _write_cached_source(cache_path, relative_path)
+    return relative_path
 
-def _pack_source_code(source_location, tar_file_path, docker_file_path):
-    logger.warning("Packing source code into tar file to upload...")
 
+def _pack_source_code(entries, fileobj):
+    """ Write a gzip compressed tar of the entries to `fileobj`, a writer such as BlockBlobWriter which is closed
+    once the archive is complete, or aborted on failure. The tar is produced, compressed and written at the same time,
+    so the archive is never held in memory or on disk. """
+    gzip_writer = ParallelGzipWriter(fileobj)
+    try:
+        with tarfile.open(fileobj=gzip_writer, mode="w|") as tar:
+            for name, arcname, _ in entries:
+                tarinfo = tar.gettarinfo(name, arcname)
+
+                if tarinfo is None:
+                    raise CLIError("tarfile: unsupported type {}".format(name))
+
+                # append the tar header and data to the archive
+                if tarinfo.isreg():
+                    with bltn_open(name, "rb") as f:
+                        tar.addfile(tarinfo, f)
+                else:
+                    tar.addfile(tarinfo)
+        gzip_writer.close()
+        fileobj.close()
+    except BaseException:
+        gzip_writer.abort()
+        fileobj.abort()
+        raise
+
+
+def _collect_source_entries(source_location, docker_file_path):
+    """ Return (path, arcname, stat result) of the files and directories to archive, in archive order. Directories
+    whose content is all ignored are not scanned. """
     ignore_list, ignore_list_size = _load_dockerignore_file(source_location)
+    ignore_matcher = IgnoreMatcher(ignore_list) if ignore_list is not None else None
     common_vcs_ignore_list = {'.git', '.gitignore', '.bzr', 'bzrignore', '.hg', '.hgignore', '.svn'}
+    docker_file_arcname = docker_file_path.replace('\\', '/')
+    entries = []
 
-    def _ignore_check(tarinfo, parent_ignored, parent_matching_rule_index):
+    def _ignore_check(name, parent_ignored, parent_matching_rule_index):
         # ignore common vcs dir or file
-        if tarinfo.name in common_vcs_ignore_list:
-            logger.warning("Excluding '%s' based on default ignore rules", tarinfo.name)
+        if name in common_vcs_ignore_list:
+            logger.warning("Excluding '%s' based on default ignore rules", name)
             return True, parent_matching_rule_index
 
-        if ignore_list is None:
+        if ignore_matcher is None:
             # if .dockerignore doesn't exists, inherit from parent
             # eg, it will ignore the files under .git folder.
             return parent_ignored, parent_matching_rule_index
 
         # always include docker file
         # file path comparision is case-sensitive
-        if tarinfo.name == docker_file_path:
+        if name == docker_file_arcname:
             logger.debug(".dockerignore: skip checking '%s'", docker_file_path)
             return False, parent_matching_rule_index
 
-        for index, item in enumerate(ignore_list):
-            # stop checking the remaining rules whose priorities are lower than the parent matching rule
-            # at this point, current item should just inherit from parent
-            if index >= parent_matching_rule_index:
-                break
-            if re.match(item.pattern, tarinfo.name):
-                logger.debug(".dockerignore: rule '%s' matches '%s'.", item.rule, tarinfo.name)
-                return item.ignore, index
+        # rules whose priorities are lower than the parent matching rule are not checked,
+        # the item just inherits from parent
+        index = ignore_matcher.match(name, parent_matching_rule_index)
+        if index < parent_matching_rule_index:
+            item = ignore_list[index]
+            logger.debug(".dockerignore: rule '%s' matches '%s'.", item.rule, name)
+            return item.ignore, index
 
-        logger.debug(".dockerignore: no rule for '%s'. parent ignore '%s'", tarinfo.name, parent_ignored)
+        logger.debug(".dockerignore: no rule for '%s'. parent ignore '%s'", name, parent_ignored)
         # inherit from parent
         return parent_ignored, parent_matching_rule_index
 
-    with tarfile.open(tar_file_path, "w:gz") as tar:
-        # need to set arcname to empty string as the archive root path
-        _archive_file_recursively(tar, source_location, arcname="",
-                                  parent_ignored=False, parent_matching_rule_index=ignore_list_size,
-                                  ignore_check=_ignore_check)
+    def _is_pruned(name, matching_rule_index):
+        # the child items of an ignored dir are only included by an exception rule, or if they contain the docker file
+        if not name or docker_file_arcname.startswith(name + '/'):
+            return False
+        return ignore_matcher is None or not ignore_matcher.may_include_under(name, matching_rule_index)
+
+    def _collect(name, arcname, parent_ignored, parent_matching_rule_index):
+        stat_result = os.lstat(name)
 
+        # check if the file/dir is ignored
+        ignored, matching_rule_index = _ignore_check(arcname, parent_ignored, parent_matching_rule_index)
 
-def _archive_file_recursively(tar, name, arcname, parent_ignored, parent_matching_rule_index, ignore_check):
-    # create a TarInfo object from the file
-    tarinfo = tar.gettarinfo(name, arcname)
+        if not ignored:
+            entries.append((name, arcname, stat_result))
 
-    if tarinfo is None:
-        raise CLIError("tarfile: unsupported type {}".format(name))
+        if stat.S_ISDIR(stat_result.st_mode):
+            if ignored and _is_pruned(arcname, matching_rule_index):
+                logger.debug(".dockerignore: skip scanning ignored directory '%s'", arcname)
+                return
+            for f in sorted(os.listdir(name)):
+                _collect(os.path.join(name, f), '{}/{}'.format(arcname, f) if arcname else f,
+                         parent_ignored=ignored, parent_matching_rule_index=matching_rule_index)
 
-    # check if the file/dir is ignored
-    ignored, matching_rule_index = ignore_check(tarinfo, parent_ignored, parent_matching_rule_index)
+    # need to set arcname to empty string as the archive root path
+    _collect(source_location, "", parent_ignored=False, parent_matching_rule_index=ignore_list_size)
+    return entries
 
-    if not ignored:
-        # append the tar header and data to the archive
-        if tarinfo.isreg():
-            with bltn_open(name, "rb") as f:
-                tar.addfile(tarinfo, f)
-        else:
-            tar.addfile(tarinfo)
 
-    # even the dir is ignored, its child items can still be included, so continue to scan
-    if tarinfo.isdir():
-        for f in os.listdir(name):
-            _archive_file_recursively(tar, os.path.join(name, f), os.path.join(arcname, f),
-                                      parent_ignored=ignored, parent_matching_rule_index=matching_rule_index,
-                                      ignore_check=ignore_check)
+def _get_source_fingerprint(entries, docker_file_path):
+    # file metadata stands for the content, as the build context is not read twice to hash it
+    sha = hashlib.sha256(docker_file_path.encode('utf-8'))
+    for _, arcname, stat_result in entries:
+        sha.update(repr((arcname, stat_result.st_mode, stat_result.st_size, stat_result.st_mtime)).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _get_source_cache_path(cli_ctx, client, registry_name, resource_group_name, fingerprint):
+    key = json.dumps([cli_ctx.cloud.name, client.config.subscription_id, resource_group_name.lower(),
+                      registry_name.lower(), fingerprint])
+    return os.path.join(cli_ctx.config.config_dir, _SOURCE_CACHE_DIR,
+                        hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_cached_source(cache_path, cache_ttl):
+    if cache_ttl <= 0:
+        return None
+    try:
+        with codecs_open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if time.time() - cached['uploadedOn'] < cache_ttl:
+            return cached['relativePath']
+    except (OSError, IOError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_cached_source(cache_path, relative_path):
+    from azure.cli.core.util import write_file_atomically
+    try:
+        if not os.path.isdir(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+        write_file_atomically(cache_path, json.dumps({'relativePath': relative_path, 'uploadedOn': time.time()}))
+    except (OSError, IOError) as ex:
+        logger.debug("Failed to cache the build source location in '%s': %s", cache_path, ex)
+
+
+def _translate_ignore_token(token):
+    if token == "**":
+        # ** matches any number of directories
+        return ".*"
+
+    pattern = ""
+    index = 0
+    while index < len(token):
+        char = token[index]
+        if char == "*":
+            # * matches any sequence of non-seperator characters
+            pattern += "[^/]*"
+        elif char == "?":
+            # ? matches any single non-seperator character
+            pattern += "[^/]"
+        elif char == "[" and token.find("]", index + 1) > index + 1:
+            # [...] matches a character range, [^...] negates it
+            end = token.find("]", index + 1)
+            pattern += token[index:end + 1]
+            index = end
+        elif char == "\\" and index + 1 < len(token):
+            # \ escapes the next character
+            index += 1
+            pattern += re.escape(token[index])
+        else:
+            # any other character, such as '.', matches itself
+            pattern += re.escape(char)
+        index += 1
+    return pattern
 
 
 class IgnoreRule(object):  # pylint: disable=too-few-public-methods
@@ -460,19 +565,53 @@ class IgnoreRule(object):  # pylint: disable=too-few-public-methods
             self.ignore = False
             rule = rule[1:]  # remove !
 
-        tokens = rule.split('/')
-        for index, token in enumerate(tokens):
-            # ** matches any number of directories
-            if token == "**":
-                tokens[index] = ".*"
-            else:
-                # * matches any sequence of non-seperator characters
-                # ? matches any single non-seperator character
-                # . matches dot character
-                tokens[index] = token.replace(
-                    "*", "[^/]*").replace("?", "[^/]").replace(".", "\\.")
-
+        tokens = [_translate_ignore_token(token) for token in rule.split('/')]
         self.pattern = "^{}$".format("/".join(tokens))
+        # per path segment patterns, None for **
+        self._segment_patterns = [None if raw == "**" else re.compile("^{}$".format(token))
+                                  for raw, token in zip(rule.split('/'), tokens)]
+
+    def may_match_under(self, dir_name):
+        """ Whether the rule can match a path below the directory `dir_name`. """
+        dir_segments = dir_name.split('/')
+        for index, segment in enumerate(dir_segments):
+            if index < len(self._segment_patterns) and self._segment_patterns[index] is None:
+                return True
+            # a path below the dir has more segments than the dir
+            if index >= len(self._segment_patterns) - 1 or not self._segment_patterns[index].match(segment):
+                return False
+        return True
+
+
+class IgnoreMatcher(object):
+    """ Matches paths against all the rules of a .dockerignore file at once. The rules, ordered from the highest
+    priority, are compiled into alternations of a single regular expression. The first alternative which matches is
+    the rule with the highest priority. """
+
+    # python 2 limits a regular expression to 100 groups
+    _RULES_PER_PATTERN = 99
+
+    def __init__(self, ignore_list):
+        self._patterns = []
+        for offset in range(0, len(ignore_list), self._RULES_PER_PATTERN):
+            rules = ignore_list[offset:offset + self._RULES_PER_PATTERN]
+            self._patterns.append((offset, re.compile("|".join("({})".format(r.pattern) for r in rules))))
+        self._exception_rules = [(index, rule) for index, rule in enumerate(ignore_list) if not rule.ignore]
+
+    def match(self, name, max_index):
+        """ Return the index of the matching rule with the highest priority, or `max_index` if no rule before
+        `max_index` matches. """
+        for offset, pattern in self._patterns:
+            if offset >= max_index:
+                break
+            match = pattern.match(name)
+            if match:
+                return min(offset + match.lastindex - 1, max_index)
+        return max_index
+
+    def may_include_under(self, dir_name, max_index):
+        """ Whether an exception rule before `max_index` can include a path below the directory `dir_name`. """
+        return any(index < max_index and rule.may_match_under(dir_name) for index, rule in self._exception_rules)
 
 
 def _load_dockerignore_file(source_location):
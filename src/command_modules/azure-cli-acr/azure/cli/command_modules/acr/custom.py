@@ -24,7 +24,8 @@ from ._utils import (
     validate_managed_registry,
     validate_sku_update,
     get_resource_group_name_by_registry_name,
-    get_resource_id_by_storage_account_name
+    get_resource_id_by_storage_account_name,
+    remove_cached_registry
 )
 from ._docker_utils import get_login_credentials
 
@@ -101,12 +102,14 @@ def acr_create(cmd,
 
 def acr_delete(cmd, client, registry_name, resource_group_name=None):
     resource_group_name = get_resource_group_name_by_registry_name(cmd.cli_ctx, registry_name, resource_group_name)
-    return client.delete(resource_group_name, registry_name)
+    result = client.delete(resource_group_name, registry_name)
+    remove_cached_registry(cmd.cli_ctx, registry_name)
+    return result
 
 
-def acr_show(cmd, client, registry_name, resource_group_name=None):
-    resource_group_name = get_resource_group_name_by_registry_name(cmd.cli_ctx, registry_name, resource_group_name)
-    return client.get(resource_group_name, registry_name)
+def acr_show(cmd, client, registry_name, resource_group_name=None):  # pylint: disable=unused-argument
+    registry, _ = get_registry_by_name(cmd.cli_ctx, registry_name, resource_group_name)
+    return registry
 
 
 def acr_update_custom(cmd,
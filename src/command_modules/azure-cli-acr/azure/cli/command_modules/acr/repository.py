@@ -16,8 +16,13 @@ from knack.log import get_logger
 
 from azure.cli.core.util import should_disable_connection_verify
 
-from ._utils import validate_managed_registry
-from ._docker_utils import get_access_credentials, get_authorization_header, log_registry_response
+from ._utils import validate_managed_registry, remove_cached_tokens
+from ._docker_utils import (
+    get_access_credentials,
+    get_repository_credentials_getter,
+    get_authorization_header,
+    log_registry_response
+)
 
 
 logger = get_logger(__name__)
@@ -39,6 +44,7 @@ MANIFEST_V2_HEADER = {
     'Accept': 'application/vnd.docker.distribution.manifest.v2+json'
 }
 DEFAULT_PAGINATION = 20
+DEFAULT_MAX_PARALLEL = 8
 
 
 def _parse_error_message(error_message, response):
@@ -68,7 +74,8 @@ def _request_data_from_registry(http_method,
                                 json_payload=None,
                                 params=None,
                                 retry_times=3,
-                                retry_interval=5):
+                                retry_interval=5,
+                                session=None):
     if http_method not in ALLOWED_HTTP_METHOD:
         raise ValueError("Allowed http method: {}".format(ALLOWED_HTTP_METHOD))
 
@@ -84,7 +91,7 @@ def _request_data_from_registry(http_method,
     for i in range(0, retry_times):
         errorMessage = None
         try:
-            response = requests.request(
+            response = (session or requests).request(
                 method=http_method,
                 url=url,
                 headers=headers,
@@ -108,6 +115,9 @@ def _request_data_from_registry(http_method,
             elif response.status_code == 204:
                 return None, None
             elif response.status_code == 401:
+                if not username:
+                    # the token may have been revoked, do not reuse it
+                    remove_cached_tokens(login_server)
                 raise CLIError(_parse_error_message('Authentication required.', response))
             elif response.status_code == 404:
                 raise CLIError(_parse_error_message('The requested data does not exist.', response))
@@ -141,6 +151,9 @@ def _get_manifest_digest(login_server, repository, tag, username, password, retr
             if response.status_code == 200 and response.headers and 'Docker-Content-Digest' in response.headers:
                 return response.headers['Docker-Content-Digest']
             elif response.status_code == 401:
+                if not username:
+                    # the token may have been revoked, do not reuse it
+                    remove_cached_tokens(login_server)
                 raise CLIError(_parse_error_message('Authentication required.', response))
             elif response.status_code == 404:
                 raise CLIError(_parse_error_message('The manifest does not exist.', response))
@@ -162,8 +175,24 @@ def _obtain_data_from_registry(login_server,
                                password,
                                result_index,
                                top=None,
-                               orderby=None):
+                               orderby=None,
+                               session=None):
     result_list = []
+    for result in _iterate_data_from_registry(login_server, path, username, password, result_index,
+                                              top=top, orderby=orderby, session=session):
+        result_list += result
+    return result_list
+
+
+def _iterate_data_from_registry(login_server,
+                                path,
+                                username,
+                                password,
+                                result_index,
+                                top=None,
+                                orderby=None,
+                                session=None):
+    """Yields the results of each page as soon as it is received."""
     execute_next_http_call = True
 
     params = {
@@ -186,10 +215,11 @@ def _obtain_data_from_registry(login_server,
             username=username,
             password=password,
             result_index=result_index,
-            params=params)
+            params=params,
+            session=session)
 
         if result:
-            result_list += result
+            yield result
 
         if top is not None and top <= 0:
             break
@@ -204,21 +234,43 @@ def _obtain_data_from_registry(login_server,
             params = {y[0]: unquote(y[1]) for y in (x.split('=', 2) for x in tokens[1].split('&'))}
             execute_next_http_call = True
 
-    return result_list
-
 
 def acr_repository_list(cmd,
                         registry_name,
                         top=None,
                         resource_group_name=None,
                         username=None,
-                        password=None):
+                        password=None,
+                        show_tags=False,
+                        show_manifests=False,
+                        detail=False,
+                        max_parallel=DEFAULT_MAX_PARALLEL):
     is_managed_registry = True
     try:
         _, resource_group_name = validate_managed_registry(cmd.cli_ctx, registry_name, resource_group_name)
     except CLIError:
         is_managed_registry = False
 
+    if show_tags or show_manifests:
+        if (show_manifests or detail) and not is_managed_registry:
+            raise CLIError(SHOW_MANIFESTS_NOT_SUPPORTED if show_manifests else DETAIL_NOT_SUPPORTED)
+        if max_parallel < 1:
+            raise CLIError('usage error: --max-parallel must be a positive integer')
+        return _crawl_repositories(cli_ctx=cmd.cli_ctx,
+                                   registry_name=registry_name,
+                                   resource_group_name=resource_group_name,
+                                   username=username,
+                                   password=password,
+                                   is_managed_registry=is_managed_registry,
+                                   show_tags=show_tags,
+                                   show_manifests=show_manifests,
+                                   detail=detail,
+                                   top=top,
+                                   max_parallel=max_parallel)
+    elif detail:
+        logger.warning("The specified --detail is ignored as it is only supported with --show-tags or "
+                       "--show-manifests.")
+
     login_server, username, password = get_access_credentials(
         cli_ctx=cmd.cli_ctx,
         registry_name=registry_name,
@@ -235,6 +287,84 @@ def acr_repository_list(cmd,
         top=top)
 
 
+def _crawl_repositories(cli_ctx,
+                        registry_name,
+                        resource_group_name,
+                        username,
+                        password,
+                        is_managed_registry,
+                        show_tags,
+                        show_manifests,
+                        detail,
+                        top,
+                        max_parallel):
+    """Lists the repositories of a registry with their tags and/or manifests. The repositories are crawled on a
+    thread pool as soon as each page of the catalog is received, and all requests share one pool of connections.
+    Repositories which could not be crawled are reported with an error instead of failing the whole listing.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _crawl(repository):
+        item = {'name': repository}
+        try:
+            repository_username, repository_password = get_credentials(repository)
+            if show_tags:
+                item['tags'] = _obtain_data_from_registry(
+                    login_server=login_server,
+                    path='/acr/v1/{}/_tags'.format(repository) if detail else '/v2/{}/tags/list'.format(repository),
+                    username=repository_username,
+                    password=repository_password,
+                    result_index='tags',
+                    session=session)
+            if show_manifests:
+                item['manifests'] = _obtain_data_from_registry(
+                    login_server=login_server,
+                    path='/acr/v1/{}/_manifests'.format(repository) if detail else
+                    '/v2/_acr/{}/manifests/list'.format(repository),
+                    username=repository_username,
+                    password=repository_password,
+                    result_index='manifests',
+                    session=session)
+        except CLIError as e:
+            logger.warning("Failed to crawl repository '%s': %s", repository, e)
+            item['error'] = str(e)
+        return item
+
+    session = _get_registry_session(max_parallel)
+    try:
+        login_server, get_credentials = get_repository_credentials_getter(
+            cli_ctx=cli_ctx,
+            registry_name=registry_name,
+            resource_group_name=resource_group_name,
+            username=username,
+            password=password,
+            session=session)
+        catalog_username, catalog_password = get_credentials(None)
+        with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+            futures = []
+            for repositories in _iterate_data_from_registry(
+                    login_server=login_server,
+                    path='/acr/v1/_catalog' if is_managed_registry else '/v2/_catalog',
+                    username=catalog_username,
+                    password=catalog_password,
+                    result_index='repositories',
+                    top=top,
+                    session=session):
+                futures += [executor.submit(_crawl, repository) for repository in repositories]
+            return [future.result() for future in futures]
+    finally:
+        session.close()
+
+
+def _get_registry_session(max_parallel):
+    """Returns an HTTP session keeping a connection to the registry alive for each of the max_parallel workers,
+    and one for the catalog which is paged through while they run."""
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=max_parallel + 1))
+    return session
+
+
 def acr_repository_show_tags(cmd,
                              registry_name,
                              repository,
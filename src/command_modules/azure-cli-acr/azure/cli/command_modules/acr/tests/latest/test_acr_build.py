@@ -0,0 +1,125 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import gzip
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+import mock
+
+from azure.cli.command_modules.acr.build import (
+    _collect_source_entries,
+    _pack_source_code,
+    _upload_source_code
+)
+from azure.cli.command_modules.acr._archive_utils import BlockBlobWriter
+
+
+class _BlobServiceStub(object):
+    def __init__(self):
+        self.blocks = {}
+        self.block_list = None
+
+    def put_block(self, container_name, blob_name, block, block_id):  # pylint: disable=unused-argument
+        self.blocks[block_id] = block
+
+    def put_block_list(self, container_name, blob_name, block_list):  # pylint: disable=unused-argument
+        self.block_list = [b.id for b in block_list]
+
+    def get_blob(self):
+        return b''.join(self.blocks[block_id] for block_id in self.block_list)
+
+
+class AcrBuildSourceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.source_location = tempfile.mkdtemp()
+        self.config_dir = tempfile.mkdtemp()
+        self._write('Dockerfile', 'FROM scratch')
+        self._write('.dockerignore', 'node_modules\n!node_modules/keep/*.txt\nbuild\n*.log\n!important.log')
+        self._write('app.py', 'print(1)')
+        self._write('debug.log', 'debug')
+        self._write('important.log', 'important')
+        self._write('node_modules/lib/index.js', 'module')
+        self._write('node_modules/keep/license.txt', 'license')
+        self._write('build/out/app.bin', 'binary')
+        self._write('.git/HEAD', 'ref')
+
+    def tearDown(self):
+        shutil.rmtree(self.source_location, ignore_errors=True)
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.source_location, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def test_collect_source_entries_prunes_ignored_dirs(self):
+        with mock.patch('os.listdir', wraps=os.listdir) as listdir:
+            entries = _collect_source_entries(self.source_location, 'Dockerfile')
+            scanned = [os.path.relpath(c[0][0], self.source_location) for c in listdir.call_args_list]
+
+        self.assertEqual([arcname for _, arcname, _ in entries],
+                         ['', '.dockerignore', 'Dockerfile', 'app.py', 'important.log',
+                          'node_modules/keep/license.txt'])
+        # only an exception rule can include an item of an ignored dir
+        self.assertIn(os.path.join('node_modules', 'keep'), scanned)
+        self.assertNotIn(os.path.join('node_modules', 'lib'), scanned)
+        self.assertNotIn('build', scanned)
+        self.assertNotIn('.git', scanned)
+
+    def test_collect_source_entries_includes_ignored_docker_file(self):
+        self._write('build/Dockerfile', 'FROM scratch')
+        entries = _collect_source_entries(self.source_location, 'build/Dockerfile')
+        self.assertIn('build/Dockerfile', [arcname for _, arcname, _ in entries])
+        self.assertNotIn('build/out/app.bin', [arcname for _, arcname, _ in entries])
+
+    def test_pack_source_code_streams_blocks(self):
+        blob_service = _BlobServiceStub()
+        writer = BlockBlobWriter(blob_service, 'container', 'blob', block_size=512, max_connections=2)
+        data = os.urandom(100000)
+        with open(os.path.join(self.source_location, 'data.bin'), 'wb') as f:
+            f.write(data)
+
+        _pack_source_code(_collect_source_entries(self.source_location, 'Dockerfile'), writer)
+
+        self.assertGreater(len(blob_service.block_list), 1)
+        self.assertEqual(writer.size, len(blob_service.get_blob()))
+        with gzip.GzipFile(fileobj=io.BytesIO(blob_service.get_blob())) as f:
+            archive = tarfile.open(fileobj=io.BytesIO(f.read()))
+        self.assertIn('node_modules/keep/license.txt', archive.getnames())
+        self.assertEqual(archive.extractfile('data.bin').read(), data)
+
+    @mock.patch('azure.cli.command_modules.acr.build.BlockBlobService', autospec=True)
+    def test_upload_source_code_reuses_unchanged_context(self, mock_blob_service):
+        cli_ctx = mock.MagicMock()
+        cli_ctx.cloud.name = 'AzureCloud'
+        cli_ctx.config.config_dir = self.config_dir
+        cli_ctx.config.getint.return_value = 60 * 60
+        client = mock.MagicMock()
+        client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        client.get_build_source_upload_url.return_value = mock.MagicMock(
+            upload_url='https://account.blob.core.windows.net/container/source.tar.gz?sv=token',
+            relative_path='source/source.tar.gz')
+
+        for _ in range(2):
+            self.assertEqual(_upload_source_code(cli_ctx, client, 'registry', 'rg', self.source_location,
+                                                 'Dockerfile'), 'source/source.tar.gz')
+        self.assertEqual(client.get_build_source_upload_url.call_count, 1)
+        self.assertEqual(mock_blob_service.return_value.put_block_list.call_count, 1)
+
+        # a modified context is uploaded again
+        self._write('app.py', 'print("changed")')
+        _upload_source_code(cli_ctx, client, 'registry', 'rg', self.source_location, 'Dockerfile')
+        self.assertEqual(client.get_build_source_upload_url.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
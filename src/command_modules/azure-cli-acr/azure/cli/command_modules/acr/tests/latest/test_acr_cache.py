@@ -0,0 +1,154 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import base64
+import json
+import shutil
+import tempfile
+import time
+import unittest
+import mock
+
+from knack.util import CLIError
+from msrestazure.azure_exceptions import CloudError
+from azure.mgmt.containerregistry.v2018_02_01_preview.models import Registry, Sku
+
+from azure.cli.command_modules.acr._utils import ACR_CACHE, get_registry_by_name, _cache_registry
+from azure.cli.command_modules.acr.custom import acr_delete
+from azure.cli.command_modules.acr._docker_utils import get_access_credentials
+from azure.cli.command_modules.acr.repository import acr_repository_show_tags
+
+
+def _get_token(expires_in):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': time.time() + expires_in}).encode()).decode().rstrip('=')
+    return 'header.{}.signature'.format(payload)
+
+
+def _get_token_response(**tokens):
+    response = mock.MagicMock()
+    response.status_code = 200
+    response.content = json.dumps(tokens).encode()
+    return response
+
+
+class AcrCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.cloud.name = 'AzureCloud'
+        self.cli_ctx.config.config_dir = self.config_dir
+        self.cli_ctx.config.getint.return_value = 24 * 60 * 60
+        self.cli_ctx.data = {'subscription_id': '00000000-0000-0000-0000-000000000000'}
+
+        self.registry = Registry(location='westus', sku=Sku(name='Standard'))
+        self.registry.id = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/testrg/' \
+                           'providers/Microsoft.ContainerRegistry/registries/testregistry'
+        self.registry.login_server = 'testregistry.azurecr.io'
+
+    def tearDown(self):
+        ACR_CACHE.flush()
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    @mock.patch('azure.cli.command_modules.acr._utils.get_acr_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._utils.get_resources_in_subscription', autospec=True)
+    def test_get_registry_by_name_cached(self, mock_get_resources, mock_get_acr_service_client):
+        resource = mock.MagicMock(id=self.registry.id)
+        resource.name = 'testregistry'
+        mock_get_resources.return_value = [resource]
+        client = mock_get_acr_service_client.return_value.registries
+        client.get.return_value = self.registry
+
+        for _ in range(2):
+            self.assertEqual(get_registry_by_name(self.cli_ctx, 'TestRegistry'), (self.registry, 'testrg'))
+        self.assertEqual(mock_get_resources.call_count, 1)
+        client.get.assert_called_with('testrg', 'TestRegistry')
+
+        # a registry which is not in the cached resource group is resolved again
+        client.get.side_effect = [CloudError(mock.MagicMock(status_code=404), 'Not found'), self.registry]
+        self.assertEqual(get_registry_by_name(self.cli_ctx, 'testregistry'), (self.registry, 'testrg'))
+        self.assertEqual(mock_get_resources.call_count, 2)
+
+        # registries are cached per subscription
+        client.get.side_effect = None
+        self.cli_ctx.data['subscription_id'] = '11111111-1111-1111-1111-111111111111'
+        get_registry_by_name(self.cli_ctx, 'testregistry')
+        self.assertEqual(mock_get_resources.call_count, 3)
+
+        # the cache is disabled by a zero TTL
+        self.cli_ctx.config.getint.return_value = 0
+        get_registry_by_name(self.cli_ctx, 'testregistry')
+        self.assertEqual(mock_get_resources.call_count, 4)
+
+    @mock.patch('azure.cli.command_modules.acr._utils.get_resources_in_subscription', autospec=True)
+    def test_delete_registry_resolved_live(self, mock_get_resources):
+        moved_registry_id = self.registry.id.replace('/testrg/', '/movedrg/')
+        resource = mock.MagicMock(id=moved_registry_id)
+        resource.name = 'testregistry'
+        mock_get_resources.return_value = [resource]
+        _cache_registry(self.cli_ctx, 'testregistry', self.registry.id, self.registry)
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = self.cli_ctx
+        client = mock.MagicMock()
+
+        # a registry is not deleted in its cached resource group, which may be stale
+        acr_delete(cmd, client, 'testregistry')
+        client.delete.assert_called_once_with('movedrg', 'testregistry')
+        self.assertEqual(mock_get_resources.call_count, 1)
+        self.assertFalse(ACR_CACHE.data)
+
+    @mock.patch('azure.cli.core._profile.Profile.get_subscription', autospec=True)
+    @mock.patch('azure.cli.core._profile.Profile.get_raw_token', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_registry_by_name', autospec=True)
+    @mock.patch('requests.request', autospec=True)
+    @mock.patch('requests.post', autospec=True)
+    @mock.patch('requests.get', autospec=True)
+    def test_access_token_cached(self, mock_requests_get, mock_requests_post, mock_requests_request,
+                                 mock_get_registry_by_name, mock_get_raw_token, mock_get_subscription):
+        mock_get_registry_by_name.return_value = self.registry, 'testrg'
+        mock_get_subscription.return_value = {'tenantId': 'testtenant', 'user': {'name': 'testuser'}}
+        mock_get_raw_token.return_value = ('Bearer', 'aadaccesstoken', {}), 'testsubscription', 'testtenant'
+
+        challenge_response = mock.MagicMock()
+        challenge_response.headers = {
+            'WWW-Authenticate': 'Bearer realm="https://testregistry.azurecr.io/oauth2/token",'
+                                'service="testregistry.azurecr.io"'
+        }
+        challenge_response.status_code = 401
+        mock_requests_get.return_value = challenge_response
+
+        refresh_token, access_token = _get_token(3 * 60 * 60), _get_token(60 * 60)
+        mock_requests_post.side_effect = [_get_token_response(refresh_token=refresh_token),
+                                          _get_token_response(access_token=access_token),
+                                          _get_token_response(refresh_token=_get_token(3 * 60 * 60)),
+                                          _get_token_response(access_token=_get_token(60 * 60))]
+        _cache_registry(self.cli_ctx, 'testregistry', self.registry.id, self.registry)
+
+        for _ in range(2):
+            self.assertEqual(
+                get_access_credentials(self.cli_ctx, 'testregistry', repository='testrepository', permission='pull'),
+                ('testregistry.azurecr.io', None, access_token))
+        # the registry, the challenge and the tokens were only requested once
+        self.assertEqual(mock_get_registry_by_name.call_count, 1)
+        self.assertEqual(mock_requests_get.call_count, 1)
+        self.assertEqual(mock_requests_post.call_count, 2)
+
+        # a rejected token is not reused
+        unauthorized_response = mock.MagicMock()
+        unauthorized_response.status_code = 401
+        unauthorized_response.text = ''
+        mock_requests_request.return_value = unauthorized_response
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = self.cli_ctx
+        with self.assertRaises(CLIError):
+            acr_repository_show_tags(cmd, 'testregistry', 'testrepository')
+
+        get_access_credentials(self.cli_ctx, 'testregistry', repository='testrepository', permission='pull')
+        self.assertEqual(mock_requests_get.call_count, 2)
+        self.assertEqual(mock_requests_post.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ import json
 import unittest
 import mock
 
+from knack.util import CLIError
 from azure.mgmt.containerregistry.v2018_02_01_preview.models import Registry, Sku
 
 from azure.cli.command_modules.acr.repository import (
@@ -76,6 +77,66 @@ class AcrMockCommandsTests(unittest.TestCase):
             json=None,
             verify=mock.ANY)
 
+    @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr._docker_utils.get_access_credentials', autospec=True)
+    @mock.patch('azure.cli.command_modules.acr.repository._get_registry_session', autospec=True)
+    def test_repository_list_crawl(self, mock_get_registry_session, mock_get_access_credentials,
+                                   mock_get_registry_by_name):
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = DummyCli()
+
+        def _get_response(url, params, **kwargs):  # pylint: disable=unused-argument
+            response = mock.MagicMock()
+            response.headers = {}
+            response.status_code = 200
+            if url.endswith('/acr/v1/_catalog') and params.get('last') is None:
+                response.headers = {'link': '</acr/v1/_catalog?last=testrepo2&n=20&orderby=>; rel="next"'}
+                content = {'repositories': ['testrepo1', 'testrepo2']}
+            elif url.endswith('/acr/v1/_catalog'):
+                content = {'repositories': ['testrepo3']}
+            elif 'testrepo3' in url:
+                response.status_code = 404
+                response.text = ''
+                content = {}
+            elif url.endswith('/_tags'):
+                content = {'tags': [{'name': 'latest'}]}
+            else:
+                content = {'manifests': [{'digest': 'sha256:abc'}]}
+            response.content = json.dumps(content).encode()
+            response.json.return_value = content
+            return response
+
+        session = mock_get_registry_session.return_value
+        session.request.side_effect = _get_response
+        mock_get_registry_by_name.return_value = Registry(location='westus', sku=Sku(name='Standard')), 'testrg'
+        mock_get_access_credentials.return_value = 'testregistry.azurecr.io', 'username', 'password'
+
+        result = acr_repository_list(cmd, 'testregistry', show_tags=True, show_manifests=True, detail=True,
+                                     max_parallel=4)
+
+        self.assertEqual([item['name'] for item in result], ['testrepo1', 'testrepo2', 'testrepo3'])
+        self.assertEqual(result[0]['tags'], [{'name': 'latest'}])
+        self.assertEqual(result[1]['manifests'], [{'digest': 'sha256:abc'}])
+        # a repository which could not be crawled does not fail the listing
+        self.assertIn('error', result[2])
+        mock_get_registry_session.assert_called_once_with(4)
+        session.request.assert_any_call(
+            method='get',
+            url='https://testregistry.azurecr.io/acr/v1/testrepo2/_manifests',
+            headers=get_authorization_header('username', 'password'),
+            params={
+                'n': 20,
+                'orderby': None
+            },
+            json=None,
+            verify=mock.ANY)
+        session.close.assert_called_once_with()
+
+        # manifests can only be crawled on managed registries
+        mock_get_registry_by_name.return_value = Registry(location='westus', sku=Sku(name='Classic')), 'testrg'
+        with self.assertRaises(CLIError):
+            acr_repository_list(cmd, 'testregistry', show_manifests=True)
+
     @mock.patch('azure.cli.command_modules.acr._utils.get_registry_by_name', autospec=True)
     @mock.patch('azure.cli.command_modules.acr.repository.get_access_credentials', autospec=True)
     @mock.patch('requests.request', autospec=True)
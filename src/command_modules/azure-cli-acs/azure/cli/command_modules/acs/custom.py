@@ -38,13 +38,13 @@ from azure.cli.command_modules.acs._params import regions_in_preview, regions_in
 from azure.cli.core.api import get_config_dir
 from azure.cli.core._profile import Profile
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
+from azure.cli.core.commands.graph import resolve_object_id
 from azure.cli.core.keys import is_valid_ssh_rsa_public_key
 from azure.cli.core.util import in_cloud_console, shell_safe_json_parse, truncate_text, sdk_no_wait
 from azure.graphrbac.models import (ApplicationCreateParameters,
                                     PasswordCredential,
                                     KeyCredential,
-                                    ServicePrincipalCreateParameters,
-                                    GetObjectsParameters)
+                                    ServicePrincipalCreateParameters)
 from azure.mgmt.containerservice.models import ContainerServiceLinuxProfile
 from azure.mgmt.containerservice.models import ContainerServiceNetworkProfile
 from azure.mgmt.containerservice.models import ContainerServiceOrchestratorTypes
@@ -1279,26 +1279,7 @@ def _resolve_role_id(role, scope, definitions_client):
 
 def _resolve_object_id(cli_ctx, assignee):
     client = get_graph_rbac_management_client(cli_ctx)
-    result = None
-    if assignee.find('@') >= 0:  # looks like a user principal name
-        result = list(client.users.list(filter="userPrincipalName eq '{}'".format(assignee)))
-    if not result:
-        result = list(client.service_principals.list(
-            filter="servicePrincipalNames/any(c:c eq '{}')".format(assignee)))
-    if not result:  # assume an object id, let us verify it
-        result = _get_object_stubs(client, [assignee])
-
-    # 2+ matches should never happen, so we only check 'no match' here
-    if not result:
-        raise CLIError("No matches in graph database for '{}'".format(assignee))
-
-    return result[0].object_id
-
-
-def _get_object_stubs(graph_client, assignees):
-    params = GetObjectsParameters(include_directory_object_references=True,
-                                  object_ids=assignees)
-    return list(graph_client.objects.get_objects_by_object_ids(params))
+    return resolve_object_id(cli_ctx, client, assignee)
 
 
 def _update_dict(dict1, dict2):
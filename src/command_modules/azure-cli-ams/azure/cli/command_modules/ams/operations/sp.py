@@ -18,6 +18,8 @@ from azure.graphrbac.models.graph_error import GraphErrorException
 from azure.graphrbac.models import (ApplicationCreateParameters,
                                     ServicePrincipalCreateParameters)
 
+from azure.cli.core.commands.graph import resolve_principal_names, resolve_role_definition_names
+
 from azure.cli.command_modules.ams._client_factory import (_graph_client_factory, _auth_client_factory)
 from azure.cli.command_modules.ams._utils import (_gen_guid, _is_guid)
 
@@ -97,14 +99,6 @@ def _update_password_credentials(client, app_object_id, sp_password, years):
     client.applications.update_password_credentials(app_object_id, app_creds)
 
 
-def _get_displayable_name(graph_object):
-    if graph_object.user_principal_name:
-        return graph_object.user_principal_name
-    elif graph_object.service_principal_names:
-        return graph_object.service_principal_names[0]
-    return graph_object.display_name or ''
-
-
 def list_role_assignments(cmd, assignee_object_id):
     '''
     :param include_groups: include extra assignments to the groups of which the user is a
@@ -125,9 +119,9 @@ def list_role_assignments(cmd, assignee_object_id):
     # 1. fill in logic names to get things understandable.
     # (it's possible that associated roles and principals were deleted, and we just do nothing.)
     # 2. fill in role names
-    role_defs = list(definitions_client.list(
-        scope=('/subscriptions/' + definitions_client.config.subscription_id)))
-    role_dics = {i.id: i.role_name for i in role_defs}
+    role_dics = resolve_role_definition_names(
+        cmd.cli_ctx, graph_client.config.tenant_id, definitions_client,
+        '/subscriptions/' + definitions_client.config.subscription_id, [i['roleDefinitionId'] for i in results])
     for i in results:
         if role_dics.get(i['roleDefinitionId']):
             i['roleDefinitionName'] = role_dics[i['roleDefinitionId']]
@@ -136,8 +130,7 @@ def list_role_assignments(cmd, assignee_object_id):
     principal_ids = set(i['principalId'] for i in results if i['principalId'])
     if principal_ids:
         try:
-            principals = _get_object_stubs(graph_client, principal_ids)
-            principal_dics = {i.object_id: _get_displayable_name(i) for i in principals}
+            principal_dics = resolve_principal_names(cmd.cli_ctx, graph_client, principal_ids)
 
             for i in [r for r in results if not r.get('principalName')]:
                 i['principalName'] = ''
@@ -191,12 +184,6 @@ def _resolve_role_id(role, scope, definitions_client):
     return role_id
 
 
-def _get_object_stubs(graph_client, assignees):
-    from azure.graphrbac.models import GetObjectsParameters
-    params = GetObjectsParameters(include_directory_object_references=True, object_ids=assignees)
-    return list(graph_client.objects.get_objects_by_object_ids(params))
-
-
 def _get_application_object_id(client, identifier):
     return list(client.list(filter="appId eq '{}'".format(identifier)))[0].object_id
 
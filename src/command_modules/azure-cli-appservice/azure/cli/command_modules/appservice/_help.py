@@ -345,12 +345,18 @@ helps['webapp deployment source config-zip'] = """
         to enable Kudu detection logic and build script generation process.
         See https://github.com/projectkudu/kudu/wiki/Configurable-settings#enabledisable-build-actions-preview.
         Alternately the setting can be enabled using the az webapp config appsettings set command.
+        The zip file is streamed from disk, and the upload is retried on transient failures.
     examples:
          - name: Perform deployment by using zip file content.
            text: >
              az webapp deployment source config-zip \\
                  -g <myRG> -n <myAppName> \\
                  --src <zip file path location>
+         - name: Deploy the same zip file to several apps and slots, four at a time.
+           text: >
+             az webapp deployment source config-zip \\
+                 --ids <webAppId> <webAppSlotId> <otherWebAppId> \\
+                 --src <zip file path location> --max-parallel 4
 """
 
 helps['webapp deployment source delete'] = """
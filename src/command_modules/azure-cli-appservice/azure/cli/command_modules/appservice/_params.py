@@ -174,6 +174,9 @@ def load_arguments(self, _):
                    completer=get_resource_name_completion_list('Microsoft.Web/sites'), id_part='name')
     with self.argument_context('webapp deployment container config') as c:
         c.argument('enable', options_list=['--enable-cd', '-e'], help='enable/disable continuous deployment', arg_type=get_enum_type(['true', 'false']))
+    with self.argument_context('webapp deployment source config-zip') as c:
+        c.argument('slot', options_list=['--slot', '-s'], id_part='child_name_1',
+                   help="the name of the slot. Default to the productions slot if not specified")
     with self.argument_context('webapp deployment slot') as c:
         c.argument('slot', help='the name of the slot')
         c.argument('webapp', arg_type=name_arg_type, completer=get_resource_name_completion_list('Microsoft.Web/sites'),
@@ -45,6 +45,13 @@ from ._appservice_utils import _generic_site_operation
 
 logger = get_logger(__name__)
 
+ZIP_DEPLOY_RETRY_TIMES = 3
+ZIP_DEPLOY_RETRY_INTERVAL = 5
+ZIP_DEPLOY_PROGRESS_INTERVAL = 4 * 1024 * 1024  # 4 MiB
+ZIP_DEPLOY_STATUS_INITIAL_INTERVAL = 0.5
+ZIP_DEPLOY_STATUS_MAX_INTERVAL = 15
+ZIP_DEPLOY_STATUS_TIMEOUT = 50 * 60
+
 # pylint:disable=no-member,too-many-lines,too-many-locals
 
 # region "Common routines shared with quick-start extensions."
@@ -167,29 +174,21 @@ def update_app_settings(cmd, resource_group_name, name, settings=None, slot=None
 
 
 def enable_zip_deploy(cmd, resource_group_name, name, src, slot=None):
+    import os
+    import urllib3
     user_name, password = _get_site_credential(cmd.cli_ctx, resource_group_name, name, slot)
     scm_url = _get_scm_url(cmd, resource_group_name, name, slot)
     zip_url = scm_url + '/api/zipdeploy?isAsync=true'
     deployment_status_url = scm_url + '/api/deployments/latest'
 
-    import urllib3
     authorization = urllib3.util.make_headers(basic_auth='{0}:{1}'.format(user_name, password))
-    headers = authorization
+    headers = dict(authorization)
     headers['content-type'] = 'application/octet-stream'
 
-    import requests
-    import os
-    # Read file content
-    with open(os.path.realpath(os.path.expanduser(src)), 'rb') as fs:
-        zip_content = fs.read()
-        requests.post(zip_url, data=zip_content, headers=headers)
+    _upload_zip_deployment(cmd.cli_ctx, zip_url, os.path.realpath(os.path.expanduser(src)), headers,
+                           message="Uploading to '{}'".format(name if slot is None else name + '/' + slot))
     # check the status of async deployment
-    response = requests.get(deployment_status_url, headers=authorization)
-    response = response.json()
-    if response.get('status', 0) != 4:
-        logger.warning(response.get('progress', ''))
-        response = _check_zip_deployment_status(deployment_status_url, authorization)
-    return response
+    return _check_zip_deployment_status(deployment_status_url, authorization)
 
 
 def get_sku_name(tier):
@@ -1810,23 +1809,94 @@ def list_locations(cmd, sku, linux_workers_enabled=None):
     return client.list_geo_regions(full_sku, linux_workers_enabled)
 
 
-def _check_zip_deployment_status(deployment_status_url, authorization):
+def _check_zip_deployment_status(deployment_status_url, authorization, timeout=ZIP_DEPLOY_STATUS_TIMEOUT):
+    """Polls the status of an async zip deployment, starting with a short interval doubled after each poll."""
     import requests
     import time
-    num_trials = 1
-    while num_trials < 200:
-        time.sleep(15)
-        response = requests.get(deployment_status_url, headers=authorization)
-        res_dict = response.json()
-        num_trials = num_trials + 1
-        if res_dict['status'] == 5:
-            logger.warning("Zip deployment failed status %s", res_dict['status_text'])
-            break
-        elif res_dict['status'] == 4:
+    deadline = time.time() + timeout
+    interval = ZIP_DEPLOY_STATUS_INITIAL_INTERVAL
+    res_dict = {}
+    progress = None
+    while True:
+        try:
+            response = requests.get(deployment_status_url, headers=authorization)
+            res_dict = response.json()
+        except (requests.exceptions.RequestException, ValueError) as ex:
+            # the site may be restarting while the deployment is applied
+            logger.debug('Failed to get the deployment status: %s', ex)
+        else:
+            if res_dict.get('status') == 5:
+                logger.warning("Zip deployment failed status %s", res_dict.get('status_text'))
+                break
+            elif res_dict.get('status') == 4:
+                break
+            if res_dict.get('progress') and res_dict['progress'] != progress:
+                progress = res_dict['progress']
+                logger.warning(progress)
+        if time.time() + interval > deadline:
             break
-        logger.warning(res_dict['progress'])
+        time.sleep(interval)
+        interval = min(interval * 2, ZIP_DEPLOY_STATUS_MAX_INTERVAL)
     # if the deployment is taking longer than expected
-    if res_dict['status'] != 4:
+    if res_dict.get('status') != 4:
         logger.warning("""Deployment is taking longer than expected. Please verify status at '%s'
             beforing launching the app""", deployment_status_url)
     return res_dict
+
+
+def _upload_zip_deployment(cli_ctx, zip_url, src, headers, message='Uploading',
+                           retry_times=ZIP_DEPLOY_RETRY_TIMES, retry_interval=ZIP_DEPLOY_RETRY_INTERVAL):
+    """Streams the zip file to the Kudu zipdeploy API, retrying on connection errors and server errors."""
+    import requests
+    import time
+    hook = cli_ctx.get_progress_controller(det=True)
+    for attempt in range(1, retry_times + 1):
+        try:
+            with _ZipDeploymentReader(src, hook, message) as data:
+                response = requests.post(zip_url, data=data, headers=headers)
+        except requests.exceptions.RequestException as ex:
+            error = str(ex)
+        else:
+            if response.status_code < 400:
+                hook.end()
+                return response
+            error = 'Zip deployment failed with status code {}: {}'.format(response.status_code, response.text)
+            if response.status_code < 500 and response.status_code not in (408, 429):
+                hook.end()
+                raise CLIError(error)
+        if attempt == retry_times:
+            hook.end()
+            raise CLIError(error)
+        logger.warning('Retrying zip deployment upload (%s/%s) after error: %s', attempt, retry_times - 1, error)
+        time.sleep(retry_interval * attempt)
+
+
+class _ZipDeploymentReader(object):
+    """A file reader reporting upload progress. Its length lets requests send the file with a Content-Length
+    header while reading it in blocks, instead of loading it in memory."""
+
+    def __init__(self, path, hook, message):
+        import os
+        self._file = open(path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._hook = hook
+        self._message = message
+        self._read = 0
+        self._reported = 0
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._file.close()
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self._read += len(data)
+        if self._read - self._reported >= ZIP_DEPLOY_PROGRESS_INTERVAL or self._read == self._size:
+            self._reported = self._read
+            self._hook.add(message=self._message, value=self._read, total_val=self._size)
+        return data
@@ -2,6 +2,9 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import os
+import shutil
+import tempfile
 import unittest
 import mock
 
@@ -25,7 +28,8 @@ from azure.cli.command_modules.appservice.custom import (set_deployment_user,
                                                          show_webapp,
                                                          get_streaming_log,
                                                          download_historical_logs,
-                                                         validate_linux_create_options)
+                                                         validate_linux_create_options,
+                                                         enable_zip_deploy)
 
 # pylint: disable=line-too-long
 from vsts_cd_manager.continuous_delivery_manager import ContinuousDeliveryResult
@@ -325,6 +329,53 @@ class TestWebappMocked(unittest.TestCase):
         self.assertFalse(validate_linux_create_options(None, None, test_multi_container_config, None))
         self.assertFalse(validate_linux_create_options(None, None, None, None))
 
+    @mock.patch('time.sleep', autospec=True)
+    @mock.patch('requests.get', autospec=True)
+    @mock.patch('requests.post', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_scm_url', autospec=True)
+    @mock.patch('azure.cli.command_modules.appservice.custom._get_site_credential', autospec=True)
+    def test_enable_zip_deploy(self, site_credential_mock, scm_url_mock, post_mock, get_mock, sleep_mock):
+        # prepare
+        site_credential_mock.return_value = 'great_user', 'secret_password'
+        scm_url_mock.return_value = 'https://great_app.scm.azurewebsites.net'
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        src = os.path.join(test_dir, 'app.zip')
+        with open(src, 'wb') as f:
+            f.write(os.urandom(10000))
+        uploaded = []
+
+        def _upload(url, data, headers):  # pylint: disable=unused-argument
+            uploaded.append((len(data), b''.join(iter(lambda: data.read(4096), b''))))
+            return mock.MagicMock(status_code=503 if len(uploaded) == 1 else 202, text='')
+
+        post_mock.side_effect = _upload
+        get_mock.return_value.json.side_effect = [{'status': 1, 'progress': 'Deploying'},
+                                                  {'status': 1, 'progress': 'Deploying'},
+                                                  {'status': 4, 'progress': ''}]
+        cmd_mock = mock.MagicMock()
+
+        # action
+        result = enable_zip_deploy(cmd_mock, 'rg', 'great_app', src)
+
+        # assert
+        self.assertEqual(result['status'], 4)
+        # the upload is streamed from the file and retried after a server error
+        self.assertEqual(post_mock.call_count, 2)
+        with open(src, 'rb') as f:
+            self.assertEqual(uploaded[1], (10000, f.read()))
+        # the status is polled with an increasing interval
+        polling_intervals = [c[0][0] for c in sleep_mock.call_args_list[1:]]
+        self.assertEqual(polling_intervals, [0.5, 1.0])
+
+        # client errors are not retried
+        post_mock.side_effect = None
+        post_mock.return_value = mock.MagicMock(status_code=403, text='Forbidden')
+        post_mock.reset_mock()
+        with self.assertRaises(CLIError):
+            enable_zip_deploy(cmd_mock, 'rg', 'great_app', src)
+        self.assertEqual(post_mock.call_count, 1)
+
 
 class FakedResponse(object):  # pylint: disable=too-few-public-methods
     def __init__(self, status_code):
@@ -3,6 +3,8 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import json
+import os
 import re
 from six import string_types
 
@@ -17,11 +19,102 @@ from azure.cli.core import EXCLUDED_PARAMS
 from azure.cli.core.commands import CONFIRM_PARAM_NAME
 from azure.cli.core.commands import AzCommandGroup
 from azure.cli.core.util import get_file_json
+from azure.cli.core._session import Session
 
 
 _CLASS_NAME = re.compile(r"~(.*)")  # Strip model name from class docstring
 _UNDERSCORE_CASE = re.compile('(?!^)([A-Z]+)')  # Convert from CamelCase to underscore_case
 
+# ARGUMENT_CACHE keeps the flattened arguments of the operations, which only change with the SDK and this module
+ARGUMENT_CACHE = Session()
+_ARGUMENT_CACHE_FILE = 'batchArgumentCache.json'
+# Bump when the layout of the argument schema changes
+_ARGUMENT_SCHEMA_VERSION = 1
+_VALIDATOR_REF = 'validators.'
+# The cache key prefix, looked up once as finding the installed module version is not free
+_ARGUMENT_CACHE_PREFIX = {}
+
+
+def _load_argument_cache(cli_ctx):
+    cache_file = os.path.join(cli_ctx.config.config_dir, _ARGUMENT_CACHE_FILE)
+    if ARGUMENT_CACHE.filename != cache_file:
+        ARGUMENT_CACHE.load(cache_file)
+    return ARGUMENT_CACHE
+
+
+def _get_argument_cache_prefix():
+    """Get the prefix of the cache keys for the installed SDK and module, or None when
+    the module is not installed as a distribution and has no version to key the cache on.
+    """
+    if 'prefix' not in _ARGUMENT_CACHE_PREFIX:
+        from pkg_resources import get_distribution, DistributionNotFound
+        from azure.batch.version import VERSION
+        try:
+            module_version = get_distribution('azure-cli-batch').version
+            _ARGUMENT_CACHE_PREFIX['prefix'] = '{}/{}/{}/'.format(_ARGUMENT_SCHEMA_VERSION, module_version, VERSION)
+        except DistributionNotFound:
+            _ARGUMENT_CACHE_PREFIX['prefix'] = None
+    return _ARGUMENT_CACHE_PREFIX['prefix']
+
+
+def _get_cached_argument_schema(cli_ctx, key):
+    """Get the argument schema of an operation cached for the installed SDK and module.
+    :param cli_ctx: The CLI context, whose config dir holds the cache.
+    :param str key: The operation and flatten level.
+    :returns: dict or None
+    """
+    prefix = _get_argument_cache_prefix()
+    if not prefix:
+        return None
+    return _load_argument_cache(cli_ctx).get(prefix + key)
+
+
+def _cache_argument_schema(cli_ctx, key, schema):
+    """Cache the argument schema of an operation, unless it has values which can't be
+    serialized. Schemas cached for other SDK or module versions are dropped.
+    :param cli_ctx: The CLI context, whose config dir holds the cache.
+    :param str key: The operation and flatten level.
+    :param dict schema: The argument schema.
+    """
+    prefix = _get_argument_cache_prefix()
+    if not prefix:
+        return
+    try:
+        json.dumps(schema)
+    except (TypeError, ValueError):
+        return
+    cache = _load_argument_cache(cli_ctx)
+    for outdated in [k for k in cache.data if not k.startswith(prefix)]:
+        del cache[outdated]
+    cache[prefix + key] = schema
+
+
+def _encode_settings(settings):
+    """Replace the validator functions in argument settings with references, so
+    that the settings can be serialized.
+    :param dict settings: The kwargs of a CLICommandArgument.
+    :returns: dict
+    """
+    encoded = dict(settings)
+    for key in ['type', 'validator']:
+        func = encoded.get(key)
+        if callable(func) and getattr(validators, getattr(func, '__name__', ''), None) is func:
+            encoded[key] = _VALIDATOR_REF + func.__name__
+    return encoded
+
+
+def _decode_settings(settings):
+    """Resolve the validator references in serialized argument settings.
+    :param dict settings: The encoded kwargs of a CLICommandArgument.
+    :returns: dict
+    """
+    decoded = dict(settings)
+    for key in ['type', 'validator']:
+        ref = decoded.get(key)
+        if isinstance(ref, string_types) and ref.startswith(_VALIDATOR_REF):
+            decoded[key] = getattr(validators, ref[len(_VALIDATOR_REF):])
+    return decoded
+
 
 def _load_model(name):
     """Load a model class from the SDK in order to inspect for
@@ -449,6 +542,8 @@ class AzureBatchDataPlaneCommand(object):
         self._options_attrs = []
         # The loaded options model to populate for the request
         self._options_model = None
+        # The class name of the options model, loaded when the command runs
+        self._options_model_name = None
 
         def _get_operation():
             if not self._operation_func:
@@ -457,7 +552,15 @@ class AzureBatchDataPlaneCommand(object):
             return self._operation_func
 
         def _load_arguments():
-            return self._load_transformed_arguments(_get_operation())
+            cli_ctx = getattr(command_loader, 'cli_ctx', None)
+            if not cli_ctx:
+                return self._load_transformed_arguments(_get_operation())
+            cache_key = '{}/{}'.format(operation, self._flatten)
+            schema = _get_cached_argument_schema(cli_ctx, cache_key)
+            if not schema:
+                schema = self._build_argument_schema(_get_operation())
+                _cache_argument_schema(cli_ctx, cache_key, schema)
+            return self._load_schema_arguments(schema)
 
         def _load_descriptions():
             return extract_full_summary_from_signature(_get_operation())
@@ -576,6 +679,8 @@ class AzureBatchDataPlaneCommand(object):
         """Build request options model from command line arguments.
         :param dict kwargs: The request arguments being built.
         """
+        if self._options_model is None:
+            self._options_model = _load_model(self._options_model_name)()
         kwargs[self._options_param] = self._options_model
         for param in self._options_attrs:
             if param in pformat.IGNORE_OPTIONS:
@@ -734,16 +839,31 @@ class AzureBatchDataPlaneCommand(object):
         """Load all the command line arguments from the request parameters.
         :param func handler: The operation function.
         """
-        from azure.cli.core.commands.parameters import file_type
-        from argcomplete.completers import FilesCompleter, DirectoriesCompleter
+        return self._load_schema_arguments(self._build_argument_schema(handler))
+
+    def _build_argument_schema(self, handler):
+        """Inspect the operation and its request models for the command line arguments.
+        The result only holds JSON serializable values, so that it can be cached.
+        :param func handler: The operation function.
+        :returns: dict
+        """
         self.parser = BatchArgumentTree(self.validator)
         self._load_options_model(handler)
-        args = []
+        schema = {
+            'options_model': type(self._options_model).__name__,
+            'options_attrs': self._options_attrs,
+            'request_param': None,
+            'arg_tree': [],
+            'arguments': [],
+            'destination': False,
+            'head_cmd': False
+        }
+        args = schema['arguments']
         for arg in extract_args_from_signature(handler, excluded_params=EXCLUDED_PARAMS):
             arg_type = find_param_type(handler, arg[0])
             if arg[0] == self._options_param:
-                for option_arg in self._process_options():
-                    args.append(option_arg)
+                for _, option_arg in self._process_options():
+                    args.append({'settings': _encode_settings(option_arg.type.settings)})
             elif arg_type.startswith("str or"):
                 docstring = find_param_help(handler, arg[0])
                 choices = []
@@ -752,34 +872,74 @@ class AzureBatchDataPlaneCommand(object):
                     choices = docstring[values_index + 25:].split(', ')
                     choices = [enum_value(c) for c in choices if enum_value(c) != "'unmapped'"]
                     docstring = docstring[0:values_index]
-                args.append(((arg[0], CLICommandArgument(arg[0],
-                                                         options_list=[arg_name(arg[0])],
-                                                         required=False,
-                                                         default=None,
-                                                         choices=choices,
-                                                         help=docstring))))
+                args.append({'settings': {'dest': arg[0],
+                                          'options_list': [arg_name(arg[0])],
+                                          'required': False,
+                                          'default': None,
+                                          'choices': choices,
+                                          'help': docstring}})
             elif arg_type.startswith("~"):  # TODO: could add handling for enums
                 param_type = class_name(arg_type)
                 self.parser.set_request_param(arg[0], param_type)
                 param_model = _load_model(param_type)
                 self._flatten_object(arg[0], param_model)
-                for flattened_arg in self.parser.compile_args():
-                    args.append(flattened_arg)
-                param = 'json_file'
-                docstring = "A file containing the {} specification in JSON format. " \
-                            "If this parameter is specified, all '{} Arguments'" \
-                            " are ignored.".format(arg[0].replace('_', ' '), group_title(arg[0]))
-                args.append((param, CLICommandArgument(param,
-                                                       options_list=[arg_name(param)],
-                                                       required=False,
-                                                       default=None,
-                                                       type=file_type,
-                                                       completer=FilesCompleter(),
-                                                       help=docstring)))
+                schema['request_param'] = self.parser._request_param  # pylint: disable=protected-access
+                for name, details in self.parser:
+                    details = dict(details, name=name, options=dict(details['options']))
+                    details['options'].pop('validator', None)  # the required parameter validator is added back
+                    details['options'] = _encode_settings(details['options'])
+                    schema['arg_tree'].append(details)
+                args.append({'request_param': arg[0]})
             elif arg[0] not in pformat.IGNORE_PARAMETERS:
-                args.append(arg)
+                args.append({'settings': _encode_settings(arg[1].type.settings)})
         return_type = find_return_type(handler)
         if return_type and return_type.startswith('Generator'):
+            schema['destination'] = True
+        if return_type == 'None' and handler.__name__.startswith('get'):
+            schema['head_cmd'] = True
+        return schema
+
+    def _load_schema_arguments(self, schema):
+        """Load the command line arguments described by an argument schema.
+        :param dict schema: The argument schema of the operation.
+        """
+        from azure.cli.core.commands.parameters import file_type
+        from argcomplete.completers import FilesCompleter, DirectoriesCompleter
+        self.parser = BatchArgumentTree(self.validator)
+        if type(self._options_model).__name__ != schema['options_model']:
+            self._options_model = None
+        self._options_model_name = schema['options_model']
+        self._options_attrs = list(schema['options_attrs'])
+        self._head_cmd = schema['head_cmd']
+        args = []
+        for arg in schema['arguments']:
+            if 'request_param' not in arg:
+                settings = _decode_settings(arg['settings'])
+                args.append((settings['dest'], CLICommandArgument(**settings)))
+                continue
+            request_param = schema['request_param']
+            self.parser.set_request_param(request_param['name'], request_param['model'])
+            for details in schema['arg_tree']:
+                details = dict(details, options=_decode_settings(details['options']),
+                               dependencies=[d.split('.')[-1] for d in details['dependencies']])
+                details['options']['validator'] = \
+                    lambda ns: validators.validate_required_parameter(ns, self.parser)
+                self.parser.queue_argument(**details)
+            for flattened_arg in self.parser.compile_args():
+                args.append(flattened_arg)
+            param = 'json_file'
+            docstring = "A file containing the {} specification in JSON format. " \
+                        "If this parameter is specified, all '{} Arguments'" \
+                        " are ignored.".format(arg['request_param'].replace('_', ' '),
+                                               group_title(arg['request_param']))
+            args.append((param, CLICommandArgument(param,
+                                                   options_list=[arg_name(param)],
+                                                   required=False,
+                                                   default=None,
+                                                   type=file_type,
+                                                   completer=FilesCompleter(),
+                                                   help=docstring)))
+        if schema['destination']:
             param = 'destination'
             docstring = "The path to the destination file or directory."
             args.append((param, CLICommandArgument(param,
@@ -790,8 +950,6 @@ class AzureBatchDataPlaneCommand(object):
                                                    type=file_type,
                                                    validator=validators.validate_file_destination,
                                                    help=docstring)))
-        if return_type == 'None' and handler.__name__.startswith('get'):
-            self._head_cmd = True
         if self.confirmation:
             param = CONFIRM_PARAM_NAME
             docstring = 'Do not prompt for confirmation.'
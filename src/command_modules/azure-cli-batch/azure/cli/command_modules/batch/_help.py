@@ -316,6 +316,13 @@ helps['batch job-schedule reset'] = """
 helps['batch task create'] = """
     type: command
     short-summary: Create Batch tasks.
+    long-summary: >
+        The tasks of a JSON file are read as they are submitted, in requests of up to 100 tasks sent concurrently.
+        Tasks which fail to be added because of a server error are retried, the other failures are reported in the
+        submission status of the tasks.
+    examples:
+        - name: Create the tasks of a JSON lines file, one task per line, with up to 16 concurrent requests.
+          text: az batch task create --job-id job1 --json-file tasks.jsonl --max-parallel 16
 """
 
 helps['batch task reset'] = """
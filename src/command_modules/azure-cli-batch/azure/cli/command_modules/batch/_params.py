@@ -19,7 +19,7 @@ from azure.cli.command_modules.batch._completers import load_node_agent_skus
 from azure.cli.command_modules.batch._validators import \
     (application_enabled, datetime_format, storage_account_id, metadata_item_format,
      application_package_reference_format, validate_pool_resize_parameters,
-     certificate_reference_format, validate_json_file, validate_cert_file, keyvault_id,
+     certificate_reference_format, validate_json_file, validate_task_json_file, validate_cert_file, keyvault_id,
      environment_setting_format, validate_cert_settings, resource_file_format,
      validate_client_parameters)
 
@@ -130,7 +130,8 @@ def load_arguments(self, _):
         c.argument('thumbprint', help='The certificate thumbprint.', validator=validate_cert_settings)
 
     with self.argument_context('batch task create') as c:
-        c.argument('json_file', type=file_type, help='The file containing the task(s) to create in JSON format, if this parameter is specified, all other parameters are ignored.', validator=validate_json_file, completer=FilesCompleter())
+        c.argument('json_file', type=file_type, help='The file containing the task(s) to create in JSON format: a task, an array of tasks or one task per line. If this parameter is specified, all other parameters are ignored.', validator=validate_task_json_file, completer=FilesCompleter())
+        c.argument('max_parallel', type=int, help='The maximum number of concurrent requests adding the tasks of --json-file, each request adds up to 100 tasks.')
         c.argument('application_package_references', nargs='+', help='The space-separated list of IDs specifying the application packages to be installed. Space-separated application IDs with optional version in \'id[#version]\' format.', type=application_package_reference_format)
         c.argument('job_id', help='The ID of the job containing the task.')
         c.argument('task_id', help='The ID of the task.')
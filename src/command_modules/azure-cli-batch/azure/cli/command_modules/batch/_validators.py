@@ -177,6 +177,16 @@ def validate_json_file(namespace):
             raise ValueError("Invalid JSON file: {}".format(err))
 
 
+def validate_task_json_file(namespace):
+    """Validate the given task json file is accessible, its content is only read when the tasks are created"""
+    if namespace.json_file:
+        try:
+            with open(namespace.json_file, "rb"):
+                pass
+        except EnvironmentError:
+            raise ValueError("Cannot access JSON request file: " + namespace.json_file)
+
+
 def validate_cert_file(namespace):
     """Validate the give cert file existing"""
     try:
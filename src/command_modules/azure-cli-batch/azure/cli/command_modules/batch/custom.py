@@ -4,6 +4,8 @@
 # --------------------------------------------------------------------------------------------
 
 import base64
+import itertools
+import json
 from six.moves.urllib.parse import urlsplit  # pylint: disable=import-error
 
 from knack.log import get_logger
@@ -19,7 +21,7 @@ from azure.mgmt.batch.operations import (ApplicationPackageOperations)
 from azure.batch.models import (CertificateAddParameter, PoolStopResizeOptions, PoolResizeParameter,
                                 PoolResizeOptions, JobListOptions, JobListFromJobScheduleOptions,
                                 TaskAddParameter, TaskConstraints, PoolUpdatePropertiesParameter,
-                                StartTask, AffinityInformation)
+                                StartTask, AffinityInformation, TaskAddStatus, BatchErrorException)
 
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.profiles import get_sdk, ResourceType
@@ -28,6 +30,10 @@ from azure.cli.core.util import sdk_no_wait, get_file_json, in_cloud_console
 
 logger = get_logger(__name__)
 MAX_TASKS_PER_REQUEST = 100
+DEFAULT_MAX_PARALLEL_TASK_REQUESTS = 8
+TASK_ADD_RETRY_TIMES = 3
+TASK_ADD_RETRY_INTERVAL = 1
+JSON_READ_CHUNK_SIZE = 64 * 1024
 
 
 def transfer_doc(source_func, *additional_source_funcs):
@@ -279,25 +285,187 @@ def list_job(client, job_schedule_id=None, filter=None,  # pylint: disable=redef
     return list(client.list(job_list_options=option2))
 
 
+class _JsonFileReader(object):
+    """Reads the values of a JSON file one at a time, without loading the whole file.
+
+    The file holds either a JSON array, whose elements are read, or a sequence of JSON values such as JSON lines.
+    `is_array` tells which one once the iteration has started.
+    """
+
+    def __init__(self, path, chunk_size=JSON_READ_CHUNK_SIZE):
+        self.path = path
+        self.is_array = False
+        self._chunk_size = chunk_size
+        self._file = None
+        self._buffer = ''
+        self._pos = 0
+
+    def __iter__(self):
+        import io
+        decoder = json.JSONDecoder()
+        with io.open(self.path, 'r', encoding='utf-8-sig') as f:
+            self._file, self._buffer, self._pos = f, '', 0
+            if self._peek() != '[':
+                while self._peek() is not None:
+                    yield self._decode(decoder)
+                return
+            self.is_array = True
+            self._pos += 1
+            if self._peek() == ']':
+                self._pos += 1
+            else:
+                while True:
+                    yield self._decode(decoder)
+                    separator = self._peek()
+                    self._pos += 1
+                    if separator == ']':
+                        break
+                    elif separator != ',':
+                        raise ValueError("Expected ',' or ']' in JSON array.")
+            if self._peek() is not None:
+                raise ValueError('Unexpected content after JSON array.')
+
+    def _read(self):
+        chunk = self._file.read(self._chunk_size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return bool(chunk)
+
+    def _peek(self):
+        """Skips whitespace and returns the next character, or None at the end of the file."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                return None
+
+    def _decode(self, decoder):
+        self._peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # the value may continue in the next chunk
+                if self._read():
+                    continue
+                raise
+            # so may a number at the end of the chunk
+            if end == len(self._buffer) and not isinstance(value, (dict, list)) and self._read():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_task_chunks(tasks, json_file):
+    chunk = []
+    try:
+        for json_task in tasks:
+            chunk.append(TaskAddParameter.from_dict(json_task))
+            if len(chunk) == MAX_TASKS_PER_REQUEST:
+                yield chunk
+                chunk = []
+    except (ValueError, DeserializationError, TypeError, AttributeError):
+        raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+    if chunk:
+        yield chunk
+
+
+def _add_task_collection(client, job_id, tasks, retry_times=TASK_ADD_RETRY_TIMES):
+    """Adds a chunk of tasks, retrying the tasks which failed with a server error. Chunks rejected as too large are
+    split in halves. Returns the result of each task in the order of the chunk."""
+    import time
+    results = {}
+    pending = tasks
+    for attempt in range(retry_times + 1):
+        try:
+            submission = client.add_collection(job_id=job_id, value=pending)
+        except BatchErrorException as ex:
+            if len(pending) > 1 and ex.error and ex.error.code == 'RequestBodyTooLarge':
+                half = len(pending) // 2
+                for result in _add_task_collection(client, job_id, pending[:half], retry_times) + \
+                        _add_task_collection(client, job_id, pending[half:], retry_times):
+                    results[result.task_id] = result
+                break
+            raise
+        retry = []
+        for result in submission.value:  # pylint: disable=no-member
+            results[result.task_id] = result
+            if result.status == TaskAddStatus.server_error:
+                retry.append(result.task_id)
+        if not retry or attempt == retry_times:
+            break
+        pending = [t for t in pending if t.id in retry]
+        time.sleep(TASK_ADD_RETRY_INTERVAL * 2 ** attempt)
+    return [results[t.id] for t in tasks if t.id in results]
+
+
+def _add_tasks(cli_ctx, client, job_id, task_chunks, max_parallel):
+    """Submits the chunks of tasks with up to `max_parallel` concurrent requests and reports the progress."""
+    import time
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    hook = cli_ctx.get_progress_controller()
+    start = time.time()
+    submitted_tasks = []
+    pending = deque()
+
+    def _collect():
+        submitted_tasks.extend(pending.popleft().result())
+        elapsed = time.time() - start
+        hook.add(message='Added {} tasks ({:.0f} tasks/s)'.format(
+            len(submitted_tasks), len(submitted_tasks) / elapsed if elapsed else 0))
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        try:
+            for chunk in task_chunks:
+                pending.append(executor.submit(_add_task_collection, client, job_id, chunk))
+                # keep a bounded number of chunks read ahead of the requests
+                while len(pending) > max_parallel:
+                    _collect()
+            while pending:
+                _collect()
+        except Exception:
+            for future in pending:
+                future.cancel()
+            raise
+        finally:
+            hook.end()
+
+    failed = [t for t in submitted_tasks if t.status != TaskAddStatus.success]
+    if failed:
+        logger.warning('%d of %d tasks could not be added, e.g. task %s: %s', len(failed), len(submitted_tasks),
+                       failed[0].task_id, failed[0].error.message if failed[0].error else failed[0].status)
+    return submitted_tasks
+
+
 @transfer_doc(TaskAddParameter, TaskConstraints, AffinityInformation)
-def create_task(client,
+def create_task(cmd, client,
                 job_id, json_file=None, task_id=None, command_line=None, resource_files=None,
                 environment_settings=None, affinity_id=None, max_wall_clock_time=None,
                 retention_time=None, max_task_retry_count=None,
-                application_package_references=None):
+                application_package_references=None, max_parallel=DEFAULT_MAX_PARALLEL_TASK_REQUESTS):
     task = None
-    tasks = []
+    tasks = None
+    if max_parallel < 1:
+        raise ValueError('--max-parallel must be a positive integer.')
     if json_file:
-        json_obj = get_file_json(json_file)
+        reader = _JsonFileReader(json_file)
+        tasks = iter(reader)
         try:
-            task = TaskAddParameter.from_dict(json_obj)
-        except DeserializationError:
-            tasks = []
-            try:
-                for json_task in json_obj:
-                    tasks.append(TaskAddParameter.from_dict(json_task))
-            except (DeserializationError, TypeError):
-                raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
+            first = next(tasks, None)
+            if not reader.is_array:
+                second = next(tasks, None)
+                if second is None:
+                    task = TaskAddParameter.from_dict(first)
+                else:
+                    tasks = itertools.chain([first, second], tasks)
+            elif first is not None:
+                tasks = itertools.chain([first], tasks)
+        except (ValueError, DeserializationError, TypeError, AttributeError):
+            raise ValueError("JSON file '{}' is not formatted correctly.".format(json_file))
     else:
         if command_line is None or task_id is None:
             raise ValueError("Missing required arguments.\nEither --json-file, "
@@ -316,10 +484,4 @@ def create_task(client,
         client.add(job_id=job_id, task=task)
         return client.get(job_id=job_id, task_id=task.id)
 
-    submitted_tasks = []
-    for i in range(0, len(tasks), MAX_TASKS_PER_REQUEST):
-        submission = client.add_collection(
-            job_id=job_id,
-            value=tasks[i:i + MAX_TASKS_PER_REQUEST])
-        submitted_tasks.extend(submission.value)  # pylint: disable=no-member
-    return submitted_tasks
+    return _add_tasks(cmd.cli_ctx, client, job_id, _iter_task_chunks(tasks, json_file), max_parallel)
@@ -621,3 +621,141 @@ class TestBatchLoader(unittest.TestCase):  # pylint: disable=protected-access
         option = [arg for (name, arg) in args if name == 'node_reboot_option'][0]
         self.assertIsNotNone(option.choices)
         self.assertFalse([a for a in option.choices if "'" in a])
+
+    @mock.patch('pkg_resources.get_distribution', autospec=True)
+    def test_batch_load_cached_arguments(self, get_distribution):
+        import json
+        import shutil
+        import tempfile
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        self.addCleanup(_command_type.ARGUMENT_CACHE.flush)
+        self.addCleanup(_command_type._ARGUMENT_CACHE_PREFIX.clear)
+        _command_type._ARGUMENT_CACHE_PREFIX.clear()
+        loader = mock.MagicMock()
+        loader.cli_ctx.config.config_dir = config_dir
+        loader.get_op_handler.return_value = operations.job_schedule_operations.JobScheduleOperations.add
+        get_distribution.return_value.version = '3.3.3'
+
+        def _describe(args):
+            return [(name, sorted((k, getattr(v, '__name__', v)) for k, v in arg.type.settings.items()
+                                  if k != 'completer')) for name, arg in args]
+
+        expected = _describe(self.command_conflicts._load_transformed_arguments(loader.get_op_handler.return_value))
+        for _ in range(2):
+            command = _command_type.AzureBatchDataPlaneCommand(
+                'azure.batch.operations.job_schedule_operations#JobScheduleOperations.add', loader, flatten=4)
+            self.assertEqual(_describe(command.argument_loader()), expected)
+        # the operation is only inspected once, the arguments are then loaded from the cache
+        self.assertEqual(loader.get_op_handler.call_count, 1)
+        self.assertEqual(len(_command_type.ARGUMENT_CACHE.data), 1)
+        json.dumps(_command_type.ARGUMENT_CACHE.data)
+
+        # the options model of a cached operation is loaded when the command runs
+        kwargs = dict((a, None) for a in command._options_attrs)
+        command._build_options(kwargs)
+        self.assertIsInstance(kwargs['job_schedule_add_options'], models.JobScheduleAddOptions)
+
+        # the required parameter validation works with the cached argument tree
+        namespace = TestObj()
+        for name, _ in command.parser:
+            setattr(namespace, name, None)
+        namespace.json_file = None
+        validator = [a for n, a in command.parser.compile_args() if n == 'id'][0].type.settings['validator']
+        with self.assertRaises(ValueError):
+            validator(namespace)
+        namespace.id = 'schedule'
+        validator(namespace)
+        self.assertTrue(command.parser.done)
+
+        # the arguments are loaded again once the module is upgraded, the outdated schema is dropped
+        get_distribution.return_value.version = '3.3.4'
+        _command_type._ARGUMENT_CACHE_PREFIX.clear()
+        _command_type.AzureBatchDataPlaneCommand(
+            'azure.batch.operations.job_schedule_operations#JobScheduleOperations.add', loader,
+            flatten=4).argument_loader()
+        self.assertEqual(loader.get_op_handler.call_count, 2)
+        self.assertEqual([k.split('/')[1] for k in _command_type.ARGUMENT_CACHE.data], ['3.3.4'])
+
+
+class TestBatchTaskCreate(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.test_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def test_batch_json_file_reader(self):
+        from azure.cli.command_modules.batch.custom import _JsonFileReader
+
+        tasks = [{'id': 'task{}'.format(i), 'commandLine': 'echo {}'.format(i), 'priority': i * 1000}
+                 for i in range(50)]
+        import json
+        array_file = self._write('tasks.json', json.dumps(tasks, indent=2))
+        lines_file = self._write('tasks.jsonl', '\n'.join(json.dumps(t) for t in tasks))
+        for path, is_array in [(array_file, True), (lines_file, False)]:
+            reader = _JsonFileReader(path, chunk_size=7)
+            self.assertEqual(list(reader), tasks)
+            self.assertEqual(reader.is_array, is_array)
+
+        self.assertEqual(list(_JsonFileReader(self._write('empty.json', ' [ ] '))), [])
+        with self.assertRaises(ValueError):
+            list(_JsonFileReader(self._write('invalid.json', '[{"id": "task1"} {"id": "task2"}]'), chunk_size=7))
+        with self.assertRaises(ValueError):
+            list(_JsonFileReader(self._write('truncated.json', '[{"id": "task1"}, {"id": '), chunk_size=7))
+
+    @mock.patch('time.sleep', autospec=True)
+    def test_batch_create_tasks_from_file(self, _):
+        import json
+        import threading
+        from azure.cli.command_modules.batch.custom import create_task
+
+        tasks = [json.dumps({'id': 'task{}'.format(i), 'commandLine': 'echo'}) for i in range(250)]
+        path = self._write('tasks.jsonl', '\n'.join(tasks))
+        lock = threading.Lock()
+        requests = []
+        busy = {'task1', 'task120'}
+
+        def _add_collection(job_id, value):
+            with lock:
+                requests.append([t.id for t in value])
+            if len(value) > 60:
+                error = mock.MagicMock()
+                error.error.code = 'RequestBodyTooLarge'
+                raise models.BatchErrorException(mock.MagicMock(return_value=error.error), mock.MagicMock())
+            results = []
+            for task in value:
+                if task.id in busy:
+                    busy.discard(task.id)
+                    status = models.TaskAddStatus.server_error
+                elif task.id == 'task7':
+                    status = models.TaskAddStatus.client_error
+                else:
+                    status = models.TaskAddStatus.success
+                results.append(models.TaskAddResult(status, task.id))
+            return models.TaskAddCollectionResult(value=results)
+
+        client = mock.MagicMock()
+        client.add_collection.side_effect = _add_collection
+        cmd = mock.MagicMock()
+        result = create_task(cmd, client, 'job1', json_file=path, max_parallel=4)
+
+        self.assertEqual([r.task_id for r in result], ['task{}'.format(i) for i in range(250)])
+        self.assertEqual([r.task_id for r in result if r.status != models.TaskAddStatus.success], ['task7'])
+        # chunks of 100 tasks were split in halves, the tasks failing with a server error were retried alone
+        self.assertEqual(sorted(len(r) for r in requests), [1, 1, 50, 50, 50, 50, 50, 100, 100])
+        client.add.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            create_task(cmd, client, 'job1', json_file=path, max_parallel=0)
+        with self.assertRaises(ValueError):
+            create_task(cmd, client, 'job1', json_file=self._write('invalid.json', '[{"id": "task1"}, 1'))
@@ -17,13 +17,14 @@ def keyvault_client_vaults_factory(cli_ctx, _):
 def keyvault_data_plane_factory(cli_ctx, _):
     from azure.keyvault import KeyVaultAuthentication, KeyVaultClient
     from azure.cli.core.profiles import ResourceType, get_api_version
+    from azure.cli.core._profile import get_token_provider
     version = str(get_api_version(cli_ctx, ResourceType.DATA_KEYVAULT))
+    token_provider = get_token_provider(cli_ctx)
 
     def get_token(server, resource, scope):  # pylint: disable=unused-argument
         import adal
-        from azure.cli.core._profile import Profile
         try:
-            return Profile(cli_ctx=cli_ctx).get_raw_token(resource)[0]
+            return token_provider.get_raw_token(resource)[0]
         except adal.AdalError as err:
             from knack.util import CLIError
             # pylint: disable=no-member
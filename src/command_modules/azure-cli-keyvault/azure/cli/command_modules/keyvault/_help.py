@@ -54,6 +54,29 @@ helps['keyvault secret'] = """
     short-summary: Manage secrets.
 """
 
+helps['keyvault secret export'] = """
+    type: command
+    short-summary: Export the current value of the secrets in a vault to a bundle file.
+    long-summary: >
+        The secrets are fetched concurrently. Disabled secrets and the secrets managed by certificates are skipped.
+        Without --password the secret values are written in plain text to a file only readable by the current user.
+    examples:
+        - name: Export the secrets whose name starts with 'app-' to an encrypted bundle.
+          text: az keyvault secret export --vault-name vaultname --pattern 'app-*' -f secrets.json --password "$BUNDLE_PASSWORD"
+"""
+
+helps['keyvault secret import'] = """
+    type: command
+    short-summary: Import the secrets of a bundle file created by `az keyvault secret export`.
+    long-summary: The secrets are set concurrently with their content type, tags and attributes. Secrets that already exist in the vault are skipped unless --overwrite is used.
+    examples:
+        - name: Copy the secrets of one vault to another.
+          text: |
+            az keyvault secret export --vault-name source-vault -f secrets.json --password "$BUNDLE_PASSWORD"
+
+            az keyvault secret import --vault-name target-vault -f secrets.json --password "$BUNDLE_PASSWORD"
+"""
+
 helps['keyvault certificate'] = """
     type: group
     short-summary: Manage certificates.
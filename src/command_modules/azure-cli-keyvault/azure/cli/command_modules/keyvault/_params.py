@@ -167,6 +167,19 @@ def load_arguments(self, _):
     with self.argument_context('keyvault secret download') as c:
         c.argument('file_path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(), help='File to receive the secret contents.')
         c.argument('encoding', arg_type=get_enum_type(secret_encoding_values), options_list=['--encoding', '-e'], help="Encoding of the destination file. By default, will look for the 'file-encoding' tag on the secret. Otherwise will assume 'utf-8'.", default=None)
+
+    for scope in ['keyvault secret export', 'keyvault secret import']:
+        with self.argument_context(scope) as c:
+            c.argument('pattern', help="Only include the secrets whose name matches this case-insensitive wildcard pattern, e.g. 'app-*'.")
+            c.argument('password', help='Password used to encrypt or decrypt the bundle file. The bundle is written in plain text when omitted.')
+            c.argument('max_parallel', type=int, help='The maximum number of secrets transferred concurrently.')
+
+    with self.argument_context('keyvault secret export') as c:
+        c.argument('file_path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(), help='File to receive the secret bundle.')
+
+    with self.argument_context('keyvault secret import') as c:
+        c.argument('file_path', options_list=['--file', '-f'], type=file_type, completer=FilesCompleter(), help='Secret bundle created by `az keyvault secret export`.')
+        c.argument('overwrite', arg_type=get_three_state_flag(), help='Set a new version of the secrets that already exist in the vault instead of skipping them.')
     # endregion
 
     # region KeyVault Storage Account
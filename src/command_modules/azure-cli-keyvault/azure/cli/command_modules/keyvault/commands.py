@@ -94,6 +94,8 @@ def load_command_table(self, _):
         g.keyvault_custom('download', 'download_secret')
         g.keyvault_custom('backup', 'backup_secret', doc_string_source=data_doc_string.format('backup_secret'))
         g.keyvault_custom('restore', 'restore_secret', doc_string_source=data_doc_string.format('restore_secret'))
+        g.keyvault_custom('export', 'export_secrets')
+        g.keyvault_custom('import', 'import_secrets')
 
     with self.command_group('keyvault certificate', kv_data_sdk) as g:
         g.keyvault_custom('create',
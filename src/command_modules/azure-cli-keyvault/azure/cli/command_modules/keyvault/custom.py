@@ -724,6 +724,216 @@ def restore_secret(client, vault_base_url, file_path):
     with open(file_path, 'rb') as file_in:
         data = file_in.read()
     return client.restore_secret(vault_base_url, data)
+
+
+_SECRET_BUNDLE_VERSION = 1
+_SECRET_BUNDLE_KDF_ITERATIONS = 200000
+_SECRET_THROTTLE_RETRIES = 5
+
+
+def export_secrets(cmd, client, vault_base_url, file_path, pattern=None, password=None, max_parallel=8):
+    """ Export the current value of the secrets in a vault to a bundle file. """
+    from azure.keyvault.key_vault_id import KeyVaultIdentifier
+    if os.path.isfile(file_path) or os.path.isdir(file_path):
+        raise CLIError("File or directory named '{}' already exists.".format(file_path))
+    _validate_max_parallel(max_parallel)
+
+    names = []
+    for item in client.get_secrets(vault_base_url):
+        name = KeyVaultIdentifier(uri=item.id, collection='secrets').name
+        if not _secret_name_matches(name, pattern):
+            continue
+        if item.managed:
+            logger.warning("Skipping secret '%s': it is managed by a certificate.", name)
+        elif item.attributes and item.attributes.enabled is False:
+            logger.warning("Skipping secret '%s': it is disabled.", name)
+        else:
+            names.append(name)
+
+    def _export(name):
+        secret = client.get_secret(vault_base_url, name, '')
+        attributes = secret.attributes
+        return {
+            'name': name,
+            'value': secret.value,
+            'contentType': secret.content_type,
+            'tags': secret.tags,
+            'attributes': {
+                'enabled': attributes.enabled if attributes else None,
+                'notBefore': _to_unix_time(attributes.not_before) if attributes else None,
+                'expires': _to_unix_time(attributes.expires) if attributes else None
+            }
+        }
+
+    secrets, errors = _transfer_secrets(cmd, [(name, name) for name in names], _export, max_parallel, 'Exported')
+    bundle = {
+        'version': _SECRET_BUNDLE_VERSION,
+        'vault': vault_base_url,
+        'secrets': sorted(secrets, key=lambda s: s['name'])
+    }
+    _write_secret_bundle(file_path, bundle, password)
+    _raise_transfer_errors(errors, len(names), 'export', "'{}' contains the other secrets.".format(file_path))
+
+
+def import_secrets(cmd, client, vault_base_url, file_path, pattern=None, password=None, overwrite=False,
+                   max_parallel=8):
+    """ Import the secrets of a bundle file created by `az keyvault secret export` into a vault. """
+    import datetime
+    from azure.keyvault.key_vault_id import KeyVaultIdentifier
+    SecretAttributes = cmd.get_models('SecretAttributes', resource_type=ResourceType.DATA_KEYVAULT)
+    _validate_max_parallel(max_parallel)
+
+    bundle = _read_secret_bundle(file_path, password)
+    secrets = [s for s in bundle['secrets'] if _secret_name_matches(s['name'], pattern)]
+    if not overwrite:
+        existing = set(KeyVaultIdentifier(uri=item.id, collection='secrets').name.lower()
+                       for item in client.get_secrets(vault_base_url))
+        for secret in [s for s in secrets if s['name'].lower() in existing]:
+            logger.warning("Skipping secret '%s': it already exists. Use --overwrite to set a new version.",
+                           secret['name'])
+        secrets = [s for s in secrets if s['name'].lower() not in existing]
+
+    def _from_unix_time(value):
+        return datetime.datetime.utcfromtimestamp(value) if value is not None else None
+
+    def _import(secret):
+        attributes = secret.get('attributes') or {}
+        secret_attributes = SecretAttributes(enabled=attributes.get('enabled'),
+                                             not_before=_from_unix_time(attributes.get('notBefore')),
+                                             expires=_from_unix_time(attributes.get('expires')))
+        client.set_secret(vault_base_url, secret['name'], secret['value'], tags=secret.get('tags'),
+                          content_type=secret.get('contentType'), secret_attributes=secret_attributes)
+        return secret['name']
+
+    _, errors = _transfer_secrets(cmd, [(s['name'], s) for s in secrets], _import, max_parallel, 'Imported')
+    _raise_transfer_errors(errors, len(secrets), 'import', 'The other secrets were imported.')
+
+
+def _validate_max_parallel(max_parallel):
+    if max_parallel < 1:
+        raise CLIError('usage error: --max-parallel must be a positive integer')
+
+
+def _secret_name_matches(name, pattern):
+    import fnmatch
+    return not pattern or fnmatch.fnmatch(name.lower(), pattern.lower())
+
+
+def _to_unix_time(value):
+    import calendar
+    return calendar.timegm(value.utctimetuple()) if value else None
+
+
+def _transfer_secrets(cmd, items, operation, max_parallel, verb):
+    """ Run the operation on the (name, item) pairs concurrently and retry the requests the vault throttles.
+
+    Returns the results of the operations that succeeded and the (name, error) pairs of those that failed.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    import threading
+    KeyVaultErrorException = cmd.get_models('KeyVaultErrorException', resource_type=ResourceType.DATA_KEYVAULT)
+
+    throttled = [0]
+    lock = threading.Lock()
+
+    def _run(item):
+        for attempt in range(_SECRET_THROTTLE_RETRIES + 1):
+            try:
+                return operation(item)
+            except KeyVaultErrorException as ex:
+                response = ex.response
+                if response is None or response.status_code != 429 or attempt == _SECRET_THROTTLE_RETRIES:
+                    raise
+                try:
+                    delay = int(response.headers.get('Retry-After'))
+                except (TypeError, ValueError):
+                    delay = 2 ** attempt
+                with lock:
+                    throttled[0] += 1
+                logger.info('Request throttled by the vault, retrying in %d seconds.', delay)
+                time.sleep(delay)
+
+    results, errors = [], []
+    if not items:
+        return results, errors
+    hook = cmd.cli_ctx.get_progress_controller(det=True)
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(items))) as executor:
+        futures = dict((executor.submit(_run, item), name) for name, item in items)
+        for count, future in enumerate(as_completed(futures), 1):
+            try:
+                results.append(future.result())
+            except Exception as ex:  # pylint: disable=broad-except
+                errors.append((futures[future], ex))
+            hook.add(message='{} {}/{} secrets, throttled {} times'.format(verb, count, len(items), throttled[0]),
+                     value=count, total_val=len(items))
+    hook.end()
+    if throttled[0]:
+        logger.warning('The vault throttled %d requests. Use a lower --max-parallel to reduce throttling.',
+                       throttled[0])
+    return results, errors
+
+
+def _raise_transfer_errors(errors, total, operation, remark):
+    if errors:
+        details = '\n'.join("  {}: {}".format(name, ex) for name, ex in sorted(errors, key=lambda e: e[0]))
+        raise CLIError('Failed to {} {} of {} secrets. {}\n{}'.format(operation, len(errors), total, remark, details))
+
+
+def _get_secret_bundle_cipher(password, salt, iterations):
+    import base64
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=iterations,
+                     backend=default_backend())
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(password.encode('utf-8'))))
+
+
+def _write_secret_bundle(file_path, bundle, password=None):
+    import base64
+    from azure.cli.core.util import write_file_atomically
+    content = json.dumps(bundle, indent=2)
+    if password:
+        salt = os.urandom(16)
+        cipher = _get_secret_bundle_cipher(password, salt, _SECRET_BUNDLE_KDF_ITERATIONS)
+        content = json.dumps({
+            'version': _SECRET_BUNDLE_VERSION,
+            'encryption': {
+                'algorithm': 'fernet',
+                'kdf': 'pbkdf2-sha256',
+                'iterations': _SECRET_BUNDLE_KDF_ITERATIONS,
+                'salt': base64.b64encode(salt).decode('ascii')
+            },
+            'data': cipher.encrypt(content.encode('utf-8')).decode('ascii')
+        }, indent=2)
+    else:
+        logger.warning("The secret values are written to '%s' in plain text. Use --password to encrypt them.",
+                       file_path)
+    write_file_atomically(file_path, content)
+
+
+def _read_secret_bundle(file_path, password=None):
+    import base64
+    from cryptography.fernet import InvalidToken
+    try:
+        with codecs.open(file_path, 'r', encoding='utf-8') as f:
+            bundle = json.load(f)
+    except (IOError, OSError, ValueError) as ex:
+        raise CLIError("Failed to read secret bundle '{}': {}".format(file_path, ex))
+
+    encryption = bundle.get('encryption')
+    if encryption:
+        if not password:
+            raise CLIError("Secret bundle '{}' is encrypted, use --password to decrypt it.".format(file_path))
+        cipher = _get_secret_bundle_cipher(password, base64.b64decode(encryption['salt']), encryption['iterations'])
+        try:
+            bundle = json.loads(cipher.decrypt(bundle['data'].encode('ascii')).decode('utf-8'))
+        except InvalidToken:
+            raise CLIError("Failed to decrypt secret bundle '{}': incorrect password or corrupted file.".format(
+                file_path))
+    if bundle.get('version') != _SECRET_BUNDLE_VERSION or 'secrets' not in bundle:
+        raise CLIError("'{}' is not a supported secret bundle.".format(file_path))
+    return bundle
 # endregion
 
 
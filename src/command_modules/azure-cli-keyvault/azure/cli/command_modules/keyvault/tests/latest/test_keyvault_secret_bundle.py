@@ -0,0 +1,115 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import mock
+import requests
+from knack.util import CLIError
+
+from azure.keyvault.v7_0 import models
+from azure.cli.command_modules.keyvault.custom import export_secrets, import_secrets
+
+VAULT = 'https://myvault.vault.azure.net'
+
+
+def _mock_cmd():
+    cmd = mock.MagicMock()
+    cmd.get_models.side_effect = lambda name, **_: getattr(models, name)
+    return cmd
+
+
+def _secret_item(name, enabled=True, managed=None):
+    item = models.SecretItem(id='{}/secrets/{}'.format(VAULT, name),
+                             attributes=models.SecretAttributes(enabled=enabled))
+    item.managed = managed  # read-only, only set by the service
+    return item
+
+
+class TestKeyVaultSecretBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, 'secrets.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _export(self, password=None, pattern=None):
+        client = mock.MagicMock()
+        client.get_secrets.return_value = [_secret_item('app-one'), _secret_item('app-two'), _secret_item('other'),
+                                           _secret_item('app-disabled', enabled=False),
+                                           _secret_item('app-cert', managed=True)]
+        expires = datetime(2030, 1, 1)
+
+        def _get_secret(vault_base_url, name, version):
+            self.assertEqual((vault_base_url, version), (VAULT, ''))
+            return models.SecretBundle(value='value of ' + name, content_type='text/plain', tags={'name': name},
+                                       attributes=models.SecretAttributes(enabled=True, expires=expires))
+        client.get_secret.side_effect = _get_secret
+
+        export_secrets(_mock_cmd(), client, VAULT, self.file_path, pattern=pattern, password=password, max_parallel=2)
+        return client
+
+    def test_export_import_secrets_plain_text(self):
+        client = self._export(pattern='APP-*')
+        self.assertEqual(sorted(c[0][1] for c in client.get_secret.call_args_list), ['app-one', 'app-two'])
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o600)
+        with open(self.file_path) as f:
+            bundle = json.load(f)
+        self.assertEqual([s['name'] for s in bundle['secrets']], ['app-one', 'app-two'])
+        self.assertEqual(bundle['secrets'][0]['value'], 'value of app-one')
+        self.assertEqual(bundle['secrets'][0]['attributes'], {'enabled': True, 'notBefore': None,
+                                                              'expires': 1893456000})
+
+        target = mock.MagicMock()
+        target.get_secrets.return_value = [_secret_item('app-two')]
+        import_secrets(_mock_cmd(), target, VAULT, self.file_path)
+        target.set_secret.assert_called_once()
+        args, kwargs = target.set_secret.call_args
+        self.assertEqual(args, (VAULT, 'app-one', 'value of app-one'))
+        self.assertEqual((kwargs['tags'], kwargs['content_type']), ({'name': 'app-one'}, 'text/plain'))
+        self.assertEqual(kwargs['secret_attributes'].expires, datetime(2030, 1, 1))
+
+        target.reset_mock()
+        import_secrets(_mock_cmd(), target, VAULT, self.file_path, overwrite=True)
+        self.assertEqual(target.set_secret.call_count, 2)
+
+    def test_export_import_secrets_encrypted(self):
+        self._export(password='p@ssw0rd')
+        with open(self.file_path) as f:
+            content = f.read()
+        self.assertNotIn('value of', content)
+        self.assertIn('encryption', json.loads(content))
+
+        target = mock.MagicMock()
+        for password in [None, 'wrong']:
+            with self.assertRaises(CLIError):
+                import_secrets(_mock_cmd(), target, VAULT, self.file_path, password=password, overwrite=True)
+        import_secrets(_mock_cmd(), target, VAULT, self.file_path, password='p@ssw0rd', overwrite=True)
+        self.assertEqual(sorted(c[0][1] for c in target.set_secret.call_args_list), ['app-one', 'app-two', 'other'])
+
+    def test_import_secrets_retries_throttled_requests(self):
+        self._export()
+        throttled = requests.Response()
+        throttled.status_code, throttled.headers['Retry-After'], throttled._content = 429, '0', b'{}'
+        error = models.KeyVaultErrorException(mock.MagicMock(return_value=None), throttled)
+        target = mock.MagicMock()
+        target.set_secret.side_effect = [error, None, None, None]
+        import_secrets(_mock_cmd(), target, VAULT, self.file_path, overwrite=True, max_parallel=1)
+        self.assertEqual(target.set_secret.call_count, 4)
+
+        target.set_secret.side_effect = ValueError('failed')
+        with self.assertRaisesRegexp(CLIError, 'Failed to import 3 of 3 secrets'):
+            import_secrets(_mock_cmd(), target, VAULT, self.file_path, overwrite=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
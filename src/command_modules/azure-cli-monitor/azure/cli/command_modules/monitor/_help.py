@@ -130,7 +130,11 @@ helps['monitor metrics'] = """
 
 helps['monitor metrics list'] = """
     type: command
-    short-summary: List the metric values for a resource.
+    short-summary: List the metric values for a resource, or for several resources at once.
+    long-summary: >
+        When --resources is given, or --resource-type without --resource, the resources are queried concurrently and
+        their metric values are merged into columns sharing one timestamp axis. Each row holds a timestamp followed by
+        the value of each column. Use `--query rows -o tsv` to export the values.
     parameters:
         - name: --aggregation
           type: string
@@ -187,6 +191,14 @@ helps['monitor metrics list'] = """
               az monitor metrics list --resource {ResourceName} --metric Transactions \\
                                       --filter "ApiName eq '*'" \\
                                       --start-time 2017-01-01T00:00:00Z
+        - name: List the average CPU usage of all the VMs in a resource group
+          text: >
+              az monitor metrics list --resource-type Microsoft.Compute/virtualMachines -g {ResourceGroup} \\
+                                      --metric "Percentage CPU" --aggregation Average
+        - name: Export the CPU usage of several VMs as tab-separated values
+          text: >
+              az monitor metrics list --resources $(az vm list --query "[].id" -o tsv) --metric "Percentage CPU" \\
+                                      --query rows -o tsv
 """
 
 helps['monitor metrics list-definitions'] = """
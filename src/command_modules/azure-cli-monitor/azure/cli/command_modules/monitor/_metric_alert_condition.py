@@ -0,0 +1,235 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Parser for the `--condition` argument of `az monitor metrics alert create/update`.
+
+It implements grammar/MetricAlertCondition.g4 without the ANTLR runtime: the lexer follows the ANTLR rules (longest
+match, ties go to the rule defined first, keywords are case insensitive) and the parser is a recursive descent over
+the parser rules. Errors are reported in the format of the ANTLR console error listener.
+"""
+
+import re
+
+from knack.util import CLIError
+
+# token types, named after the lexer rules of the grammar
+DOT = "'.'"
+COMMA = "','"
+WHERE = 'WHERE'
+AND = 'AND'
+INCLUDES = 'INCLUDES'
+EXCLUDES = 'EXCLUDES'
+OR = 'OR'
+OPERATOR = 'OPERATOR'
+NUMBER = 'NUMBER'
+QUOTE = 'QUOTE'
+WHITESPACE = 'WHITESPACE'
+NEWLINE = 'NEWLINE'
+WORD = 'WORD'
+EOF = 'EOF'
+
+_KEYWORDS = {'where': WHERE, 'and': AND, 'includes': INCLUDES, 'excludes': EXCLUDES, 'or': OR}
+
+_NUMBER_RE = re.compile(r'[0-9]+(?:[.,][0-9]+)?')
+_WORD_RE = re.compile(r'[a-zA-Z0-9_]+')
+_WHITESPACE_RE = re.compile(r'[ \t]+')
+_NEWLINE_RE = re.compile(r'(?:\r?\n|\r)+')
+_OPERATOR_RE = re.compile(r'<=|>=|!=|<|=|>')
+
+_SINGLE_CHAR_TOKENS = {'.': DOT, ',': COMMA, "'": QUOTE, '"': QUOTE}
+
+_OPERATORS = {
+    '=': 'Equals',
+    '!=': 'NotEquals',
+    '>': 'GreaterThan',
+    '>=': 'GreaterThanOrEqual',
+    '<': 'LessThan',
+    '<=': 'LessThanOrEqual'
+}
+
+_AGGREGATIONS = {
+    'avg': 'Average',
+    'min': 'Minimum',
+    'max': 'Maximum',
+    'total': 'Total'
+}
+
+
+class _Token(object):  # pylint: disable=too-few-public-methods
+    __slots__ = ('type', 'text', 'line', 'column')
+
+    def __init__(self, token_type, text, line, column):
+        self.type = token_type
+        self.text = text
+        self.line = line
+        self.column = column
+
+
+def _error(token, message):
+    return CLIError('Invalid condition: line {}:{} {}'.format(token.line, token.column, message))
+
+
+def tokenize(text):
+    """ Split the condition into tokens, ending with an EOF token. """
+    tokens = []
+    line, line_start = 1, 0
+    pos, length = 0, len(text)
+    while pos < length:
+        char = text[pos]
+        column = pos - line_start
+        if char in _SINGLE_CHAR_TOKENS:
+            token_type, end = _SINGLE_CHAR_TOKENS[char], pos + 1
+        elif char in ' \t':
+            token_type, end = WHITESPACE, _WHITESPACE_RE.match(text, pos).end()
+        elif char in '\r\n':
+            token_type, end = NEWLINE, _NEWLINE_RE.match(text, pos).end()
+        elif char in '<>=!':
+            match = _OPERATOR_RE.match(text, pos)
+            if not match:
+                raise _error(_Token(None, char, line, column), "token recognition error at: '{}'".format(char))
+            token_type, end = OPERATOR, match.end()
+        else:
+            word = _WORD_RE.match(text, pos)
+            if not word:
+                raise _error(_Token(None, char, line, column), "token recognition error at: '{}'".format(char))
+            number = _NUMBER_RE.match(text, pos)
+            # the longest match wins, NUMBER is defined before WORD and the keywords before both
+            if number and number.end() >= word.end():
+                token_type, end = NUMBER, number.end()
+            else:
+                end = word.end()
+                token_type = _KEYWORDS.get(text[pos:end].lower(), WORD)
+
+        tokens.append(_Token(token_type, text[pos:end], line, column))
+        if token_type == NEWLINE:
+            line += text.count('\n', pos, end) or text.count('\r', pos, end)
+            line_start = end
+        pos = end
+    tokens.append(_Token(EOF, '<EOF>', line, pos - line_start))
+    return tokens
+
+
+class _Parser(object):
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self, offset=0):
+        index = min(self.index + offset, len(self.tokens) - 1)
+        return self.tokens[index].type
+
+    def next(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def expect(self, *token_types):
+        token = self.tokens[self.index]
+        if token.type not in token_types:
+            expecting = token_types[0] if len(token_types) == 1 else '{{{}}}'.format(', '.join(token_types))
+            raise _error(token, "mismatched input '{}' expecting {}".format(token.text, expecting))
+        self.index += 1
+        return token
+
+    def text_of(self, *token_types):
+        """ Consume one or more tokens of the given types and return their text. """
+        parts = [self.expect(*token_types).text]
+        while self.peek() in token_types:
+            parts.append(self.next().text)
+        return ''.join(parts)
+
+    def expression(self):
+        parameters = {}
+
+        # aggregation : WORD WHITESPACE
+        aggregation = self.expect(WORD)
+        self.expect(WHITESPACE)
+        try:
+            parameters['time_aggregation'] = _AGGREGATIONS[aggregation.text.strip()]
+        except KeyError:
+            raise _error(aggregation, "invalid aggregation '{}', expecting one of: {}".format(
+                aggregation.text, ', '.join(sorted(_AGGREGATIONS))))
+
+        # (namespace '.')*
+        namespaces = []
+        while self.peek() == WORD and self.peek(1) == DOT:
+            namespaces.append(self.next().text)
+            self.next()
+        if namespaces:
+            parameters['metric_namespace'] = '.'.join(namespaces)
+
+        # (QUOTE metric QUOTE WHITESPACE | metric)
+        if self.peek() == QUOTE:
+            self.next()
+            parameters['metric_name'] = self.text_of(WORD, WHITESPACE).strip()
+            self.expect(QUOTE)
+            self.expect(WHITESPACE)
+        else:
+            parameters['metric_name'] = self.text_of(WORD, WHITESPACE).strip()
+
+        # operator : OPERATOR WHITESPACE
+        parameters['operator'] = _OPERATORS[self.expect(OPERATOR).text]
+        self.expect(WHITESPACE)
+
+        # threshold : NUMBER
+        parameters['threshold'] = self.expect(NUMBER).text
+
+        # (WHITESPACE dimensions)*
+        parameters['dimensions'] = []
+        while self.peek() == WHITESPACE and self.peek(1) == WHERE:
+            self.next()
+            parameters['dimensions'].extend(self.dimensions())
+
+        # NEWLINE*, trailing whitespace is tolerated but nothing else
+        while self.peek() in (NEWLINE, WHITESPACE):
+            self.next()
+        token = self.tokens[self.index]
+        if token.type != EOF:
+            raise _error(token, "extraneous input '{}' expecting <EOF>".format(token.text))
+        return parameters
+
+    def dimensions(self):
+        # dimensions : where dimension (dim_separator dimension)*
+        self.expect(WHERE)
+        self.expect(WHITESPACE)
+        dimensions = [self.dimension()]
+        while self.peek() == AND or self._at_dimension_separator():
+            self.next()
+            self.expect(WHITESPACE)
+            dimensions.append(self.dimension())
+        return dimensions
+
+    def dimension(self):
+        # dimension : dim_name dim_operator dim_values
+        name = self.expect(WORD).text
+        self.expect(WHITESPACE)
+        operator = self.expect(INCLUDES, EXCLUDES).text.lower()
+        self.expect(WHITESPACE)
+
+        # dim_values : dim_value (dim_val_separator dim_value)*
+        values = self.dim_value()
+        while self.peek() == OR or (self.peek() == COMMA and not self._at_dimension_separator()):
+            self.next()
+            self.expect(WHITESPACE)
+            values.extend(self.dim_value())
+        return {'name': name, 'operator': operator, 'values': values}
+
+    def dim_value(self):
+        # dim_value : (NUMBER | WORD | WHITESPACE)+, every word or number is a separate value
+        text = self.text_of(NUMBER, WORD, WHITESPACE)
+        return text.split()
+
+    def _at_dimension_separator(self):
+        # a comma separates dimensions rather than values when it is followed by a complete dimension name and operator
+        return (self.peek() == COMMA and self.peek(1) == WHITESPACE and self.peek(2) == WORD and
+                self.peek(3) == WHITESPACE and self.peek(4) in (INCLUDES, EXCLUDES))
+
+
+def parse_metric_alert_condition(text):
+    """ Parse a metric alert condition into the keyword arguments of `MetricCriteria`. """
+    parameters = _Parser(tokenize(text)).expression()
+    parameters['name'] = ''  # will be auto-populated later
+    return parameters
@@ -93,9 +93,11 @@ def load_arguments(self, _):
 
     with self.argument_context('monitor metrics list') as c:
         from .validators import (process_metric_timespan, process_metric_aggregation, process_metric_result_type,
-                                 process_metric_dimension, validate_metric_names)
+                                 process_metric_dimension, validate_metric_names, process_metric_resources)
         from azure.mgmt.monitor.models import AggregationType
-        c.resource_parameter('resource_uri', arg_group='Target Resource')
+        c.resource_parameter('resource_uri', required=False, arg_group='Target Resource', skip_validator=True)
+        c.argument('resources', nargs='+', arg_group='Target Resource', validator=process_metric_resources)
+        c.argument('max_parallel', type=int, arg_group='Target Resource')
         c.extra('start_time', options_list=['--start-time'], validator=process_metric_timespan, arg_group='Time')
         c.extra('end_time', options_list=['--end-time'], arg_group='Time')
         c.extra('metadata', options_list=['--metadata'], action='store_true', validator=process_metric_result_type)
@@ -250,6 +252,8 @@ def load_arguments(self, _):
     # region ActivityLog
     with self.argument_context('monitor activity-log list') as c:
         c.argument('select', nargs='+')
+        c.argument('slice_hours', type=int)
+        c.argument('max_parallel', type=int)
 
     with self.argument_context('monitor activity-log list', arg_group='OData Filter') as c:
         c.argument('correlation_id')
@@ -5,8 +5,6 @@
 
 import argparse
 
-import antlr4
-
 from azure.cli.command_modules.monitor.util import (
     get_aggregation_map, get_operator_map, get_autoscale_operator_map,
     get_autoscale_aggregation_map, get_autoscale_scale_direction_map)
@@ -80,20 +78,12 @@ def period_type(value):
 class MetricAlertConditionAction(argparse._AppendAction):
 
     def __call__(self, parser, namespace, values, option_string=None):
-        from azure.cli.command_modules.monitor.grammar import (
-            MetricAlertConditionLexer, MetricAlertConditionParser, MetricAlertConditionValidator)
-
-        string_val = ' '.join(values)
-
-        lexer = MetricAlertConditionLexer(antlr4.InputStream(string_val))
-        stream = antlr4.CommonTokenStream(lexer)
-        parser = MetricAlertConditionParser(stream)
-        tree = parser.expression()
+        from azure.mgmt.monitor.models import MetricCriteria, MetricDimension
+        from azure.cli.command_modules.monitor._metric_alert_condition import parse_metric_alert_condition
 
-        validator = MetricAlertConditionValidator()
-        walker = antlr4.ParseTreeWalker()
-        walker.walk(validator, tree)
-        metric_condition = validator.result()
+        parameters = parse_metric_alert_condition(' '.join(values))
+        parameters['dimensions'] = [MetricDimension(**d) for d in parameters['dimensions']]
+        metric_condition = MetricCriteria(**parameters)
         super(MetricAlertConditionAction, self).__call__(parser, namespace, metric_condition, option_string)
 
 
@@ -87,8 +87,8 @@ def load_command_table(self, _):
         client_factory=cf_log_profiles,
         exception_handler=monitor_exception_handler)
 
-    metric_operations_sdk = CliCommandType(
-        operations_tmpl='azure.mgmt.monitor.operations.metrics_operations#MetricsOperations.{}',
+    metric_operations_custom = CliCommandType(
+        operations_tmpl='azure.cli.command_modules.monitor.operations.metrics#{}',
         client_factory=cf_metrics,
         exception_handler=monitor_exception_handler)
 
@@ -191,7 +191,7 @@ def load_command_table(self, _):
 
     with self.command_group('monitor metrics') as g:
         from .transformers import metrics_table, metrics_definitions_table
-        g.command('list', 'list', command_type=metric_operations_sdk, table_transformer=metrics_table)
+        g.custom_command('list', 'list_metrics', custom_command_type=metric_operations_custom, table_transformer=metrics_table)
         g.command('list-definitions', 'list', command_type=metric_definitions_sdk, table_transformer=metrics_definitions_table)
 
     with self.command_group('monitor metrics alert', metric_alert_sdk, custom_command_type=alert_custom, client_factory=cf_metric_alerts) as g:
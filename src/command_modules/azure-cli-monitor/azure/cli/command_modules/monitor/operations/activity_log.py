@@ -3,12 +3,24 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from azure.cli.command_modules.monitor.util import validate_time_range_and_add_defaults
+from knack.log import get_logger
 
+from azure.cli.command_modules.monitor.util import (validate_time_range_and_add_defaults, get_time_range,
+                                                    DATE_TIME_FORMAT)
 
-def list_activity_log(client, filters=None, correlation_id=None, resource_group=None, resource_id=None,
+logger = get_logger(__name__)
+
+_SLICE_CACHE_DIR = 'activityLogCache'
+
+# events can still be ingested a while after they occurred, only slices older than this many hours are cached
+_DEFAULT_SLICE_CACHE_HOURS = 12
+# the activity log is retained for 90 days, a slice cached longer ago only holds events which can't be queried anymore
+_ACTIVITY_LOG_RETENTION_DAYS = 90
+
+
+def list_activity_log(cmd, client, filters=None, correlation_id=None, resource_group=None, resource_id=None,
                       resource_provider=None, start_time=None, end_time=None, caller=None, status=None, max_events=50,
-                      select=None):
+                      select=None, slice_hours=24, max_parallel=4):
     """Provides the list of activity log.
     :param str filters: The OData filter for the list activity logs. If this argument is provided
                         OData Filter Arguments will be ignored
@@ -26,6 +38,10 @@ def list_activity_log(client, filters=None, correlation_id=None, resource_group=
     :param str status: The status value to query (ex: Failed)
     :param str max_events: The maximum number of records to be returned by the command
     :param str select: The list of event names
+    :param int slice_hours: Time ranges longer than this many hours are queried in slices of this size. Whole slices
+                            older than the `monitor.activity_log_cache_hours` configuration value (12 by default, 0
+                            to disable) are cached locally.
+    :param int max_parallel: The maximum number of slices queried concurrently.
     """
     if filters:
         odata_filters = filters
@@ -43,10 +59,179 @@ def list_activity_log(client, filters=None, correlation_id=None, resource_group=
         max_events = int(max_events)
 
     select_filters = _activity_log_select_filter_builder(select)
+
+    if not filters:
+        time_slices = _get_time_slices(start_time, end_time, slice_hours)
+        if len(time_slices) > 1:
+            from knack.util import CLIError
+            if max_parallel < 1:
+                raise CLIError('usage error: --max-parallel must be a positive integer')
+
+            def _build_slice_filter(lower, upper):
+                return _build_activity_log_odata_filter(correlation_id, resource_group, resource_id,
+                                                        resource_provider, lower.strftime(DATE_TIME_FORMAT),
+                                                        upper.strftime(DATE_TIME_FORMAT), caller, status)
+
+            return _list_activity_log_slices(cmd.cli_ctx, client, time_slices, _build_slice_filter, select_filters,
+                                             max_events, max_parallel)
+
     activity_log = client.list(filter=odata_filters, select=select_filters)
     return _limit_results(activity_log, max_events)
 
 
+def _get_time_slices(start_time, end_time, slice_hours):
+    """ Split the time range into (start, end) slices, newest first. Slice boundaries are aligned to multiples of the
+    slice size so that the older slices of repeated queries are identical. """
+    from datetime import datetime, timedelta
+    from knack.util import CLIError
+    if slice_hours is None or slice_hours < 1:
+        raise CLIError('usage error: --slice-hours must be a positive integer')
+
+    start_time, end_time = get_time_range(start_time, end_time)
+    end_time = end_time.replace(microsecond=0)
+    slice_seconds = slice_hours * 3600
+    epoch = datetime(1970, 1, 1)
+    boundary = epoch + timedelta(seconds=(int((start_time - epoch).total_seconds()) // slice_seconds + 1) *
+                                 slice_seconds)
+    time_slices = []
+    while boundary < end_time:
+        time_slices.append((start_time, boundary))
+        start_time = boundary
+        boundary += timedelta(seconds=slice_seconds)
+    time_slices.append((start_time, end_time))
+    return list(reversed(time_slices))
+
+
+def _list_activity_log_slices(cli_ctx, client, time_slices, build_filter, select, max_events, max_parallel):
+    """ Query the time slices concurrently and merge their events newest first, stopping once enough events have
+    been collected. """
+    from collections import deque
+    from datetime import datetime, timedelta
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache_hours = cli_ctx.config.getint('monitor', 'activity_log_cache_hours', fallback=_DEFAULT_SLICE_CACHE_HOURS)
+    cache_before = datetime.utcnow() - timedelta(hours=cache_hours) if cache_hours > 0 else None
+    cached_slices = []
+
+    def _list_slice(index):
+        lower, upper = time_slices[index]
+        # the filter includes both ends, an event on a boundary is returned by the newer slice only
+        exclusive_upper = upper if index else None
+        odata_filter = build_filter(lower, upper)
+
+        # the newest and the oldest slice end and start at the bounds of the query, which usually differ on every
+        # run, only the slices in between are aligned to slice boundaries and found again by repeated queries
+        cache_path = None
+        if cache_before is not None and 0 < index < len(time_slices) - 1 and upper <= cache_before:
+            cache_path = _get_slice_cache_path(cli_ctx, client, odata_filter, select, exclusive_upper is not None)
+            events = _read_cached_slice(cache_path)
+            if events is not None:
+                logger.info('Using cached activity log events from %s to %s', lower, upper)
+                return events
+
+        events, complete = _fetch_slice(client, odata_filter, select, max_events, exclusive_upper)
+        if cache_path and complete:
+            _write_cached_slice(cache_path, events)
+            cached_slices.append(cache_path)
+        return events
+
+    results = []
+    pending = iter(range(len(time_slices)))
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(time_slices))) as executor:
+        in_flight = deque(executor.submit(_list_slice, index) for index in _take(pending, max_parallel))
+        try:
+            while in_flight:
+                results.extend(in_flight.popleft().result())
+                if max_events and len(results) >= max_events:
+                    break
+                in_flight.extend(executor.submit(_list_slice, index) for index in _take(pending, 1))
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    if cached_slices:
+        _prune_slice_cache(cli_ctx)
+    return results[:max_events] if max_events else results
+
+
+def _take(iterator, count):
+    import itertools
+    return list(itertools.islice(iterator, count))
+
+
+def _fetch_slice(client, odata_filter, select, limit, exclusive_upper):
+    """ Returns the events of a slice converted to dictionaries and whether the slice was read completely. """
+    from knack.util import todict
+    events = []
+    for event in client.list(filter=odata_filter, select=select):
+        if exclusive_upper is not None:
+            timestamp = _get_event_time(event)
+            if timestamp is not None and timestamp >= exclusive_upper:
+                continue
+        if limit and len(events) >= limit:
+            return events, False
+        events.append(todict(event))
+    return events, True
+
+
+def _get_event_time(event):
+    timestamp = getattr(event, 'event_timestamp', None)
+    if timestamp is not None and timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None) - timestamp.utcoffset()
+    return timestamp
+
+
+def _get_slice_cache_path(cli_ctx, client, odata_filter, select, exclusive_upper):
+    import hashlib
+    import json
+    import os
+    key = json.dumps([cli_ctx.cloud.name, client.config.subscription_id, odata_filter, select, exclusive_upper])
+    return os.path.join(cli_ctx.config.config_dir, _SLICE_CACHE_DIR,
+                        hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_cached_slice(cache_path):
+    import json
+    from codecs import open as codecs_open
+    try:
+        with codecs_open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, IOError, ValueError):
+        return None
+
+
+def _write_cached_slice(cache_path, events):
+    import json
+    import os
+    from azure.cli.core.util import write_file_atomically
+    try:
+        if not os.path.isdir(os.path.dirname(cache_path)):
+            os.makedirs(os.path.dirname(cache_path))
+        write_file_atomically(cache_path, json.dumps(events))
+    except (OSError, IOError) as ex:
+        logger.debug('Failed to cache activity log events in %s: %s', cache_path, ex)
+
+
+def _prune_slice_cache(cli_ctx):
+    """ Delete the slices cached longer ago than the activity log is retained. A slice ended before it was cached,
+    so its events can no longer be queried. """
+    import os
+    import time
+    cache_dir = os.path.join(cli_ctx.config.config_dir, _SLICE_CACHE_DIR)
+    expired = time.time() - _ACTIVITY_LOG_RETENTION_DAYS * 24 * 3600
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) < expired:
+                os.remove(path)
+        except OSError as ex:
+            logger.debug('Failed to delete cached activity log events %s: %s', path, ex)
+
+
 def _build_activity_log_odata_filter(correlation_id=None, resource_group=None, resource_id=None, resource_provider=None,
                                      start_time=None, end_time=None, caller=None, status=None):
     """Builds odata filter string.
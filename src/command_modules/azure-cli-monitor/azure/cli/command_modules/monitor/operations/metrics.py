@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+_AGGREGATION_FIELDS = ['average', 'minimum', 'maximum', 'total', 'count']
+
+
+def list_metrics(client, resource_uri=None, resources=None, timespan=None, interval=None, metricnames=None,
+                 aggregation=None, top=None, orderby=None, filter=None,  # pylint: disable=redefined-builtin
+                 result_type=None, metricnamespace=None, max_parallel=8):
+    """Lists the metric values for one or more resources.
+    :param list resources: Space-separated IDs of the resources to query. The metric values of all the resources are
+                           merged into one timestamp axis with a column per resource, metric and aggregation.
+    :param int top: The maximum number of records to retrieve. Valid only if --filter is specified. Defaults to 10.
+    :param str orderby: The aggregation to use for sorting results and the direction of the sort. Only one order can
+                        be specified. Example: sum asc.
+    :param int max_parallel: The maximum number of resources queried concurrently.
+    """
+    kwargs = {'timespan': timespan, 'interval': interval, 'metricnames': metricnames, 'aggregation': aggregation,
+              'top': top, 'orderby': orderby, 'filter': filter, 'result_type': result_type,
+              'metricnamespace': metricnamespace}
+    if resource_uri:
+        return client.list(resource_uri, **kwargs)
+
+    from knack.util import CLIError
+    if max_parallel < 1:
+        raise CLIError('usage error: --max-parallel must be a positive integer')
+    return _list_metrics_for_resources(client, resources, max_parallel, **kwargs)
+
+
+def _list_metrics_for_resources(client, resources, max_parallel, **kwargs):
+    from concurrent.futures import ThreadPoolExecutor
+    from knack.util import CLIError
+
+    def _list(resource_id):
+        try:
+            return client.list(resource_id, **kwargs)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning('%s: %s', resource_id, ex)
+            return ex
+
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(resources))) as executor:
+        responses = list(executor.map(_list, resources))
+
+    errors = [{'resourceId': r, 'error': str(e)} for r, e in zip(resources, responses) if isinstance(e, Exception)]
+    if len(errors) == len(resources):
+        raise CLIError('Failed to list the metrics of all {} resources.'.format(len(resources)))
+
+    result = merge_metric_responses([(r, response) for r, response in zip(resources, responses)
+                                     if not isinstance(response, Exception)], kwargs.get('aggregation'))
+    result['errors'] = errors
+    return result
+
+
+def merge_metric_responses(responses, aggregation=None):
+    """ Merge the metric responses of several resources into a columnar result.
+
+    The result has a single timestamp axis. Every column describes one time series of one resource, metric and
+    aggregation, and every row holds the timestamp followed by the value of each column, or None when the series has
+    no value at that time.
+
+    :param responses: list of (resource ID, Response) pairs.
+    :param str aggregation: the comma separated aggregations that were queried, all the aggregations with values are
+                            returned when not specified.
+    """
+    requested = [a.strip().lower() for a in aggregation.split(',')] if aggregation else None
+
+    columns = []
+    series_values = []
+    timestamps = set()
+    timespan = interval = None
+    for resource_id, response in responses:
+        timespan = timespan or response.timespan
+        interval = interval or response.interval
+        for metric in response.value:
+            for series in metric.timeseries or []:
+                data = series.data or []
+                fields = requested or [f for f in _AGGREGATION_FIELDS
+                                       if any(getattr(d, f, None) is not None for d in data)]
+                metadata = dict((m.name.value, m.value) for m in series.metadatavalues or [])
+                for field in fields:
+                    columns.append({'resourceId': resource_id, 'metric': metric.name.value, 'aggregation': field,
+                                    'unit': metric.unit, 'metadata': metadata})
+                    series_values.append(dict((d.time_stamp, getattr(d, field, None)) for d in data))
+                timestamps.update(d.time_stamp for d in data)
+
+    rows = [[timestamp] + [values.get(timestamp) for values in series_values] for timestamp in sorted(timestamps)]
+    return {'timespan': timespan, 'interval': interval, 'columns': columns, 'rows': rows}
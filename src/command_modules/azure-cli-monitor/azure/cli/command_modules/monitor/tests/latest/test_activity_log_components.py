@@ -3,14 +3,21 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
 import unittest
 import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
 
+import mock
 from knack.util import CLIError
 
 from azure.cli.command_modules.monitor.operations.activity_log import (_build_activity_log_odata_filter,
                                                                        _activity_log_select_filter_builder,
-                                                                       _build_odata_filter)
+                                                                       _build_odata_filter, _get_time_slices,
+                                                                       list_activity_log)
 
 
 class TestActivityLogODataBuilderComponents(unittest.TestCase):
@@ -70,3 +77,74 @@ class TestActivityLogODataBuilderComponents(unittest.TestCase):
 
         with self.assertRaises(CLIError):
             _build_odata_filter(default_filter, field_name, None, field_label)
+
+    def test_get_time_slices(self):
+        time_slices = _get_time_slices('2018-08-01T10:00:00Z', '2018-08-03T06:30:00Z', 24)
+        self.assertEqual(time_slices, [(datetime(2018, 8, 3), datetime(2018, 8, 3, 6, 30)),
+                                       (datetime(2018, 8, 2), datetime(2018, 8, 3)),
+                                       (datetime(2018, 8, 1, 10), datetime(2018, 8, 2))])
+
+        with self.assertRaises(CLIError):
+            _get_time_slices('2018-08-01T10:00:00Z', '2018-08-03T06:30:00Z', 0)
+
+
+class TestActivityLogTimeSlices(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.cmd = mock.MagicMock()
+        self.cmd.cli_ctx.config.config_dir = self.config_dir
+        self.cmd.cli_ctx.config.getint.return_value = 12
+        self.cmd.cli_ctx.cloud.name = 'AzureCloud'
+
+        def _event(day, hour):
+            event = mock.MagicMock(spec=['event_timestamp', 'event_data_id'])
+            event.event_timestamp = datetime(2018, 8, day, hour)
+            event.event_data_id = '{}-{}'.format(day, hour)
+            return event
+
+        events_by_day = {
+            '2018-08-03': [_event(3, 5), _event(3, 1), _event(3, 0)],
+            '2018-08-02': [_event(3, 0), _event(2, 12), _event(2, 0)],
+            '2018-08-01': [_event(2, 0), _event(1, 11)]
+        }
+        self.client = mock.MagicMock()
+        self.client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
+        self.client.list.side_effect = lambda **kwargs: list(events_by_day[kwargs['filter'][18:28]])
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _list(self, max_events=50):
+        return list_activity_log(self.cmd, self.client, resource_group='rg', start_time='2018-08-01T10:00:00Z',
+                                 end_time='2018-08-03T06:30:00Z', max_events=max_events, max_parallel=2)
+
+    def test_list_activity_log_merges_slices_newest_first(self):
+        result = self._list()
+        self.assertEqual([e['eventDataId'] for e in result], ['3-5', '3-1', '3-0', '2-12', '2-0', '1-11'])
+        self.assertEqual(self.client.list.call_count, 3)
+
+        # every slice ended more than 12 hours ago, the one aligned to slice boundaries on both ends is served from
+        # the cache, the newest and the oldest end and start at the bounds of the query
+        self.assertEqual(self._list(), result)
+        self.assertEqual(self.client.list.call_count, 5)
+        self.assertEqual(len(os.listdir(os.path.join(self.config_dir, 'activityLogCache'))), 1)
+
+    def test_list_activity_log_prunes_expired_slices(self):
+        cache_dir = os.path.join(self.config_dir, 'activityLogCache')
+        os.makedirs(cache_dir)
+        expired, recent = os.path.join(cache_dir, 'expired.json'), os.path.join(cache_dir, 'recent.json')
+        for path, days in [(expired, 91), (recent, 89)]:
+            with open(path, 'w') as f:
+                f.write('[]')
+            modified = time.time() - days * 24 * 3600
+            os.utime(path, (modified, modified))
+
+        self._list()
+        self.assertFalse(os.path.exists(expired))
+        self.assertTrue(os.path.exists(recent))
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_list_activity_log_stops_at_max_events(self):
+        self.cmd.cli_ctx.config.getint.return_value = 0
+        result = self._list(max_events=3)
+        self.assertEqual([e['eventDataId'] for e in result], ['3-5', '3-1', '3-0'])
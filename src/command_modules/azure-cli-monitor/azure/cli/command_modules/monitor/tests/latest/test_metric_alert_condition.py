@@ -0,0 +1,50 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+
+from knack.util import CLIError
+
+from azure.cli.command_modules.monitor._metric_alert_condition import parse_metric_alert_condition
+
+
+class TestMetricAlertConditionParser(unittest.TestCase):
+
+    def test_parse_metric_alert_condition(self):
+        result = parse_metric_alert_condition('avg Percentage CPU > 90')
+        self.assertEqual(result, {'time_aggregation': 'Average', 'metric_name': 'Percentage CPU',
+                                  'operator': 'GreaterThan', 'threshold': '90', 'dimensions': [], 'name': ''})
+
+        result = parse_metric_alert_condition("max Microsoft.Storage.'Disk Read' != 3,5\n")
+        self.assertEqual((result['metric_namespace'], result['metric_name'], result['operator'],
+                          result['threshold']), ('Microsoft.Storage', 'Disk Read', 'NotEquals', '3,5'))
+
+    def test_parse_metric_alert_condition_dimensions(self):
+        result = parse_metric_alert_condition('total transactions > 5 where ResponseType includes Success and '
+                                              'ApiName includes GetBlob')
+        self.assertEqual(result['dimensions'], [
+            {'name': 'ResponseType', 'operator': 'includes', 'values': ['Success']},
+            {'name': 'ApiName', 'operator': 'includes', 'values': ['GetBlob']}])
+
+        result = parse_metric_alert_condition('avg cpu <= 5 WHERE A Includes x, y or 2, B EXCLUDES z')
+        self.assertEqual(result['dimensions'], [
+            {'name': 'A', 'operator': 'includes', 'values': ['x', 'y', '2']},
+            {'name': 'B', 'operator': 'excludes', 'values': ['z']}])
+
+    def test_parse_metric_alert_condition_errors(self):
+        for condition, message in [
+                ('avg cpu>5', "line 1:8 mismatched input '5' expecting WHITESPACE"),
+                ('avg cpu > x', "line 1:10 mismatched input 'x' expecting NUMBER"),
+                ('avg cpu-x > 5', "line 1:7 token recognition error at: '-'"),
+                ('avg cpu > 5 garbage', "line 1:12 extraneous input 'garbage' expecting <EOF>"),
+                ('avg cpu > 5 where a b', "line 1:20 mismatched input 'b' expecting {INCLUDES, EXCLUDES}"),
+                ('count cpu > 5', "line 1:0 invalid aggregation 'count'"),
+                ('', "line 1:0 mismatched input '<EOF>' expecting WORD")]:
+            with self.assertRaisesRegexp(CLIError, message):
+                parse_metric_alert_condition(condition)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -88,3 +88,51 @@ class MonitorNameOrIdTest(unittest.TestCase):
         self.assertFalse(hasattr(ns, 'namespace'))
         self.assertFalse(hasattr(ns, 'parent'))
         self.assertFalse(hasattr(ns, 'resource_type'))
+
+
+class MetricsListTest(unittest.TestCase):
+    @staticmethod
+    def _response(times, averages, dimension=None):
+        from datetime import datetime
+        from azure.mgmt.monitor.models import (Response, Metric, LocalizableString, TimeSeriesElement, MetricValue,
+                                               MetadataValue)
+        metadata = [MetadataValue(name=LocalizableString(value='ApiName'), value=dimension)] if dimension else []
+        data = [MetricValue(time_stamp=datetime(2018, 8, 1, 0, t), average=a) for t, a in zip(times, averages)]
+        return Response(timespan='2018-08-01T00:00:00Z/2018-08-01T01:00:00Z', value=[
+            Metric(id='cpu', type='Microsoft.Insights/metrics', name=LocalizableString(value='CPU'), unit='Percent',
+                   timeseries=[TimeSeriesElement(metadatavalues=metadata, data=data)])])
+
+    def test_list_metrics_merges_resources_into_columns(self):
+        from knack.util import todict
+        from azure.cli.command_modules.monitor.operations.metrics import list_metrics
+        from azure.cli.command_modules.monitor.transformers import metrics_table
+
+        resources = ['/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm{}'.format(i)
+                     for i in range(3)]
+        responses = {resources[0]: self._response([0, 1], [1.0, 2.0]),
+                     resources[1]: CLIError('throttled'),
+                     resources[2]: self._response([1, 2], [3.0, 4.0], dimension='Get')}
+
+        def _list(resource_uri, **_):
+            if isinstance(responses[resource_uri], Exception):
+                raise responses[resource_uri]
+            return responses[resource_uri]
+
+        client = mock.MagicMock()
+        client.list.side_effect = _list
+        result = todict(list_metrics(client, resources=resources, max_parallel=2))
+
+        self.assertEqual([(c['resourceId'], c['aggregation'], c['metadata']) for c in result['columns']],
+                         [(resources[0], 'average', {}), (resources[2], 'average', {'ApiName': 'Get'})])
+        self.assertEqual(result['rows'], [['2018-08-01T00:00:00', 1.0, None],
+                                          ['2018-08-01T00:01:00', 2.0, 3.0],
+                                          ['2018-08-01T00:02:00', None, 4.0]])
+        self.assertEqual(result['errors'], [{'resourceId': resources[1], 'error': 'throttled'}])
+
+        table = metrics_table(result)
+        self.assertEqual(list(table[1].items()), [('Timestamp', '2018-08-01T00:01:00'), ('vm0 CPU (average)', 2.0),
+                                                  ('vm2 CPU (average) ApiName=Get', 3.0)])
+
+        client.list.side_effect = CLIError('throttled')
+        with self.assertRaisesRegexp(CLIError, 'all 3 resources'):
+            list_metrics(client, resources=resources)
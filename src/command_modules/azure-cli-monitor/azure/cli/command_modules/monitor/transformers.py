@@ -66,15 +66,19 @@ def metrics_definitions_table(results):
     return _generic_table_convert(results, row_convert)
 
 
+def _metrics_from_time(time_string):
+    from datetime import datetime
+    try:
+        return datetime.strptime(time_string, '%Y-%m-%dT%H:%M:%S+00:00').strftime('%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return time_string
+
+
 def metrics_table(results):
     from collections import OrderedDict
 
-    def from_time(time_string):
-        from datetime import datetime
-        try:
-            return datetime.strptime(time_string, '%Y-%m-%dT%H:%M:%S+00:00').strftime('%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            return time_string
+    if 'rows' in results:
+        return _merged_metrics_table(results)
 
     retval = []
     for value_group in results['value']:
@@ -84,7 +88,7 @@ def metrics_table(results):
 
             for data in series['data']:
                 row = OrderedDict()
-                row['Timestamp'] = from_time(data['timeStamp'])
+                row['Timestamp'] = _metrics_from_time(data['timeStamp'])
                 row['Name'] = name
                 for metadata_name, metadata_value in metadata.items():
                     row[metadata_name] = metadata_value
@@ -95,3 +99,25 @@ def metrics_table(results):
                     row[field] = data[field]
                 retval.append(row)
     return retval
+
+
+def _merged_metrics_table(results):
+    """ One row per timestamp and one column per resource, metric, aggregation and dimension values. """
+    from collections import OrderedDict
+
+    headers = []
+    for column in results['columns']:
+        header = '{} {} ({})'.format(column['resourceId'].rstrip('/').rsplit('/', 1)[-1], column['metric'],
+                                     column['aggregation'])
+        if column['metadata']:
+            header += ' ' + ', '.join('{}={}'.format(k, v) for k, v in sorted(column['metadata'].items()))
+        headers.append(header)
+
+    retval = []
+    for values in results['rows']:
+        row = OrderedDict()
+        row['Timestamp'] = _metrics_from_time(values[0])
+        for header, value in zip(headers, values[1:]):
+            row[header] = value
+        retval.append(row)
+    return retval
@@ -57,7 +57,8 @@ def get_autoscale_scale_direction_map():
 # endregion
 
 
-def validate_time_range_and_add_defaults(start_time, end_time, formatter='startTime eq {} and endTime eq {}'):
+def get_time_range(start_time, end_time):
+    """ Parse the start and end times, defaulting to the last hour. Returns a pair of naive UTC datetimes. """
     from datetime import datetime, timedelta
     try:
         end_time = datetime.strptime(end_time, DATE_TIME_FORMAT) if end_time else datetime.utcnow()
@@ -71,4 +72,9 @@ def validate_time_range_and_add_defaults(start_time, end_time, formatter='startT
     except ValueError:
         raise ValueError("Input '{}' is not valid datetime. Valid example: 2000-12-31T12:59:59Z".format(start_time))
 
+    return start_time, end_time
+
+
+def validate_time_range_and_add_defaults(start_time, end_time, formatter='startTime eq {} and endTime eq {}'):
+    start_time, end_time = get_time_range(start_time, end_time)
     return formatter.format(start_time.strftime('%Y-%m-%dT%H:%M:%SZ'), end_time.strftime('%Y-%m-%dT%H:%M:%SZ'))
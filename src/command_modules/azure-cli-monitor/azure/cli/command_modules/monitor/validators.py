@@ -254,6 +254,50 @@ def process_metric_dimension(namespace):
     ns['filter'] = ' and '.join("{} eq '*'".format(d) for d in dimensions)
 
 
+def process_metric_resources(cmd, namespace):
+    """ Resolves either the single target resource or the resources whose metrics are listed together. The resources
+    are given by ID or queried by type, optionally within a resource group. """
+    from knack.util import CLIError
+    from msrestazure.tools import is_valid_resource_id
+
+    resource_type = namespace.resource_type
+    if namespace.resource_uri or not (namespace.resources or resource_type):
+        if namespace.resources:
+            raise CLIError('usage error: --resource and --resources are mutually exclusive.')
+        get_target_resource_validator('resource_uri', required=True)(cmd, namespace)
+        return
+
+    if namespace.resources:
+        if any((namespace.namespace, namespace.parent, resource_type, namespace.resource_group_name)):
+            raise CLIError('usage error: --resources ID [ID ...] | --resource-type TYPE [--resource-namespace '
+                           'NAMESPACE] [--resource-group NAME]')
+        invalid = [r for r in namespace.resources if not is_valid_resource_id(r)]
+        if invalid:
+            raise CLIError("--resources only accepts resource IDs: '{}' is not a valid resource ID.".format(
+                invalid[0]))
+    else:
+        from azure.cli.core.commands.client_factory import get_mgmt_service_client
+        from azure.cli.core.profiles import ResourceType
+        if namespace.parent:
+            raise CLIError('usage error: --resource-parent can only be used with --resource NAME.')
+        if namespace.namespace and '/' not in resource_type:
+            resource_type = '{}/{}'.format(namespace.namespace, resource_type)
+        client = get_mgmt_service_client(cmd.cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES).resources
+        odata_filter = "resourceType eq '{}'".format(resource_type)
+        if namespace.resource_group_name:
+            found = client.list_by_resource_group(namespace.resource_group_name, filter=odata_filter)
+        else:
+            found = client.list(filter=odata_filter)
+        namespace.resources = [r.id for r in found]
+        if not namespace.resources:
+            raise CLIError("No resources of type '{}' were found.".format(resource_type))
+
+    del namespace.namespace
+    del namespace.parent
+    del namespace.resource_type
+    del namespace.resource_group_name
+
+
 def validate_metric_names(namespace):
     if namespace.metricnames:
         namespace.metricnames = ','.join(namespace.metricnames)
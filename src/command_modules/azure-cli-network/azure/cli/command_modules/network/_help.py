@@ -1692,10 +1692,16 @@ helps['network dns zone export'] = """
 helps['network dns zone import'] = """
     type: command
     short-summary: Create a DNS zone using a DNS zone file.
+    long-summary: >
+        Record sets are written in parallel. An import which is interrupted or fails to write some record sets
+        resumes with the record sets which were not written when the same file is imported again.
     examples:
         - name: Import a local zone file into a DNS zone resource.
           text: >
             az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file
+        - name: Update an existing DNS zone from a zone file, only writing the record sets which changed.
+          text: >
+            az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file --skip-unchanged
 """
 
 helps['network dns zone list'] = """
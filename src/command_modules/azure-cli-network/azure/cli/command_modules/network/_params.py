@@ -336,6 +336,8 @@ def load_arguments(self, _):
 
     with self.argument_context('network dns zone import') as c:
         c.argument('file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to import')
+        c.argument('skip_unchanged', action='store_true', help='Only write the record sets which differ from the record sets already in the zone.')
+        c.argument('max_parallel', type=int, help='Maximum number of record sets to write in parallel.')
 
     with self.argument_context('network dns zone export') as c:
         c.argument('file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to save')
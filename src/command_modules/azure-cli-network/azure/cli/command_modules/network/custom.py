@@ -30,6 +30,9 @@ from azure.cli.core.profiles import ResourceType, supported_api_version
 
 logger = get_logger(__name__)
 
+DNS_IMPORT_MAX_PARALLEL = 8
+DNS_IMPORT_THROTTLING_RETRY_TIMES = 5
+
 
 # region Utility methods
 def _log_pprint_template(template):
@@ -1091,9 +1094,13 @@ def _build_record(cmd, data):
 
 
 # pylint: disable=too-many-statements
-def import_zone(cmd, resource_group_name, zone_name, file_name):
+def import_zone(cmd, resource_group_name, zone_name, file_name, skip_unchanged=False,
+                max_parallel=DNS_IMPORT_MAX_PARALLEL):
     from azure.cli.core.util import read_file_content
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     import sys
+    if max_parallel < 1:
+        raise CLIError('usage error: --max-parallel must be a positive integer')
     file_text = read_file_content(file_name)
     zone_obj = parse_zone_file(file_text, zone_name)
 
@@ -1151,6 +1158,21 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
 
     Zone = cmd.get_models('Zone', resource_type=ResourceType.MGMT_NETWORK_DNS)
     client.zones.create_or_update(resource_group_name, zone_name, Zone(location='global'))
+
+    # record sets imported by a previous, interrupted import of the same file are not written again
+    journal_path = _get_zone_import_journal_path(cmd.cli_ctx, get_subscription_id(cmd.cli_ctx), resource_group_name,
+                                                 zone_name, file_text)
+    imported_keys = _read_zone_import_journal(journal_path)
+    if imported_keys:
+        print('Resuming the import of {} record sets committed by a previous import.'.format(len(imported_keys)),
+              file=sys.stderr)
+
+    existing_record_sets = None
+    if skip_unchanged:
+        existing_record_sets = {(x.name.lower(), x.type.rsplit('/', 1)[1].lower()): x
+                                for x in client.record_sets.list_by_dns_zone(resource_group_name, zone_name)}
+
+    jobs = []
     for key, rs in record_sets.items():
 
         rs_name, rs_type = key.lower().rsplit('.', 1)
@@ -1162,27 +1184,126 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
             record_count = len(getattr(rs, _type_to_property_name(rs_type)))
         except TypeError:
             record_count = 1
-        if rs_name == '@' and rs_type == 'soa':
-            root_soa = client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
-            rs.soa_record.host = root_soa.soa_record.host
-            rs_name = '@'
-        elif rs_name == '@' and rs_type == 'ns':
-            root_ns = client.record_sets.get(resource_group_name, zone_name, '@', 'NS')
-            root_ns.ttl = rs.ttl
-            rs = root_ns
-            rs_type = rs.type.rsplit('/', 1)[1]
-        try:
-            client.record_sets.create_or_update(
-                resource_group_name, zone_name, rs_name, rs_type, rs)
+        if key in imported_keys:
             cum_records += record_count
-            print("({}/{}) Imported {} records of type '{}' and name '{}'"
-                  .format(cum_records, total_records, record_count, rs_type, rs_name), file=sys.stderr)
-        except CloudError as ex:
-            logger.error(ex)
+            continue
+        jobs.append((key, rs_name, rs_type, rs, record_count))
+
+    failed = False
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor, \
+            _open_zone_import_journal(journal_path) as journal:
+        futures = {executor.submit(_import_record_set, client, resource_group_name, zone_name, rs_name, rs_type, rs,
+                                   existing_record_sets): (key, rs_name, rs_type, record_count)
+                   for key, rs_name, rs_type, rs, record_count in jobs}
+        for future in as_completed(futures):
+            key, rs_name, rs_type, record_count = futures[future]
+            try:
+                written = future.result()
+            except CloudError as ex:
+                logger.error(ex)
+                failed = True
+                continue
+            journal.write(key + '\n')
+            journal.flush()
+            cum_records += record_count
+            print("({}/{}) {} {} records of type '{}' and name '{}'"
+                  .format(cum_records, total_records, 'Imported' if written else 'Skipped unchanged', record_count,
+                          rs_type, rs_name), file=sys.stderr)
+    if not failed:
+        _remove_zone_import_journal(journal_path)
     print("\n== {}/{} RECORDS IMPORTED SUCCESSFULLY: '{}' =="
           .format(cum_records, total_records, zone_name), file=sys.stderr)
 
 
+def _import_record_set(client, resource_group_name, zone_name, rs_name, rs_type, rs, existing_record_sets=None):
+    """ Writes a record set of an imported zone. When the existing record sets of the zone are given, a record set
+    which is unchanged is not written. Returns whether the record set was written. """
+    existing = None
+    if existing_record_sets is not None:
+        existing = existing_record_sets.get((rs_name, rs_type))
+
+    if rs_name == '@' and rs_type == 'soa':
+        root_soa = existing or _retry_throttled_request(
+            client.record_sets.get, resource_group_name, zone_name, '@', 'SOA')
+        rs.soa_record.host = root_soa.soa_record.host
+    elif rs_name == '@' and rs_type == 'ns':
+        root_ns = existing or _retry_throttled_request(
+            client.record_sets.get, resource_group_name, zone_name, '@', 'NS')
+        if existing and existing.ttl == rs.ttl:
+            return False
+        root_ns.ttl = rs.ttl
+        rs = root_ns
+        rs_type = rs.type.rsplit('/', 1)[1]
+        existing = None
+
+    if existing and _record_sets_equal(existing, rs, rs_type):
+        return False
+    _retry_throttled_request(client.record_sets.create_or_update, resource_group_name, zone_name, rs_name, rs_type, rs)
+    return True
+
+
+def _record_sets_equal(record_set, other, record_type):
+    def _get_records(rs):
+        records = getattr(rs, _type_to_property_name(record_type), None) or []
+        if not isinstance(records, list):
+            records = [records]
+        # the values are compared as strings, as the zone file parser doesn't convert all of them
+        return sorted(tuple(str(getattr(record, attr))
+                            for attr in sorted(record._attribute_map))  # pylint: disable=protected-access
+                      for record in records)
+
+    return record_set.ttl == other.ttl and _get_records(record_set) == _get_records(other)
+
+
+def _retry_throttled_request(operation, *args, **kwargs):
+    """ Calls the operation, waiting and retrying while it is throttled. """
+    import time
+    for attempt in range(DNS_IMPORT_THROTTLING_RETRY_TIMES + 1):
+        try:
+            return operation(*args, **kwargs)
+        except CloudError as ex:
+            if ex.status_code != 429 or attempt == DNS_IMPORT_THROTTLING_RETRY_TIMES:
+                raise
+            retry_after = ex.response.headers.get('Retry-After', '') if ex.response is not None else ''
+            delay = int(retry_after) if retry_after.isdigit() else min(2 ** attempt, 60)
+            logger.info('Request throttled. Retrying in %s seconds.', delay)
+            time.sleep(delay)
+
+
+def _get_zone_import_journal_path(cli_ctx, subscription_id, resource_group_name, zone_name, file_text):
+    import hashlib
+    import os
+    key = '\n'.join([subscription_id, resource_group_name.lower(), zone_name.lower(), file_text])
+    return os.path.join(cli_ctx.config.config_dir, 'dnsZoneImport',
+                        hashlib.sha256(key.encode('utf-8')).hexdigest() + '.journal')
+
+
+def _read_zone_import_journal(journal_path):
+    try:
+        with open(journal_path, 'r') as f:
+            return set(line.rstrip('\n') for line in f if line.endswith('\n'))
+    except (IOError, OSError):
+        return set()
+
+
+def _open_zone_import_journal(journal_path):
+    import os
+    try:
+        os.makedirs(os.path.dirname(journal_path))
+    except OSError:
+        if not os.path.isdir(os.path.dirname(journal_path)):
+            raise
+    return open(journal_path, 'a')
+
+
+def _remove_zone_import_journal(journal_path):
+    import os
+    try:
+        os.remove(journal_path)
+    except OSError:
+        pass
+
+
 def add_dns_aaaa_record(cmd, resource_group_name, zone_name, record_set_name, ipv6_address):
     record = AaaaRecord(ipv6_address=ipv6_address)
     record_type = 'aaaa'
@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import mock
@@ -76,6 +79,73 @@ class TestNetworkUnitTests(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result[1].value, 'noodle')
 
+    @mock.patch('time.sleep', autospec=True)
+    @mock.patch('azure.cli.command_modules.network.custom.get_subscription_id', autospec=True)
+    @mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', autospec=True)
+    def test_network_dns_zone_import(self, client_factory, get_subscription_id, sleep):
+        from msrestazure.azure_exceptions import CloudError
+        from azure.mgmt.dns.models import RecordSet, ARecord, NsRecord, SoaRecord
+        from azure.cli.command_modules.network.custom import import_zone
+
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        zone_file = os.path.join(test_dir, 'zone.txt')
+        with open(zone_file, 'w') as f:
+            f.write('$ORIGIN zone.com.\n'
+                    '@ 3600 IN SOA ns1.zone.com. hostmaster ( 1 3600 300 2419200 300 )\n'
+                    '@ 172800 IN NS ns1.zone.com.\n'
+                    'www 3600 IN A 1.2.3.4\n'
+                    '    3600 IN A 1.2.3.5\n'
+                    'mail 3600 IN A 1.2.3.6\n'
+                    'ftp 3600 IN A 1.2.3.7\n')
+
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.config.config_dir = test_dir
+        get_subscription_id.return_value = '00000000-0000-0000-0000-000000000000'
+        client = client_factory.return_value
+
+        def _record_set(name, record_type, ttl, **kwargs):
+            record_set = RecordSet(ttl=ttl, **kwargs)
+            record_set.name = name
+            record_set.type = 'Microsoft.Network/dnszones/' + record_type
+            return record_set
+
+        client.record_sets.list_by_dns_zone.return_value = [
+            _record_set('@', 'SOA', 3600, soa_record=SoaRecord(host='ns1-01.azure-dns.com.', email='hostmaster.zone.com.',
+                                                               serial_number=1, refresh_time=3600, retry_time=300,
+                                                               expire_time=2419200, minimum_ttl=300)),
+            _record_set('@', 'NS', 172800, ns_records=[NsRecord(nsdname='ns1-01.azure-dns.com.')]),
+            _record_set('www', 'A', 3600, arecords=[ARecord(ipv4_address='1.2.3.5'), ARecord(ipv4_address='1.2.3.4')]),
+            _record_set('mail', 'A', 3600, arecords=[ARecord(ipv4_address='1.1.1.1')])
+        ]
+
+        writes = []
+        failures = {'mail': [429], 'ftp': [500]}
+
+        def _create_or_update(resource_group_name, zone_name, name, record_type, record_set):
+            if failures.get(name):
+                response = mock.MagicMock(status_code=failures[name].pop(), headers={'Retry-After': '7'})
+                raise CloudError(response, error='Error')
+            writes.append((name, record_type))
+
+        client.record_sets.create_or_update.side_effect = _create_or_update
+
+        # only the changed record sets are written, a throttled write is retried
+        import_zone(cmd, 'rg', 'zone.com', zone_file, skip_unchanged=True, max_parallel=1)
+        self.assertEqual(writes, [('mail', 'a')])
+        sleep.assert_called_once_with(7)
+        journals = os.listdir(os.path.join(test_dir, 'dnsZoneImport'))
+        self.assertEqual(len(journals), 1)
+
+        # an interrupted import resumes with the record sets which were not written
+        del writes[:]
+        import_zone(cmd, 'rg', 'zone.com', zone_file, max_parallel=4)
+        self.assertEqual(writes, [('ftp', 'a')])
+        self.assertEqual(os.listdir(os.path.join(test_dir, 'dnsZoneImport')), [])
+
+        with self.assertRaises(CLIError):
+            import_zone(cmd, 'rg', 'zone.com', zone_file, max_parallel=0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -38,7 +38,6 @@ Known limitations:
 import copy
 import datetime
 import time
-import argparse
 from collections import OrderedDict
 import re
 
@@ -60,116 +59,58 @@ date_regex_dict = {
 }
 
 
-class ZonefileLineParser(argparse.ArgumentParser):
-    def error(self, message):
-        """
-        Silent error message
-        """
-        raise InvalidLineException(message)
-
-
-class IncorrectParserException(Exception):
-    pass
-
-
-def _make_record_parser(parsers, rec_type, arg_defs):
-    """
-    Make a parser for a given type of DNS record
-    """
-    parser = ZonefileLineParser(rec_type)
-    parser.add_argument('name', type=str)
-
-    for arg in arg_defs:
-        nargs = arg[2] if len(arg) > 2 else 1
-        parser.add_argument(arg[0], type=arg[1], nargs=nargs)
-
-    parsers.append(parser)
+RECORD_TYPES = [x for x in SUPPORTED_RECORDS if not x.startswith('$')]
+
+# the fields following the type of each DNS record, with alternative forms tried in order
+RECORD_FIELDS = {
+    'SOA': [
+        [('host', str), ('email', str), ('serial', int), ('refresh', str), ('retry', str), ('expire', str),
+         ('minimum', str)],
+        [('host', str), ('email', str), ('serial', int), ('refresh', str), ('retry', str), ('expire', str)]
+    ],
+    'NS': [[('host', str)]],
+    'A': [[('ip', str)]],
+    'AAAA': [[('ip', str)]],
+    'CAA': [[('flags', int), ('tag', str), ('value', str)]],
+    'CNAME': [[('alias', str)]],
+    'MX': [[('preference', str), ('host', str)]],
+    'TXT': [[('txt', str, '+')]],
+    'PTR': [[('host', str)]],
+    'SRV': [[('priority', int), ('weight', int), ('port', int), ('target', str)]],
+    'SPF': [[('txt', str)]],
+    'URI': [[('priority', int), ('weight', int), ('target', str)]]
+}
 
 
-def _make_parser():
-    """
-    Make an array of parsers that can process different DNS record types
-    """
-    parsers = []
-
-    # parse $ORIGIN
-    origin = ZonefileLineParser('$ORIGIN')
-    origin.add_argument('DELIM', type=str)
-    origin.add_argument('value', type=str)
-    parsers.append(origin)
-
-    # parse $TTL
-    ttl = ZonefileLineParser('$TTL')
-    ttl.add_argument('DELIM', type=str)
-    ttl.add_argument('value', type=str)
-    parsers.append(ttl)
-
-    # parse each RR
-    _make_record_parser(parsers, 'SOA', [
-        ('ttl', str), ('DELIM', str),
-        ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str)
-    ])
-    _make_record_parser(parsers, 'NS', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'A', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'AAAA', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'CAA', [('ttl', str, '?'), ('DELIM', str), ('flags', int), ('tag', str), ('value', str)])
-    _make_record_parser(parsers, 'CNAME', [('ttl', str, '?'), ('DELIM', str), ('alias', str)])
-    _make_record_parser(parsers, 'MX', [('ttl', str, '?'), ('DELIM', str), ('preference', str), ('host', str)])
-    _make_record_parser(parsers, 'TXT', [('ttl', str), ('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'TXT', [('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'PTR', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'SRV', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('port', int), ('target', str)])
-    _make_record_parser(parsers, 'SPF', [('ttl', str, '?'), ('DELIM', str), ('txt', str)])
-    _make_record_parser(parsers, 'URI', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('target', str)])
-
-    return parsers
-
-
-def _tokenize_line(line, quote_strings=False, infer_name=True):
+def _tokenize_line(line):
     """
     Tokenize a line:
     * split tokens on whitespace
     * treat quoted strings as a single token
+    Returns (token, quoted) pairs, where quoted tells if the token starts with a quoted string.
     """
     ret = []
     escape = False
     quote = False
+    quoted = False
     tokbuf = ""
-    firstchar = True
-    ll = list(line)
-    while len(ll) > 0:
-        c = ll.pop(0)
+    for c in line:
         if c.isspace():
-            if firstchar:
-                # used by the _add_record_names method
-                tokbuf += '$NAME' if infer_name else ' '
-
             if not quote and not escape:
                 # end of token
                 if len(tokbuf) > 0:
-                    ret.append(tokbuf)
+                    ret.append((tokbuf, quoted))
                 tokbuf = ''
+                quoted = False
 
             elif escape:
                 # escaped space (can be inside or outside of quote)
                 tokbuf += '\\' + c
                 escape = False
 
-            elif quote:
+            else:
                 # in quotes
                 tokbuf += c
-
-            else:
-                tokbuf = ''
         elif c == '\\':
             if escape:
                 # escape of an escape is valid part of the line sequence
@@ -181,16 +122,14 @@ def _tokenize_line(line, quote_strings=False, infer_name=True):
             if not escape:
                 if quote:
                     # end of quote
-                    if quote_strings:
-                        tokbuf += '"'
-                    ret.append(tokbuf)
+                    ret.append((tokbuf, quoted))
                     tokbuf = ''
                     quote = False
+                    quoted = False
                 else:
                     # beginning of quote
-                    if quote_strings:
-                        tokbuf += '"'
                     quote = True
+                    quoted = not tokbuf
             else:
                 # append the escaped quote
                 tokbuf += '\\"'
@@ -203,15 +142,11 @@ def _tokenize_line(line, quote_strings=False, infer_name=True):
 
             tokbuf += c
             escape = False
-        firstchar = False
 
     if len(tokbuf.strip(' \r\n\t')):
-        ret.append(tokbuf)
+        ret.append((tokbuf, quoted))
 
-    if len(ret) == 1 and ret[0] == '$NAME':
-        return []
-    else:
-        return ret
+    return ret
 
 
 def _find_comment_index(line):
@@ -248,181 +183,90 @@ def _find_comment_index(line):
     return -1
 
 
-def _serialize(tokens):
+def _iter_records(lines):
     """
-    Serialize tokens:
-    * quote whitespace-containing tokens
+    Yields the tokens of each record of a zonefile, in a single pass over its lines:
+    * remove comments
+    * join the lines of records grouped in parenthesis
+    Returns (tokens, inherit_name) pairs, where inherit_name tells if the record has no name
+    and uses the name of the previous record.
     """
-    ret = []
-    for tok in tokens:
-        if " " in tok:
-            tok = '"%s"' % tok
-
-        ret.append(tok)
-
-    return " ".join(ret)
-
-
-def _remove_comments(text):
-    """
-    Remove comments from a zonefile
-    """
-    ret = []
-    lines = text.split("\n")
+    tokens = []
+    inherit_name = False
+    capturing = False
     for line in lines:
-        if not line:
-            continue
-
         index = _find_comment_index(line)
         if index != -1:
             line = line[:index]
-        if line:
-            ret.append(line)
-
-    return "\n".join(ret)
-
-
-def _flatten(text):
-    """
-    Flatten the text:
-    * make sure each record is on one line.
-    * remove parenthesis
-    * remove Windows line endings
-    """
-    lines = text.split('\n')
-    SENTINEL = '%%%'
-
-    # tokens: sequence of non-whitespace separated by '' where a newline was
-    tokens = []
-    for line in (x for x in lines if len(x) > 0):
-        line = line.replace('\t', ' ')
-        tokens += _tokenize_line(line, quote_strings=True, infer_name=False)
-        tokens.append(SENTINEL)
-
-    # find (...) and turn it into a single line ("capture" it)
-    capturing = False
-    captured = []
-
-    flattened = []
-    while len(tokens) > 0:
-        tok = tokens.pop(0)
-
-        if tok == '$NAME':
-            tok = ' '
-
-        if not capturing and tok == SENTINEL:
-            # normal end-of-line
-            if len(captured) > 0:
-                flattened.append(" ".join(captured))
-                captured = []
-            continue
 
-        if tok.startswith("("):
-            # begin grouping
-            tok = tok.lstrip("(")
-            capturing = True
-
-        if capturing and tok.endswith(")"):
-            # end grouping.  next end-of-line will turn this sequence into a flat line
-            tok = tok.rstrip(")")
-            capturing = False
-
-        if tok != SENTINEL:
-            captured.append(tok)
-
-    return "\n".join(flattened)
+        line_tokens = _tokenize_line(line)
+        if not capturing:
+            if not line_tokens:
+                continue
+            tokens = []
+            inherit_name = line[0].isspace()
+
+        for tok, quoted in line_tokens:
+            if not quoted:
+                if tok.startswith("("):
+                    # begin grouping
+                    tok = tok.lstrip("(")
+                    capturing = True
+
+                if capturing and tok.endswith(")"):
+                    # end grouping.  the end of this line ends the record
+                    tok = tok.rstrip(")")
+                    capturing = False
+
+                if not tok:
+                    continue
+            tokens.append((tok, quoted))
 
+        if not capturing and tokens:
+            yield tokens, inherit_name
+            tokens = []
 
-def _remove_class(text):
-    """
-    Remove the CLASS from each DNS record, if present.
-    The only class that gets used today (for all intents
-    and purposes) is 'IN'.
-    """
-    # see RFC 1035 for list of classes
-    lines = text.split("\n")
-    ret = []
-    for line in lines:
-        original_tokens = _tokenize_line(line)
-        tokens = []
-        for token in original_tokens:
-            if token.upper() != 'IN':
-                tokens.append(token)
-        ret.append(_serialize(tokens))
-    return "\n".join(ret)
+    if tokens:
+        # unbalanced parenthesis
+        yield tokens, inherit_name
 
 
-def _add_record_names(text):
+def _parse_record(tokens, record_name):
     """
-    Go through each line of the text and ensure that
-    a name is defined.  Use previous record name if there is none.
+    Parse the tokens following the name of a record: [<ttl>] [<class>] <type> <fields>
+    The class, IN for all intents and purposes, is removed.
     """
-    global SUPPORTED_RECORDS
-
-    lines = text.split("\n")
-    ret = []
-    previous_record_name = None
-
-    for line in lines:
-        tokens = _tokenize_line(line)
-        if not tokens:
+    index = 0
+    while index < len(tokens) and index < 2 and (tokens[index][1] or tokens[index][0].upper() not in RECORD_TYPES):
+        index += 1
+    prefix = [tok for tok, quoted in tokens[:index] if quoted or tok.upper() != 'IN']
+    tokens = tokens[index:]
+    if not tokens or tokens[0][1] or tokens[0][0].upper() not in RECORD_TYPES or len(prefix) > 1:
+        raise InvalidLineException()
+
+    record_type = tokens[0][0].upper()
+    values = [tok for tok, _ in tokens[1:]]
+    for fields in RECORD_FIELDS[record_type]:
+        variadic = len(fields[-1]) > 2
+        if len(values) != len(fields) and not (variadic and len(values) > len(fields)):
             continue
-
-        record_name = tokens[0]
-        if record_name == '$NAME':
-            tokens = [previous_record_name] + tokens[1:]
-        elif not record_name.startswith('$'):
-            previous_record_name = record_name
-
-        ret.append(_serialize(tokens))
-
-    return "\n".join(ret)
-
-
-def _parse_record(parser, record_token):
-    global SUPPORTED_RECORDS
-
-    # match parser to record type
-    record_type = None
-    for i in range(3):
+        record = {'name': record_name, 'type': record_type}
+        if prefix:
+            record['ttl'] = prefix[0]
         try:
-            if record_token[i].upper() in SUPPORTED_RECORDS:
-                record_type = record_token[i].upper()
-                break
-        except KeyError:
-            break
-
-    if not record_type:
-        from knack.util import CLIError
-        raise CLIError('Unable to determine record type: {}'.format(' '.join(record_token)))
-
-    # move the record type to the front of the token list so it will conform to argparse
-    if record_type != parser.prog:
-        raise IncorrectParserException
-
-    try:
-        rr, unmatched = parser.parse_known_args(record_token)
-        assert len(unmatched) == 0, "Unmatched fields: %s" % unmatched
-    except (SystemExit, AssertionError, InvalidLineException):
-        # invalid argument
-        raise InvalidLineException(' '.join(record_token))
-
-    record = rr.__dict__
-    record['type'] = record_type
+            for i, field in enumerate(fields):
+                record[field[0]] = values[i:] if len(field) > 2 else field[1](values[i])
+        except ValueError:
+            continue
+        return record
 
-    # remove emtpy fields
-    for field in list(record.keys()):
-        if record[field] is None:
-            del record[field]
+    raise InvalidLineException()
 
-    for key in record:
-        try:
-            if len(record[key]) == 1:
-                record[key] = record[key][0]
-        except TypeError:
-            continue
 
-    return record
+def _parse_directive(tokens):
+    if len(tokens) != 2 or tokens[0][0].upper() not in SUPPORTED_RECORDS:
+        raise InvalidLineException()
+    return {'type': tokens[0][0].upper(), 'value': tokens[1][0]}
 
 
 def _convert_to_seconds(value):
@@ -474,16 +318,6 @@ def _post_process_ttl(zone):
                     record['ttl'] = ttl
 
 
-def _pre_process_txt_records(text):
-    """ This looks only for the cases of multiple text records not surrounded by quotes.
-    This must be done after flattening but before any tokenization occurs, as this strips out
-    the quotes. """
-    lines = text.split('\n')
-    for line in lines:
-        pass
-    return text
-
-
 def _post_process_txt_record(record, current_ttl):
     if not isinstance(record['txt'], list):
         record['txt'] = [record['txt']]
@@ -520,35 +354,26 @@ def parse_zone_file(text, zone_name, ignore_invalid=False):
     """
     Parse a zonefile into a dict
     """
-    parsers = _make_parser()
-
-    text = _remove_comments(text)
-    text = _flatten(text)
-    text = _remove_class(text)
-    text = _pre_process_txt_records(text)
-    text = _add_record_names(text)
-
     zone_obj = OrderedDict()
-    record_lines = text.split("\n")
     current_origin = zone_name.rstrip('.') + '.'
     current_ttl = 3600
     soa_processed = False
+    previous_record_name = None
 
-    for record_line in record_lines:
-        parse_match = False
-        record = None
-        for parser in parsers:
-            record_tokens = _tokenize_line(record_line)
-            try:
-                record = _parse_record(parser, record_tokens)
-                if record['DELIM'].lower() != record['type'].lower():
-                    raise IncorrectParserException
-                parse_match = True
-                break
-            except (InvalidLineException, IncorrectParserException):
+    for record_tokens, inherit_name in _iter_records(text.split('\n')):
+        try:
+            if not inherit_name and not record_tokens[0][1] and record_tokens[0][0].startswith('$'):
+                record = _parse_directive(record_tokens)
+            else:
+                if not inherit_name:
+                    previous_record_name = record_tokens[0][0]
+                if previous_record_name is None:
+                    raise InvalidLineException()
+                record = _parse_record(record_tokens if inherit_name else record_tokens[1:], previous_record_name)
+        except InvalidLineException:
+            if ignore_invalid:
                 continue
-        if not parse_match and not ignore_invalid:
-            raise CLIError('Unable to parse: {}'.format(record_line))
+            raise CLIError('Unable to parse: {}'.format(' '.join(tok for tok, _ in record_tokens)))
 
         record_type = record['type'].lower()
         if record_type.lower() == '$origin':
@@ -570,7 +395,8 @@ def parse_zone_file(text, zone_name, ignore_invalid=False):
                 record['fullname'] = record_name + '.' + current_origin
             elif record_type == 'soa':
                 for key in ['refresh', 'retry', 'expire', 'minimum']:
-                    record[key] = _convert_to_seconds(record[key])
+                    if key in record:
+                        record[key] = _convert_to_seconds(record[key])
                 _expand_with_origin(record, 'email', current_origin)
             elif record_type == 'cname':
                 _expand_with_origin(record, 'alias', current_origin)
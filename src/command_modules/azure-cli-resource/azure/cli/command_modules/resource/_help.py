@@ -477,6 +477,9 @@ helps['resource show'] = """
 helps['resource delete'] = """
     type: command
     short-summary: Delete a resource.
+    long-summary: >
+        Resources given by --ids are deleted concurrently, up to 10 at a time. Set `delete_max_parallel` in the
+        [resource] section of the CLI configuration, or AZURE_RESOURCE_DELETE_MAX_PARALLEL, to change the limit.
     examples:
         - name: Delete a virtual machine named 'MyVm'.
           text: >
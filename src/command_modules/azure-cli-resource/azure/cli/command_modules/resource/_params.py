@@ -24,7 +24,8 @@ def load_arguments(self, _):
         get_policy_completion_list, get_policy_set_completion_list, get_policy_assignment_completion_list,
         get_resource_types_completion_list, get_providers_completion_list)
     from azure.cli.command_modules.resource._validators import (
-        validate_lock_parameters, validate_resource_lock, validate_group_lock, validate_subscription_lock, validate_metadata, RollbackAction)
+        validate_lock_parameters, validate_resource_lock, validate_group_lock, validate_subscription_lock, validate_metadata, RollbackAction,
+        process_refresh_api_versions)
 
     # BASIC PARAMETER CONFIGURATION
 
@@ -50,6 +51,11 @@ def load_arguments(self, _):
         c.argument('resource_ids', nargs='+', options_list=['--ids'], help='One or more resource IDs (space-delimited). If provided, no other "Resource Id" arguments should be specified.', arg_group='Resource Id')
         c.argument('include_response_body', arg_type=get_three_state_flag(), help='Use if the default command output doesn\'t capture all of the property data.')
 
+    for scope in ['resource create', 'resource delete', 'resource show', 'resource tag', 'resource invoke-action', 'resource update']:
+        with self.argument_context(scope) as c:
+            c.extra('refresh_api_versions', action='store_true', validator=process_refresh_api_versions, arg_group='Resource Id',
+                    help='Retrieve the API versions of the resource providers from the service instead of the local cache.')
+
     with self.argument_context('resource list') as c:
         c.argument('name', resource_name_type)
 
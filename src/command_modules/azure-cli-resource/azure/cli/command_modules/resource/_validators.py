@@ -145,6 +145,13 @@ def validate_resource_lock(namespace):
         internal_validate_lock_parameters(namespace, **kwargs)
 
 
+def process_refresh_api_versions(cmd, namespace):
+    if namespace.refresh_api_versions:
+        from azure.cli.core.commands.arm import clear_provider_cache
+        clear_provider_cache(cmd.cli_ctx)
+    del namespace.refresh_api_versions
+
+
 def validate_metadata(namespace):
     if namespace.metadata:
         namespace.metadata = dict(x.split('=', 1) for x in namespace.metadata)
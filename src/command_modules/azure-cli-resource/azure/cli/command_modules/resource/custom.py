@@ -42,6 +42,9 @@ from azure.cli.command_modules.resource._validators import _parse_lock_id
 
 logger = get_logger(__name__)
 
+# concurrent deletions of `az resource delete`, unless limited by the core.max_parallel setting
+_DEFAULT_DELETE_MAX_PARALLEL = 10
+
 
 def _process_parameters(template_param_defs, parameter_lists):
 
@@ -345,7 +348,8 @@ def _list_resources_odata_filter_builder(resource_group_name=None, resource_prov
 
 def _get_auth_provider_latest_api_version(cli_ctx):
     rcf = _resource_client_factory(cli_ctx)
-    api_version = _ResourceUtils.resolve_api_version(rcf, 'Microsoft.Authorization', None, 'providerOperations')
+    api_version = _ResourceUtils.resolve_api_version(cli_ctx, rcf, 'Microsoft.Authorization', None,
+                                                     'providerOperations')
     return api_version
 
 
@@ -799,7 +803,7 @@ def delete_resource(cmd, resource_ids=None, resource_group_name=None,
     """
     Deletes the given resource(s).
     This function allows deletion of ids with dependencies on one another.
-    This is done with multiple passes through the given ids.
+    Deletions rejected because of a dependency are retried as the resources they depend on are deleted.
     """
     parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
                                                                               resource_provider_namespace,
@@ -809,39 +813,107 @@ def delete_resource(cmd, resource_ids=None, resource_group_name=None,
     to_be_deleted = [(_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version), id_dict)
                      for id_dict in parsed_ids]
 
-    results = []
-    from msrestazure.azure_exceptions import CloudError
-    while to_be_deleted:
-        logger.debug("Start new loop to delete resources.")
-        operations = []
-        failed_to_delete = []
-        for rsrc_utils, id_dict in to_be_deleted:
-            try:
-                operations.append(rsrc_utils.delete())
-                resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
-                logger.debug("deleting %s", resource)
-            except CloudError as e:
-                # request to delete failed, add parsed id dict back to queue
-                id_dict['exception'] = str(e)
-                failed_to_delete.append((rsrc_utils, id_dict))
-        to_be_deleted = failed_to_delete
-
-        # stop deleting if none deletable
-        if not operations:
-            break
+    return _single_or_collection(_delete_resources(to_be_deleted, _get_delete_max_parallel(cmd.cli_ctx)))
 
-        # all operations return result before next pass
-        for operation in operations:
-            results.append(operation.result())
 
-    if to_be_deleted:
-        error_msg_builder = ['Some resources failed to be deleted:']
-        for _, id_dict in to_be_deleted:
-            logger.debug(id_dict['exception'])
-            error_msg_builder.append(resource_dict_to_id(**id_dict))
+def _get_delete_max_parallel(cli_ctx):
+    try:
+        max_parallel = cli_ctx.config.getint('resource', 'delete_max_parallel', fallback=_DEFAULT_DELETE_MAX_PARALLEL)
+    except ValueError:
+        raise CLIError("Configuration 'resource.delete_max_parallel' must be a positive integer.")
+    if max_parallel < 1:
+        raise CLIError("Configuration 'resource.delete_max_parallel' must be a positive integer.")
+    return max_parallel
+
+
+def _delete_resources(to_be_deleted, max_parallel=_DEFAULT_DELETE_MAX_PARALLEL):  # pylint: disable=too-many-locals
+    """
+    Deletes the resources concurrently. A deletion rejected by the service, usually because another resource of the
+    set still depends on it, is retried as soon as the resource named in the error has been deleted, or, when the
+    error names no other resource of the set, as soon as any other deletion completes.
+    Returns the results of the deletions in the order of the given resources.
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from msrestazure.azure_exceptions import CloudError
+
+    names = [resource_dict_to_id(**id_dict) if id_dict.get('subscription') else id_dict['resource_name']
+             for _, id_dict in to_be_deleted]
+    results = [None] * len(to_be_deleted)
+    errors = {}
+    deleted = set()
+    # number of completed deletions when an attempt was submitted, and the attempts waiting for a blocker to go away
+    state = {'completions': 0}
+    submitted_at = {}
+    waiting = {}
+
+    def _delete(index):
+        rsrc_utils = to_be_deleted[index][0]
+        try:
+            operation = rsrc_utils.delete()
+        except CloudError as ex:
+            # request to delete failed, it will be retried once a potential blocker is deleted
+            return False, ex
+        logger.debug("deleting %s", names[index])
+        return True, operation.result()
+
+    def _get_message(error):
+        return str(getattr(error, 'message', None) or error or type(error).__name__)
+
+    def _get_blockers(index, error):
+        message = _get_message(error).lower()
+        return set(i for i, name in enumerate(names)
+                   if i != index and i not in deleted and name.lower() in message and '/' in name)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(to_be_deleted), max_parallel))) as executor:
+        in_flight = {}
+
+        def _submit(index):
+            errors.pop(index, None)
+            submitted_at[index] = state['completions']
+            in_flight[executor.submit(_delete, index)] = index
+
+        for index in range(len(to_be_deleted)):
+            _submit(index)
+
+        while in_flight:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            finished = []
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    requested, value = future.result()
+                except Exception as ex:  # pylint: disable=broad-except
+                    # the deletion was accepted but did not complete
+                    errors[index] = ex
+                    continue
+                if requested:
+                    results[index] = value
+                    deleted.add(index)
+                    finished.append(index)
+                    state['completions'] += 1
+                    continue
+                errors[index] = value
+                blockers = _get_blockers(index, value)
+                if not blockers and state['completions'] > submitted_at[index]:
+                    # something was deleted while this request was in flight, retry right away
+                    _submit(index)
+                else:
+                    waiting[index] = blockers
+
+            for index, blockers in list(waiting.items()):
+                if finished and (not blockers or blockers.intersection(finished)):
+                    del waiting[index]
+                    _submit(index)
+
+    if errors:
+        error_msg_builder = ['Some resources failed to be deleted ({} of {} deleted):'.format(len(deleted),
+                                                                                              len(to_be_deleted))]
+        for index in sorted(errors):
+            logger.debug(errors[index])
+            error_msg_builder.append('{}: {}'.format(names[index], _get_message(errors[index]).splitlines()[0]))
         raise CLIError(os.linesep.join(error_msg_builder))
 
-    return _single_or_collection(results)
+    return [results[index] for index in sorted(deleted)]
 
 
 # pylint: unused-argument
@@ -1625,11 +1697,11 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
         self.rcf = rcf or _resource_client_factory(cli_ctx)
         if api_version is None:
             if resource_id:
-                api_version = _ResourceUtils._resolve_api_version_by_id(self.rcf, resource_id)
+                api_version = _ResourceUtils._resolve_api_version_by_id(cli_ctx, self.rcf, resource_id)
             else:
                 _validate_resource_inputs(resource_group_name, resource_provider_namespace,
                                           resource_type, resource_name)
-                api_version = _ResourceUtils.resolve_api_version(self.rcf,
+                api_version = _ResourceUtils.resolve_api_version(cli_ctx, self.rcf,
                                                                  resource_provider_namespace,
                                                                  parent_resource_path,
                                                                  resource_type)
@@ -1797,26 +1869,12 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
                                     self.rcf.resources.config.long_running_operation_timeout)
 
     @staticmethod
-    def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type):
-        provider = rcf.providers.get(resource_provider_namespace)
-
-        # If available, we will use parent resource's api-version
-        resource_type_str = (parent_resource_path.split('/')[0] if parent_resource_path else resource_type)
-
-        rt = [t for t in provider.resource_types
-              if t.resource_type.lower() == resource_type_str.lower()]
-        if not rt:
-            raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
-        if len(rt) == 1 and rt[0].api_versions:
-            npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-            return npv[0] if npv else rt[0].api_versions[0]
-        else:
-            raise IncorrectUsageError(
-                'API version is required and could not be resolved for resource {}'
-                .format(resource_type))
+    def resolve_api_version(cli_ctx, rcf, resource_provider_namespace, parent_resource_path, resource_type):
+        from azure.cli.core.commands.arm import resolve_api_version
+        return resolve_api_version(cli_ctx, rcf, resource_provider_namespace, resource_type, parent_resource_path)
 
     @staticmethod
-    def _resolve_api_version_by_id(rcf, resource_id):
+    def _resolve_api_version_by_id(cli_ctx, rcf, resource_id):
         parts = parse_resource_id(resource_id)
         namespace = parts.get('child_namespace_1', parts['namespace'])
         if parts.get('child_type_2'):
@@ -1835,4 +1893,4 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
             parent = None
             resource_type = parts['type']
 
-        return _ResourceUtils.resolve_api_version(rcf, namespace, parent, resource_type)
+        return _ResourceUtils.resolve_api_version(cli_ctx, rcf, namespace, parent, resource_type)
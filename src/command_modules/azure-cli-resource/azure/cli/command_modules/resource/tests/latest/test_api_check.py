@@ -3,6 +3,8 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import shutil
+import tempfile
 import unittest
 
 try:
@@ -25,10 +27,19 @@ class TestApiCheck(unittest.TestCase):
         pass
 
     def setUp(self):
-        pass
+        # keep the provider cache out of the user's config dir
+        self.config_dir = tempfile.mkdtemp()
 
     def tearDown(self):
-        pass
+        from azure.cli.core._session import PROVIDER_CACHE
+        PROVIDER_CACHE.flush()
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    def _get_test_cli(self):
+        from azure.cli.core.mock import DummyCli
+        cli = DummyCli()
+        cli.config.config_dir = self.config_dir
+        return cli
 
     def test_parse_resource(self):
         parts = parse_resource_id('/subscriptions/00000/resourcegroups/bocconitestlabrg138089/'
@@ -51,8 +62,7 @@ class TestApiCheck(unittest.TestCase):
 
     def test_resolve_api_provider_backup(self):
         # Verifies provider is used as backup if api-version not specified.
-        from azure.cli.core.mock import DummyCli
-        cli = DummyCli()
+        cli = self._get_test_cli()
         rcf = self._get_mock_client()
         res_utils = _ResourceUtils(cli, resource_type='Mock/test', resource_name='vnet1',
                                    resource_group_name='rg', rcf=rcf)
@@ -60,8 +70,7 @@ class TestApiCheck(unittest.TestCase):
 
     def test_resolve_api_provider_with_parent_backup(self):
         # Verifies provider (with parent) is used as backup if api-version not specified.
-        from azure.cli.core.mock import DummyCli
-        cli = DummyCli()
+        cli = self._get_test_cli()
         rcf = self._get_mock_client()
         res_utils = _ResourceUtils(cli, parent_resource_path='foo/testfoo123', resource_group_name='rg',
                                    resource_provider_namespace='Mock', resource_type='test',
@@ -71,15 +80,31 @@ class TestApiCheck(unittest.TestCase):
 
     def test_resolve_api_all_previews(self):
         # Verifies most recent preview version returned only if there are no non-preview versions.
-        from azure.cli.core.mock import DummyCli
-        cli = DummyCli()
+        cli = self._get_test_cli()
         rcf = self._get_mock_client()
         res_utils = _ResourceUtils(cli, resource_type='Mock/preview', resource_name='vnet1',
                                    resource_group_name='rg', rcf=rcf)
         self.assertEqual(res_utils.api_version, "2005-01-01-preview")
 
+    def test_resolve_api_provider_cached(self):
+        # Verifies the provider is retrieved once per subscription and reused until the cache is cleared.
+        from azure.cli.core.commands.arm import clear_provider_cache
+        cli = self._get_test_cli()
+        rcf = self._get_mock_client()
+        for resource_type in ['Mock/test', 'Mock/preview']:
+            _ResourceUtils(cli, resource_type=resource_type, resource_name='vnet1', resource_group_name='rg',
+                           rcf=rcf)
+        self.assertEqual(rcf.providers.get.call_count, 1)
+
+        clear_provider_cache(cli)
+        res_utils = _ResourceUtils(cli, resource_type='Mock/test', resource_name='vnet1',
+                                   resource_group_name='rg', rcf=rcf)
+        self.assertEqual(res_utils.api_version, "2016-01-01")
+        self.assertEqual(rcf.providers.get.call_count, 2)
+
     def _get_mock_client(self):
         client = MagicMock()
+        client.config.subscription_id = '00000000-0000-0000-0000-000000000000'
         provider = MagicMock()
         provider.resource_types = [
             self._get_mock_resource_type('skip', ['2000-01-01-preview', '2000-01-01']),
@@ -18,7 +18,7 @@ except ImportError:
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 from azure.cli.command_modules.resource.custom import \
     (_get_missing_parameters, _extract_lock_params, _process_parameters, _find_missing_parameters,
-     _prompt_for_parameters, _load_file_string_or_uri)
+     _prompt_for_parameters, _load_file_string_or_uri, _delete_resources)
 
 
 def _simulate_no_tty():
@@ -305,6 +305,43 @@ class TestCustom(unittest.TestCase):
         results = _prompt_for_parameters(dict(missing_parameters), fail_on_no_tty=False)
         self.assertTrue(str(list(results.keys())) in param_alpha_order)
 
+    def test_delete_resources_retries_dependents_after_blocker(self):
+        from msrestazure.azure_exceptions import CloudError
+        prefix = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/'
+        vnet_id = prefix + 'virtualNetworks/vnet1'
+        nic_id = prefix + 'networkInterfaces/nic1'
+        pip_id = prefix + 'publicIPAddresses/pip1'
+        calls = []
+
+        def _utils(rid, blocked_by=None):
+            rsrc_utils = mock.MagicMock()
+
+            def _delete():
+                calls.append(rid)
+                if blocked_by and blocked_by not in calls:
+                    response = mock.MagicMock(status_code=400, reason='Bad Request')
+                    raise CloudError(response, error='Resource {} is in use by {}'.format(rid, blocked_by))
+                return mock.MagicMock(**{'result.return_value': rid})
+
+            rsrc_utils.delete.side_effect = _delete
+            return rsrc_utils, dict(subscription='sub1', resource_group='rg1', namespace='Microsoft.Network',
+                                    type=rid.split('/')[-2], name=rid.split('/')[-1])
+
+        result = _delete_resources([_utils(vnet_id, blocked_by=nic_id), _utils(nic_id), _utils(pip_id)])
+
+        self.assertEqual(result, [vnet_id, nic_id, pip_id])
+        self.assertEqual(calls.count(vnet_id), 2)
+
+        # deletions are not run concurrently when resource.delete_max_parallel is 1
+        del calls[:]
+        result = _delete_resources([_utils(vnet_id, blocked_by=nic_id), _utils(nic_id), _utils(pip_id)],
+                                   max_parallel=1)
+        self.assertEqual(result, [vnet_id, nic_id, pip_id])
+        self.assertEqual(calls, [vnet_id, nic_id, pip_id, vnet_id])
+
+        with self.assertRaisesRegexp(CLIError, r'\(1 of 2 deleted\):.*\n.*virtualNetworks/vnet1: .*in use'):
+            _delete_resources([_utils(vnet_id, blocked_by=prefix + 'networkInterfaces/nic2'), _utils(pip_id)])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -179,6 +179,20 @@ helps['role assignment list'] = """
     short-summary: List role assignments.
     long-summary: By default, only assignments scoped to subscription will be displayed. To view assignments scoped by resource or group, use `--all`.
 """
+helps['role assignment export'] = """
+    type: command
+    short-summary: Export the role assignments of a subscription.
+    long-summary: >
+        All the assignments of the subscription are retrieved with a single request, the scopes, assignee and role
+        are then matched locally. Principal and role names are resolved in bulk.
+    examples:
+        - name: Export all the role assignments of the subscription to a JSON lines file.
+          text: az role assignment export -f assignments.jsonl
+        - name: Show the assignments which apply to two resource groups, including those inherited from the subscription.
+          text: |
+            az role assignment export --include-inherited -o table --scopes \\
+                /subscriptions/{SubID}/resourceGroups/{ResourceGroup1} /subscriptions/{SubID}/resourceGroups/{ResourceGroup2}
+"""
 helps['role assignment list-changelogs'] = """
     type: command
     short-summary: List changelogs for role assignments.
@@ -118,6 +118,11 @@ def load_arguments(self, _):
         c.argument('ids', nargs='+', help='space-separated role assignment ids')
         c.argument('include_classic_administrators', arg_type=get_three_state_flag(), help='list default role assignments for subscription classic administrators, aka co-admins')
 
+    with self.argument_context('role assignment export') as c:
+        c.argument('scopes', nargs='+', help='space-separated scopes to export the assignments of. Defaults to all the assignments of the subscription')
+        c.argument('include_inherited', action='store_true', help='include assignments applied on the parent scopes of --scopes')
+        c.argument('output_file', options_list=['--file', '-f'], help='write the assignments to this file as JSON lines, one assignment per line')
+
     time_help = ('The {} of the query in the format of %Y-%m-%dT%H:%M:%SZ, e.g. 2000-12-31T12:59:59Z. Defaults to {}')
     with self.argument_context('role assignment list-changelogs') as c:
         c.argument('start_time', help=time_help.format('start time', '1 Hour prior to the current time'))
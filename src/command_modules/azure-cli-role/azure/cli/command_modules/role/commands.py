@@ -77,6 +77,7 @@ def load_command_table(self, _):
         g.custom_command('list', 'list_role_assignments', table_transformer=transform_assignment_list)
         g.custom_command('create', 'create_role_assignment')
         g.custom_command('list-changelogs', 'list_role_assignment_change_logs')
+        g.custom_command('export', 'export_role_assignments', table_transformer=transform_assignment_list)
 
     with self.command_group('ad app', client_factory=get_graph_client_applications, resource_type=PROFILE_TYPE,
                             exception_handler=graph_err_handler) as g:
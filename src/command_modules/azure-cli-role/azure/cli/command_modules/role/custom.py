@@ -20,6 +20,8 @@ from msrest.serialization import TZ_UTC
 from msrestazure.azure_exceptions import CloudError
 from azure.graphrbac.models.graph_error import GraphErrorException
 
+from azure.cli.core.commands.graph import (get_displayable_name, resolve_object_id, resolve_principal_names,
+                                           resolve_role_definition_names)
 from azure.cli.core.util import get_file_json, shell_safe_json_parse
 
 from azure.graphrbac.models import (ApplicationCreateParameters, ApplicationUpdateParameters, PasswordCredential,
@@ -228,7 +230,7 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
 
     assignments = _search_role_assignments(cmd.cli_ctx, assignments_client, definitions_client,
                                            scope, assignee, role,
-                                           include_inherited, include_groups)
+                                           include_inherited, include_groups, use_cache=True)
 
     results = todict(assignments) if assignments else []
     if include_classic_administrators:
@@ -240,9 +242,10 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
     # 1. fill in logic names to get things understandable.
     # (it's possible that associated roles and principals were deleted, and we just do nothing.)
     # 2. fill in role names
-    role_defs = list(definitions_client.list(
-        scope=scope or ('/subscriptions/' + definitions_client.config.subscription_id)))
-    role_dics = {i.id: _get_role_property(i, 'role_name') for i in role_defs}
+    role_dics = resolve_role_definition_names(
+        cmd.cli_ctx, graph_client.config.tenant_id, definitions_client,
+        scope or ('/subscriptions/' + definitions_client.config.subscription_id),
+        [_get_role_property(i, 'roleDefinitionId') for i in results if not i.get('roleDefinitionName')])
     for i in results:
         if not i.get('roleDefinitionName'):
             if role_dics.get(_get_role_property(i, 'roleDefinitionId')):
@@ -255,8 +258,7 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
 
     if principal_ids:
         try:
-            principals = _get_object_stubs(graph_client, principal_ids)
-            principal_dics = {i.object_id: _get_displayable_name(i) for i in principals}
+            principal_dics = resolve_principal_names(cmd.cli_ctx, graph_client, principal_ids)
 
             for i in [r for r in results if not r.get('principalName')]:
                 i['principalName'] = ''
@@ -272,6 +274,107 @@ def list_role_assignments(cmd, assignee=None, role=None, resource_group_name=Non
     return results
 
 
+class _RoleAssignmentScopeIndex(object):
+    """ A prefix tree of role assignments keyed by the segments of their scopes.
+
+    Assignments at the root or at management group scopes apply to the whole subscription, so they are kept at the
+    root of the tree.
+    """
+
+    def __init__(self, assignments=None):
+        self._root = self._new_node()
+        for assignment in assignments or []:
+            self.add(assignment)
+
+    @staticmethod
+    def _new_node():
+        return {'children': {}, 'assignments': []}
+
+    @staticmethod
+    def _split_scope(scope):
+        scope = scope.lower()
+        if not scope.startswith('/subscriptions/'):
+            return []
+        return [s for s in scope.split('/') if s]
+
+    def add(self, assignment):
+        node = self._root
+        for segment in self._split_scope(_get_role_property(assignment, 'scope')):
+            node = node['children'].setdefault(segment, self._new_node())
+        node['assignments'].append(assignment)
+
+    def find(self, scope, include_inherited=False):
+        """ Returns the assignments at `scope`, preceded by those at its parent scopes when `include_inherited`. """
+        node, result = self._root, []
+        for segment in self._split_scope(scope):
+            if include_inherited:
+                result += node['assignments']
+            node = node['children'].get(segment)
+            if node is None:
+                return result
+        return result + node['assignments']
+
+
+def export_role_assignments(cmd, scopes=None, assignee=None, role=None, include_inherited=False,
+                            output_file=None):
+    """
+    :param scopes: only export the assignments at these scopes.
+    :param include_inherited: with `scopes`, also export the assignments applied on their parent scopes.
+    :param output_file: write the assignments as JSON lines to this file instead of returning them.
+    """
+    graph_client = _graph_client_factory(cmd.cli_ctx)
+    factory = _auth_client_factory(cmd.cli_ctx)
+    assignments_client = factory.role_assignments
+    definitions_client = factory.role_definitions
+    subscription_scope = '/subscriptions/' + definitions_client.config.subscription_id
+
+    if include_inherited and not scopes:
+        raise CLIError('usage error: --include-inherited requires --scopes')
+
+    # a single request for all the assignments of the subscription, the queries are answered by the index
+    assignments = [todict(a) for a in assignments_client.list()]
+    if scopes:
+        index = _RoleAssignmentScopeIndex(assignments)
+        found, assignments = set(), []
+        for scope in scopes:
+            for a in index.find(scope, include_inherited):
+                if a['id'] not in found:
+                    found.add(a['id'])
+                    assignments.append(a)
+
+    if assignee:
+        assignee_object_id = _resolve_object_id(cmd.cli_ctx, assignee, fallback_to_object_id=True, use_cache=True)
+        assignments = [a for a in assignments if _get_role_property(a, 'principalId') == assignee_object_id]
+    if role:
+        role_id = _resolve_role_id(role, subscription_scope, definitions_client).lower()
+        assignments = [a for a in assignments if _get_role_property(a, 'roleDefinitionId').lower() == role_id]
+
+    role_dics = resolve_role_definition_names(cmd.cli_ctx, graph_client.config.tenant_id, definitions_client,
+                                              subscription_scope,
+                                              [_get_role_property(a, 'roleDefinitionId') for a in assignments])
+    principal_dics = {}
+    principal_ids = set(_get_role_property(a, 'principalId') for a in assignments)
+    if principal_ids:
+        try:
+            principal_dics = resolve_principal_names(cmd.cli_ctx, graph_client, principal_ids)
+        except (CloudError, GraphErrorException) as ex:
+            # failure on resolving principal due to graph permission should not fail the whole thing
+            logger.info("Failed to resolve graph object information per error '%s'", ex)
+
+    for a in assignments:
+        _set_role_property(a, 'roleDefinitionName', role_dics.get(_get_role_property(a, 'roleDefinitionId')))
+        _set_role_property(a, 'principalName', principal_dics.get(_get_role_property(a, 'principalId'), ''))
+        if not a.get('additionalProperties'):  # remove the useless "additionalProperties"
+            a.pop('additionalProperties', None)
+
+    if not output_file:
+        return assignments
+    with open(output_file, 'w') as f:
+        for a in assignments:
+            f.write(json.dumps(a) + '\n')
+    return None
+
+
 def _get_assignment_events(cli_ctx, start_time=None, end_time=None):
     from azure.mgmt.monitor import MonitorManagementClient
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
@@ -376,8 +479,7 @@ def list_role_assignment_change_logs(cmd, start_time=None, end_time=None):
     principal_ids = set([x['principalId'] for x in result if x['principalId']])
     if principal_ids:
         graph_client = _graph_client_factory(cmd.cli_ctx)
-        stubs = _get_object_stubs(graph_client, principal_ids)
-        principal_dics = {i.object_id: _get_displayable_name(i) for i in stubs}
+        principal_dics = resolve_principal_names(cmd.cli_ctx, graph_client, principal_ids)
         if principal_dics:
             for e in result:
                 e['principalName'] = principal_dics.get(e['principalId'], None)
@@ -414,7 +516,7 @@ def _backfill_assignments_for_co_admins(cli_ctx, auth_client, assignee=None):
                 result = _get_object_stubs(graph_client, [assignee])
                 if not result:
                     return []
-                assignee = _get_displayable_name(result[0]).lower()
+                assignee = get_displayable_name(result[0]).lower()
             except ValueError:
                 pass
         co_admins = [x for x in co_admins if assignee == _get_role_property(x, 'email_address').lower()]
@@ -444,14 +546,6 @@ def _backfill_assignments_for_co_admins(cli_ctx, auth_client, assignee=None):
     return result
 
 
-def _get_displayable_name(graph_object):
-    if graph_object.user_principal_name:
-        return graph_object.user_principal_name
-    elif graph_object.service_principal_names:
-        return graph_object.service_principal_names[0]
-    return graph_object.display_name or ''
-
-
 def delete_role_assignments(cmd, ids=None, assignee=None, role=None,
                             resource_group_name=None, scope=None, include_inherited=False):
     factory = _auth_client_factory(cmd.cli_ctx, scope)
@@ -479,10 +573,10 @@ def delete_role_assignments(cmd, ids=None, assignee=None, role=None,
 
 
 def _search_role_assignments(cli_ctx, assignments_client, definitions_client,
-                             scope, assignee, role, include_inherited, include_groups):
+                             scope, assignee, role, include_inherited, include_groups, use_cache=False):
     assignee_object_id = None
     if assignee:
-        assignee_object_id = _resolve_object_id(cli_ctx, assignee, fallback_to_object_id=True)
+        assignee_object_id = _resolve_object_id(cli_ctx, assignee, fallback_to_object_id=True, use_cache=use_cache)
 
     # combining filters is unsupported, so we pick the best, and do limited maunal filtering
     if assignee_object_id:
@@ -1301,23 +1395,10 @@ def reset_service_principal_credential(cmd, name, password=None, create_cert=Fal
     return result
 
 
-def _resolve_object_id(cli_ctx, assignee, fallback_to_object_id=False):
+def _resolve_object_id(cli_ctx, assignee, fallback_to_object_id=False, use_cache=False):
     client = _graph_client_factory(cli_ctx)
-    result = None
     try:
-        if assignee.find('@') >= 0:  # looks like a user principal name
-            result = list(client.users.list(filter="userPrincipalName eq '{}'".format(assignee)))
-        if not result:
-            result = list(client.service_principals.list(
-                filter="servicePrincipalNames/any(c:c eq '{}')".format(assignee)))
-        if not result:  # assume an object id, let us verify it
-            result = _get_object_stubs(client, [assignee])
-
-        # 2+ matches should never happen, so we only check 'no match' here
-        if not result:
-            raise CLIError("No matches in graph database for '{}'".format(assignee))
-
-        return result[0].object_id
+        return resolve_object_id(cli_ctx, client, assignee, use_cache=use_cache)
     except (CloudError, GraphErrorException):
         if fallback_to_object_id and _is_guid(assignee):
             return assignee
@@ -2,10 +2,17 @@
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
+import json
+import os
+import shutil
+import tempfile
 import unittest
 import mock
 
-from azure.cli.command_modules.role.custom import _resolve_role_id
+from knack.util import CLIError
+
+from azure.cli.command_modules.role.custom import (_resolve_role_id, list_role_assignments, export_role_assignments,
+                                                   delete_role_assignments)
 
 # pylint: disable=line-too-long
 
@@ -26,3 +33,163 @@ class TestRoleCustomCommands(unittest.TestCase):
         # action (using a full id)
         test_full_id = '/subscriptions/0b1f6471-1bf0-4dda-aec3-cb9272123456/providers/microsoft.authorization/roleDefinitions/5370bbf4-6b73-4417-969b-8f2e6e123456'
         self.assertEqual(test_full_id, _resolve_role_id(test_full_id, 'foobar', mock_client))
+
+    @mock.patch('azure.cli.command_modules.role.custom._graph_client_factory', autospec=True)
+    @mock.patch('azure.cli.command_modules.role.custom._auth_client_factory', autospec=True)
+    def test_list_role_assignments_cached(self, auth_client_factory, graph_client_factory):
+        from azure.cli.core._session import GRAPH_CACHE
+        from azure.mgmt.authorization.models import RoleAssignment, RoleDefinition
+        from azure.graphrbac.models import User, ServicePrincipal
+
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir, ignore_errors=True)
+        self.addCleanup(GRAPH_CACHE.flush)
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.cloud.name = 'AzureCloud'
+        cmd.cli_ctx.config.config_dir = config_dir
+        cmd.cli_ctx.config.getint.return_value = 60 * 60
+
+        sub_scope = '/subscriptions/123'
+        reader_id = sub_scope + '/providers/Microsoft.Authorization/roleDefinitions/reader'
+        factory = auth_client_factory.return_value
+        factory.role_definitions.config.subscription_id = '123'
+        reader = RoleDefinition(role_name='Reader')
+        reader.id = reader_id
+        factory.role_definitions.list.return_value = [reader]
+
+        graph_client = graph_client_factory.return_value
+        graph_client.config.tenant_id = 'tenant1'
+        user, sp = User(user_principal_name='admin@contoso.com'), ServicePrincipal(service_principal_names=['http://app'])
+        user.object_id, sp.object_id = 'user1', 'sp1'
+        graph_client.objects.get_objects_by_object_ids.side_effect = \
+            lambda params: [o for o in [user, sp] if o.object_id in params.object_ids]
+
+        def _assignments(*principal_ids):
+            return [RoleAssignment(scope=sub_scope + '/resourceGroups/rg', role_definition_id=reader_id,
+                                   principal_id=i) for i in principal_ids]
+
+        factory.role_assignments.list_for_scope.return_value = _assignments('user1')
+        result = list_role_assignments(cmd, resource_group_name='rg')
+        self.assertEqual([(r['principalName'], r['roleDefinitionName']) for r in result],
+                         [('admin@contoso.com', 'Reader')])
+
+        # only the principals missing from the cache are looked up, the role definitions are not listed again
+        factory.role_assignments.list_for_scope.return_value = _assignments('user1', 'sp1', 'deleted')
+        result = list_role_assignments(cmd, resource_group_name='rg')
+        self.assertEqual([(r['principalName'], r['roleDefinitionName']) for r in result],
+                         [('admin@contoso.com', 'Reader'), ('http://app', 'Reader'), ('', 'Reader')])
+        self.assertEqual(factory.role_definitions.list.call_count, 1)
+        self.assertEqual(graph_client.objects.get_objects_by_object_ids.call_count, 2)
+        self.assertEqual(sorted(graph_client.objects.get_objects_by_object_ids.call_args[0][0].object_ids),
+                         ['deleted', 'sp1'])
+
+        # the cache is disabled by a zero TTL
+        cmd.cli_ctx.config.getint.return_value = 0
+        list_role_assignments(cmd, resource_group_name='rg')
+        self.assertEqual(factory.role_definitions.list.call_count, 2)
+        self.assertEqual(graph_client.objects.get_objects_by_object_ids.call_count, 3)
+
+    @mock.patch('azure.cli.command_modules.role.custom._graph_client_factory', autospec=True)
+    @mock.patch('azure.cli.command_modules.role.custom._auth_client_factory', autospec=True)
+    def test_role_assignments_assignee_cached_for_reads(self, auth_client_factory, graph_client_factory):
+        from azure.cli.core._session import GRAPH_CACHE
+        from azure.mgmt.authorization.models import RoleAssignment
+        from azure.graphrbac.models import User
+
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir, ignore_errors=True)
+        self.addCleanup(GRAPH_CACHE.flush)
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.cloud.name = 'AzureCloud'
+        cmd.cli_ctx.config.config_dir = config_dir
+        cmd.cli_ctx.config.getint.return_value = 60 * 60
+
+        sub_scope = '/subscriptions/123'
+        factory = auth_client_factory.return_value
+        factory.role_definitions.config.subscription_id = '123'
+        factory.role_assignments.config.subscription_id = '123'
+        graph_client = graph_client_factory.return_value
+        graph_client.config.tenant_id = 'tenant1'
+        user = User(user_principal_name='admin@contoso.com')
+        user.object_id = 'user1'
+        graph_client.users.list.return_value = [user]
+        graph_client.objects.get_objects_by_object_ids.return_value = [user]
+
+        assignment = RoleAssignment(scope=sub_scope + '/resourceGroups/rg', principal_id='user1')
+        assignment.id = 'assignment1'
+        factory.role_assignments.list.return_value = [assignment]
+        for _ in range(2):
+            list_role_assignments(cmd, assignee='admin@contoso.com', resource_group_name='rg')
+        self.assertEqual(graph_client.users.list.call_count, 1)
+
+        # the name has been given to another user since it was cached, the assignments to delete are looked up live
+        reassigned = User(user_principal_name='admin@contoso.com')
+        reassigned.object_id = 'user2'
+        graph_client.users.list.return_value = [reassigned]
+        delete_role_assignments(cmd, assignee='admin@contoso.com', resource_group_name='rg')
+        self.assertEqual(graph_client.users.list.call_count, 2)
+        factory.role_assignments.list.assert_called_with(filter="principalId eq 'user2'")
+
+    @mock.patch('azure.cli.command_modules.role.custom._graph_client_factory', autospec=True)
+    @mock.patch('azure.cli.command_modules.role.custom._auth_client_factory', autospec=True)
+    def test_export_role_assignments(self, auth_client_factory, graph_client_factory):
+        from azure.cli.core._session import GRAPH_CACHE
+        from azure.mgmt.authorization.models import RoleAssignment, RoleDefinition
+        from azure.graphrbac.models import User
+
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir, ignore_errors=True)
+        self.addCleanup(GRAPH_CACHE.flush)
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.cloud.name = 'AzureCloud'
+        cmd.cli_ctx.config.config_dir = config_dir
+        cmd.cli_ctx.config.getint.return_value = 0
+
+        sub_scope = '/subscriptions/123'
+        reader_id = sub_scope + '/providers/Microsoft.Authorization/roleDefinitions/reader'
+        factory = auth_client_factory.return_value
+        factory.role_definitions.config.subscription_id = '123'
+        reader = RoleDefinition(role_name='Reader')
+        reader.id = reader_id
+        factory.role_definitions.list.return_value = [reader]
+
+        graph_client = graph_client_factory.return_value
+        graph_client.config.tenant_id = 'tenant1'
+        user1, user2 = User(user_principal_name='admin@contoso.com'), User(user_principal_name='ops@contoso.com')
+        user1.object_id, user2.object_id = 'user1', 'user2'
+        graph_client.objects.get_objects_by_object_ids.side_effect = \
+            lambda params: [o for o in [user1, user2] if o.object_id in params.object_ids]
+
+        assignments = []
+        for name, scope, principal_id in [('mg', '/providers/Microsoft.Management/managementGroups/mg1', 'user1'),
+                                          ('sub', sub_scope, 'user2'),
+                                          ('rg', sub_scope + '/resourceGroups/RG', 'user1'),
+                                          ('rg2', sub_scope + '/resourceGroups/rg2', 'user1'),
+                                          ('vm', sub_scope + '/resourceGroups/rg/providers/Microsoft.Compute/virtualMachines/vm', 'user2')]:
+            assignment = RoleAssignment(scope=scope, role_definition_id=reader_id, principal_id=principal_id)
+            assignment.id = name
+            assignments.append(assignment)
+        factory.role_assignments.list.return_value = assignments
+
+        def _export(**kwargs):
+            return [a['id'] for a in export_role_assignments(cmd, **kwargs)]
+
+        self.assertEqual(_export(), ['mg', 'sub', 'rg', 'rg2', 'vm'])
+        self.assertEqual(_export(scopes=[sub_scope + '/resourceGroups/rg']), ['rg'])
+        self.assertEqual(_export(scopes=[sub_scope + '/resourceGroups/rg', sub_scope + '/resourceGroups/missing'],
+                                 include_inherited=True), ['mg', 'sub', 'rg'])
+        self.assertEqual(_export(scopes=[sub_scope + '/resourceGroups/rg'], include_inherited=True, assignee='user2'),
+                         ['sub'])
+        # all the assignments were retrieved with a single request for each export
+        self.assertEqual(factory.role_assignments.list.call_count, 4)
+        factory.role_assignments.list_for_scope.assert_not_called()
+
+        with self.assertRaises(CLIError):
+            export_role_assignments(cmd, include_inherited=True)
+
+        output_file = os.path.join(config_dir, 'assignments.jsonl')
+        self.assertIsNone(export_role_assignments(cmd, scopes=[sub_scope + '/resourceGroups/rg2'], output_file=output_file))
+        with open(output_file) as f:
+            lines = [json.loads(l) for l in f]
+        self.assertEqual([(l['id'], l['principalName'], l['roleDefinitionName']) for l in lines],
+                         [('rg2', 'admin@contoso.com', 'Reader')])
@@ -53,6 +53,7 @@ helps['sql db list-editions'] = """
     type: command
     short-summary: Show database editions available for the currently active subscription.
     long-summary: Includes available service objectives and storage limits. In order to reduce verbosity, settings to intentionally reduce storage limits are hidden by default.
+                  The capabilities of a location are cached for a day, which can be configured with the `capabilities_cache_ttl` setting of the `sql` section in `az configure` (0 disables the cache).
     examples:
         - name: Show all database editions in a location.
           text: az sql db list-editions -l westus
@@ -60,6 +61,8 @@ helps['sql db list-editions'] = """
           text: az sql db list-editions -l westus --edition Standard
         - name: Show available max database sizes for P1 service objective
           text: az sql db list-editions -l westus --service-objective P1 --show-details max-size
+        - name: Show all database editions in a location, ignoring the cached capabilities.
+          text: az sql db list-editions -l westus --refresh
     """
 helps['sql db rename'] = """
     type: command
@@ -291,7 +294,8 @@ helps['sql elastic-pool list-editions'] = """
     short-summary: List elastic pool editions available for the active subscription.
     long-summary: Also includes available pool DTU settings, storage limits, and per database
                   settings. In order to reduce verbosity, additional storage limits and per
-                  database settings are hidden by default.
+                  database settings are hidden by default. The capabilities of a region are cached
+                  like those of `az sql db list-editions`.
     examples:
         - name: Show all elastic pool editions and pool DTU limits in the West US region.
           text: az sql elastic-pool list-editions -l westus
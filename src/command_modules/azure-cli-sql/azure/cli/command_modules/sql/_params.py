@@ -116,6 +116,10 @@ available_param_type = CLIArgumentType(
     options_list=['--available', '-a'],
     help='If specified, show only results that are available in the specified region.')
 
+refresh_capabilities_param_type = CLIArgumentType(
+    options_list=['--refresh'],
+    help='If specified, get the capabilities of the region from the service instead of the local cache.')
+
 tier_param_type = CLIArgumentType(
     arg_group=sku_component_arg_group,
     options_list=['--tier', '--edition', '-e'])
@@ -405,6 +409,8 @@ def load_arguments(self, _):
 
         c.argument('available', arg_type=available_param_type)
 
+        c.argument('refresh', arg_type=refresh_capabilities_param_type)
+
         search_arg_group = 'Search'
 
         # We could used get_enum_type here, but that will validate the inputs which means there
@@ -786,6 +792,8 @@ def load_arguments(self, _):
         c.argument('available',
                    arg_type=available_param_type)
 
+        c.argument('refresh', arg_type=refresh_capabilities_param_type)
+
         search_arg_group = 'Search'
 
         # We could used 'arg_type=get_enum_type' here, but that will validate the inputs which means there
@@ -4,10 +4,14 @@
 # --------------------------------------------------------------------------------------------
 
 # pylint: disable=C0302
+import os
+import threading
+import time
 from enum import Enum
 
 from knack.log import get_logger
 
+from azure.cli.core._session import Session
 from azure.cli.core.util import (
     CLIError,
     sdk_no_wait,
@@ -24,6 +28,7 @@ from azure.mgmt.sql.models import (
     FailoverGroupReadOnlyEndpoint,
     FailoverGroupReadWriteEndpoint,
     IdentityType,
+    LocationCapabilities,
     PartnerInfo,
     PerformanceLevelUnit,
     ReplicationRole,
@@ -134,73 +139,164 @@ def _filter_available(capabilities):
     return [c for c in capabilities if is_available(c.status)]
 
 
-def _find_edition_capability(sku, supported_editions):
-    '''
-    Finds the DB edition capability in the collection of supported editions
-    that matches the requested sku.
+# CAPABILITIES_CACHE keeps the capabilities of the locations, so that skus can be resolved
+# without requesting them again
+CAPABILITIES_CACHE = Session()
+_CAPABILITIES_CACHE_FILE = 'sqlCapabilitiesCache.json'
+_CAPABILITIES_CACHE_TTL = 24 * 60 * 60
+_CAPABILITIES_CACHE_LOCK = threading.Lock()
+# Sku indexes of the location capabilities kept for the lifetime of the process, by cache key
+_SKU_INDEXES = {}
 
-    If the sku has no edition specified, returns the default edition.
 
-    (Note: tier and edition mean the same thing.)
-    '''
+def _load_capabilities_cache(cli_ctx):
+    cache_file = os.path.join(cli_ctx.config.config_dir, _CAPABILITIES_CACHE_FILE)
+    if CAPABILITIES_CACHE.filename != cache_file:
+        CAPABILITIES_CACHE.load(cache_file)
+    return CAPABILITIES_CACHE
 
-    if sku.tier:
-        # Find requested edition capability
-        try:
-            return next(e for e in supported_editions if e.name == sku.tier)
-        except StopIteration:
-            candiate_tiers = [e.name for e in supported_editions]
-            raise CLIError('Could not find tier ''{}''. Supported tiers are: {}'.format(
-                sku.tier, candiate_tiers
-            ))
-    else:
-        # Find default edition capability
-        return _get_default_capability(supported_editions)
+
+def _get_capabilities_cache_ttl(cli_ctx):
+    return cli_ctx.config.getint('sql', 'capabilities_cache_ttl', fallback=_CAPABILITIES_CACHE_TTL)
+
+
+def _get_capabilities_cache_key(cli_ctx, location, capability_group):
+    # capabilities, such as the available editions, may differ between subscriptions
+    from azure.cli.core.commands.client_factory import get_subscription_id
+    return '{}/{}/{}/{}'.format(cli_ctx.cloud.name, get_subscription_id(cli_ctx), location.replace(' ', ''),
+                                getattr(capability_group, 'value', capability_group)).lower()
 
 
-def _find_family_capability(sku, supported_families):
+def _get_location_capabilities(cli_ctx, location, capability_group, client=None, refresh=False):
     '''
-    Finds the family capability in the collection of supported families
-    that matches the requested sku.
+    Gets the capabilities of a location, from the cache if they were requested
+    less than `sql.capabilities_cache_ttl` seconds ago (one day by default, 0
+    disables the cache).
 
-    If the edition has no family specified, returns the default family.
+    Returns the capabilities and whether they came from the cache. Every call
+    returns new capability objects, so that callers can filter them in place.
     '''
 
-    if sku.family:
-        # Find requested edition capability
-        try:
-            return next(e for e in supported_families if e.name == sku.family)
-        except StopIteration:
-            candidate_families = [e.name for e in supported_families]
-            raise CLIError('Could not find family ''{}''. Supported families are: {}'.format(
-                sku.family, candidate_families
-            ))
-    else:
-        # Find default family capability
-        return _get_default_capability(supported_families)
+    ttl = _get_capabilities_cache_ttl(cli_ctx)
+    key = _get_capabilities_cache_key(cli_ctx, location, capability_group)
+    now = time.time()
+
+    if ttl > 0 and not refresh:
+        with _CAPABILITIES_CACHE_LOCK:
+            entry = _load_capabilities_cache(cli_ctx).get(key)
+        if entry and entry['expiresAt'] > now:
+            logger.debug('Using cached capabilities of location %s', location)
+            return LocationCapabilities.deserialize(entry['value']), True
+
+    client = client or get_sql_capabilities_operations(cli_ctx, None)
+    capabilities = client.list_by_location(location, capability_group)
+    _SKU_INDEXES.pop(key, None)
+
+    if ttl > 0:
+        with _CAPABILITIES_CACHE_LOCK:
+            cache = _load_capabilities_cache(cli_ctx)
+            for expired in [k for k, v in cache.data.items() if v.get('expiresAt', 0) <= now]:
+                del cache[expired]
+            cache[key] = {'expiresAt': now + ttl, 'value': capabilities.serialize(keep_readonly=True)}
+    return capabilities, False
 
 
-def _find_performance_level_capability(sku, supported_service_level_objectives, allow_reset_family):
+class _SkuIndex(object):
     '''
-    Finds the DB or elastic pool performance level (i.e. service objective) in the
-    collection of supported service objectives that matches the requested sku's
-    family and capacity.
+    The editions of a server or managed instance version capability, indexed by
+    edition name, then family, then capacity, so that skus are resolved without
+    scanning the capabilities.
 
-    If the sku has no capacity or family specified, returns the default service
-    objective.
+    (Note: tier and edition mean the same thing.)
     '''
 
-    logger.debug('_find_performance_level_capability input: %s, allow_reset_family: %s', sku, allow_reset_family)
+    def __init__(self, supported_editions, children_attr):
+        self.supported_editions = supported_editions
+        self._children_attr = children_attr
+        self._editions = {}
+        self._families = {}
+        self._capacities = {}
+
+        for edition in supported_editions:
+            if edition.name in self._editions:
+                continue
+            self._editions[edition.name] = edition
+
+            # Families and capacities keep the position of the capability, so that the
+            # first matching capability is found like in the capabilities list.
+            families, capacities = {}, {}
+            for position, child in enumerate(getattr(edition, children_attr)):
+                families.setdefault(child.name, child)
+                # Managed instance families only have a sku name
+                if getattr(getattr(child, 'sku', None), 'capacity', None) is not None:
+                    capacities.setdefault(child.sku.family, {}).setdefault(
+                        int(child.sku.capacity), (position, child))
+            self._families[edition.name] = families
+            self._capacities[edition.name] = capacities
+
+    def find_edition(self, sku):
+        '''
+        Finds the edition capability that matches the requested sku.
+
+        If the sku has no edition specified, returns the default edition.
+        '''
+
+        if sku.tier:
+            # Find requested edition capability
+            try:
+                return self._editions[sku.tier]
+            except KeyError:
+                candiate_tiers = [e.name for e in self.supported_editions]
+                raise CLIError('Could not find tier ''{}''. Supported tiers are: {}'.format(
+                    sku.tier, candiate_tiers
+                ))
+        else:
+            # Find default edition capability
+            return _get_default_capability(self.supported_editions)
+
+    def find_family(self, edition, sku):
+        '''
+        Finds the family capability of the edition that matches the requested sku.
+
+        If the sku has no family specified, returns the default family.
+        '''
+
+        supported_families = getattr(edition, self._children_attr)
+        if sku.family:
+            # Find requested family capability
+            try:
+                return self._families[edition.name][sku.family]
+            except KeyError:
+                candidate_families = [e.name for e in supported_families]
+                raise CLIError('Could not find family ''{}''. Supported families are: {}'.format(
+                    sku.family, candidate_families
+                ))
+        else:
+            # Find default family capability
+            return _get_default_capability(supported_families)
+
+    def find_performance_level(self, edition, sku, allow_reset_family):
+        '''
+        Finds the DB or elastic pool performance level (i.e. service objective) of
+        the edition that matches the requested sku's family and capacity.
 
-    if sku.capacity:
-        try:
+        If the sku has no capacity or family specified, returns the default service
+        objective.
+        '''
+
+        logger.debug('_SkuIndex.find_performance_level input: %s, allow_reset_family: %s', sku, allow_reset_family)
+
+        supported_service_level_objectives = getattr(edition, self._children_attr)
+        if sku.capacity:
             # Find requested service objective based on capacity & family.
             # Note that for non-vcore editions, family is None.
-            return next(slo for slo in supported_service_level_objectives
-                        if ((slo.sku.family == sku.family) or
-                            (slo.sku.family is None and allow_reset_family)) and
-                        int(slo.sku.capacity) == int(sku.capacity))
-        except StopIteration:
+            capacities = self._capacities[edition.name]
+            families = [sku.family, None] if allow_reset_family else [sku.family]
+            matches = [capacities[f][int(sku.capacity)] for f in set(families)
+                       if int(sku.capacity) in capacities.get(f, {})]
+            if matches:
+                return min(matches, key=lambda m: m[0])[1]
+
             if allow_reset_family:
                 raise CLIError(
                     "Could not find sku in tier '{tier}' with capacity {capacity}."
@@ -221,12 +317,40 @@ def _find_performance_level_capability(sku, supported_service_level_objectives,
                         skus=[(slo.sku.family, slo.sku.capacity)
                               for slo in supported_service_level_objectives]
                     ))
-    elif sku.family:
-        # Error - cannot find based on family alone.
-        raise CLIError('If --family is specified, --capacity must also be specified.')
-    else:
-        # Find default service objective
-        return _get_default_capability(supported_service_level_objectives)
+        elif sku.family:
+            # Error - cannot find based on family alone.
+            raise CLIError('If --family is specified, --capacity must also be specified.')
+        else:
+            # Find default service objective
+            return _get_default_capability(supported_service_level_objectives)
+
+
+def _find_sku_capability(cli_ctx, location, capability_group, get_editions, children_attr, find):
+    '''
+    Finds the capability of a requested sku in the capabilities of a location.
+
+    The sku indexes are kept for the lifetime of the process, and the capabilities
+    are read from the cache when possible. If the sku is not found in cached
+    capabilities they are requested again, since they may be out of date.
+    '''
+
+    key = _get_capabilities_cache_key(cli_ctx, location, capability_group)
+    index, from_cache = _SKU_INDEXES.get(key, (None, True))
+    if index is None:
+        capabilities, from_cache = _get_location_capabilities(cli_ctx, location, capability_group)
+        index = _SkuIndex(get_editions(capabilities), children_attr)
+        _SKU_INDEXES[key] = index, from_cache
+
+    try:
+        return find(index)
+    except CLIError:
+        if not from_cache:
+            raise
+        logger.debug('Sku not found in cached capabilities of location %s, refreshing them', location)
+        capabilities, _ = _get_location_capabilities(cli_ctx, location, capability_group, refresh=True)
+        index = _SkuIndex(get_editions(capabilities), children_attr)
+        _SKU_INDEXES[key] = index, False
+        return find(index)
 
 
 def _db_elastic_pool_update_sku(
@@ -488,19 +612,18 @@ def _find_db_sku_from_capabilities(cli_ctx, location, sku, allow_reset_family=Fa
     # Some properties of sku are specified, but not name. Use the requested properties
     # to find a matching capability and copy the sku from there.
 
-    # Get default server version capability
-    capabilities_client = get_sql_capabilities_operations(cli_ctx, None)
-    capabilities = capabilities_client.list_by_location(location, CapabilityGroup.supported_editions)
-    server_version_capability = _get_default_server_version(capabilities)
+    def _find(index):
+        # Find edition capability, based on requested sku properties
+        edition_capability = index.find_edition(sku)
 
-    # Find edition capability, based on requested sku properties
-    edition_capability = _find_edition_capability(
-        sku, server_version_capability.supported_editions)
+        # Find performance level capability, based on requested sku properties
+        return index.find_performance_level(edition_capability, sku, allow_reset_family=allow_reset_family)
 
-    # Find performance level capability, based on requested sku properties
-    performance_level_capability = _find_performance_level_capability(
-        sku, edition_capability.supported_service_level_objectives,
-        allow_reset_family=allow_reset_family)
+    # Search the editions of the default server version capability
+    performance_level_capability = _find_sku_capability(
+        cli_ctx, location, CapabilityGroup.supported_editions,
+        lambda c: _get_default_server_version(c).supported_editions,
+        'supported_service_level_objectives', _find)
 
     # Ideally, we would return the sku object from capability (`return performance_level_capability.sku`).
     # However not all db create modes support using `capacity` to find slo, so instead we put
@@ -824,6 +947,7 @@ class DatabaseCapabilitiesAdditionalDetails(Enum):  # pylint: disable=too-few-pu
 
 
 def db_list_capabilities(
+        cmd,
         client,
         location,
         edition=None,
@@ -831,7 +955,8 @@ def db_list_capabilities(
         dtu=None,
         vcores=None,
         show_details=None,
-        available=False):
+        available=False,
+        refresh=False):
     '''
     Gets database capabilities and optionally applies the specified filters.
     '''
@@ -840,8 +965,9 @@ def db_list_capabilities(
     if not show_details:
         show_details = []
 
-    # Get capabilities tree from server
-    capabilities = client.list_by_location(location, CapabilityGroup.supported_editions)
+    # Get capabilities tree from server, or from the cache
+    capabilities, _ = _get_location_capabilities(
+        cmd.cli_ctx, location, CapabilityGroup.supported_editions, client=client, refresh=refresh)
 
     # Get subtree related to databases
     editions = _get_default_server_version(capabilities).supported_editions
@@ -1446,18 +1572,18 @@ def _find_elastic_pool_sku_from_capabilities(cli_ctx, location, sku, allow_reset
     # Some properties of sku are specified, but not name. Use the requested properties
     # to find a matching capability and copy the sku from there.
 
-    # Get default server version capability
-    capabilities_client = get_sql_capabilities_operations(cli_ctx, None)
-    capabilities = capabilities_client.list_by_location(location, CapabilityGroup.supported_elastic_pool_editions)
-    server_version_capability = _get_default_server_version(capabilities)
+    def _find(index):
+        # Find edition capability, based on requested sku properties
+        edition_capability = index.find_edition(sku)
 
-    # Find edition capability, based on requested sku properties
-    edition_capability = _find_edition_capability(sku, server_version_capability.supported_elastic_pool_editions)
+        # Find performance level capability, based on requested sku properties
+        return index.find_performance_level(edition_capability, sku, allow_reset_family=allow_reset_family)
 
-    # Find performance level capability, based on requested sku properties
-    performance_level_capability = _find_performance_level_capability(
-        sku, edition_capability.supported_elastic_pool_performance_levels,
-        allow_reset_family=allow_reset_family)
+    # Search the elastic pool editions of the default server version capability
+    performance_level_capability = _find_sku_capability(
+        cli_ctx, location, CapabilityGroup.supported_elastic_pool_editions,
+        lambda c: _get_default_server_version(c).supported_elastic_pool_editions,
+        'supported_elastic_pool_performance_levels', _find)
 
     # Copy sku object from capability
     result = performance_level_capability.sku
@@ -1554,13 +1680,15 @@ class ElasticPoolCapabilitiesAdditionalDetails(Enum):  # pylint: disable=too-few
 
 
 def elastic_pool_list_capabilities(
+        cmd,
         client,
         location,
         edition=None,
         dtu=None,
         vcores=None,
         show_details=None,
-        available=False):
+        available=False,
+        refresh=False):
     '''
     Gets elastic pool capabilities and optionally applies the specified filters.
     '''
@@ -1571,8 +1699,9 @@ def elastic_pool_list_capabilities(
     if dtu:
         dtu = int(dtu)
 
-    # Get capabilities tree from server
-    capabilities = client.list_by_location(location, CapabilityGroup.supported_elastic_pool_editions)
+    # Get capabilities tree from server, or from the cache
+    capabilities, _ = _get_location_capabilities(
+        cmd.cli_ctx, location, CapabilityGroup.supported_elastic_pool_editions, client=client, refresh=refresh)
 
     # Get subtree related to elastic pools
     editions = _get_default_server_version(capabilities).supported_elastic_pool_editions
@@ -1962,16 +2091,18 @@ def _find_managed_instance_sku_from_capabilities(cli_ctx, location, sku):
     # Some properties of sku are specified, but not name. Use the requested properties
     # to find a matching capability and copy the sku from there.
 
-    # Get default server version capability
-    capabilities_client = get_sql_capabilities_operations(cli_ctx, None)
-    capabilities = capabilities_client.list_by_location(location, CapabilityGroup.supported_managed_instance_versions)
-    managed_instance_version_capability = _get_default_capability(capabilities.supported_managed_instance_versions)
+    def _find(index):
+        # Find edition capability, based on requested sku properties
+        edition_capability = index.find_edition(sku)
 
-    # Find edition capability, based on requested sku properties
-    edition_capability = _find_edition_capability(sku, managed_instance_version_capability.supported_editions)
+        # Find family level capability, based on requested sku properties
+        return index.find_family(edition_capability, sku)
 
-    # Find family level capability, based on requested sku properties
-    family_capability = _find_family_capability(sku, edition_capability.supported_families)
+    # Search the editions of the default managed instance version capability
+    family_capability = _find_sku_capability(
+        cli_ctx, location, CapabilityGroup.supported_managed_instance_versions,
+        lambda c: _get_default_capability(c.supported_managed_instance_versions).supported_editions,
+        'supported_families', _find)
 
     result = Sku(name=family_capability.sku)
     logger.debug('_find_managed_instance_sku_from_capabilities return: %s', result)
@@ -0,0 +1,144 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import shutil
+import tempfile
+import unittest
+import mock
+
+from knack.util import CLIError
+from azure.mgmt.sql.models import LocationCapabilities, Sku
+
+from azure.cli.command_modules.sql.custom import (
+    CAPABILITIES_CACHE,
+    _SKU_INDEXES,
+    _find_db_sku_from_capabilities,
+    _find_managed_instance_sku_from_capabilities,
+    db_list_capabilities
+)
+
+
+def _slo(name, tier, capacity, family=None, status='Available'):
+    return {'name': name, 'status': status,
+            'sku': {'name': name, 'tier': tier, 'family': family, 'capacity': capacity},
+            'performanceLevel': {'value': capacity, 'unit': 'VCores' if family else 'DTU'}}
+
+
+def _location_capabilities(*editions):
+    return LocationCapabilities.deserialize({
+        'name': 'West US',
+        'status': 'Available',
+        'supportedServerVersions': [{
+            'name': '12.0',
+            'status': 'Default',
+            'supportedEditions': [{'name': name, 'status': 'Available', 'supportedServiceLevelObjectives': slos}
+                                  for name, slos in editions]
+        }],
+        'supportedManagedInstanceVersions': [{
+            'name': '12.0',
+            'status': 'Default',
+            'supportedEditions': [{'name': 'GeneralPurpose', 'status': 'Default', 'supportedFamilies': [
+                {'name': 'Gen4', 'sku': 'GP_Gen4', 'status': 'Available'},
+                {'name': 'Gen5', 'sku': 'GP_Gen5', 'status': 'Default'}]}]
+        }]
+    })
+
+
+class SqlCapabilitiesCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = tempfile.mkdtemp()
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.cloud.name = 'AzureCloud'
+        self.cli_ctx.config.config_dir = self.config_dir
+        self.cli_ctx.config.getint.return_value = 24 * 60 * 60
+        self.cli_ctx.data = {'subscription_id': '00000000-0000-0000-0000-000000000000'}
+        _SKU_INDEXES.clear()
+
+    def tearDown(self):
+        CAPABILITIES_CACHE.flush()
+        _SKU_INDEXES.clear()
+        shutil.rmtree(self.config_dir, ignore_errors=True)
+
+    @mock.patch('azure.cli.command_modules.sql.custom.get_sql_capabilities_operations', autospec=True)
+    def test_find_db_sku_from_cached_capabilities(self, mock_get_capabilities_operations):
+        client = mock_get_capabilities_operations.return_value
+        client.list_by_location.return_value = _location_capabilities(
+            ('Standard', [_slo('S0', 'Standard', 10, status='Default'), _slo('S1', 'Standard', 20)]),
+            ('GeneralPurpose', [_slo('GP_Gen4_2', 'GeneralPurpose', 2, 'Gen4'),
+                                _slo('GP_Gen5_2', 'GeneralPurpose', 2, 'Gen5')]))
+
+        for _ in range(2):
+            self.assertEqual(_find_db_sku_from_capabilities(
+                self.cli_ctx, 'West US', Sku(name=None, tier='Standard', capacity=20)).name, 'S1')
+            sku = Sku(name=None, tier='GeneralPurpose', family='Gen5', capacity=2)
+            self.assertEqual(_find_db_sku_from_capabilities(self.cli_ctx, 'westus', sku).name, 'GP_Gen5_2')
+        self.assertEqual(_find_db_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='Standard')).name, 'S0')
+        # a family is only reset to the first matching service objective when allowed
+        self.assertEqual(_find_db_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='GeneralPurpose', family='Gen5', capacity=2),
+            allow_reset_family=True).name, 'GP_Gen5_2')
+        self.assertEqual(_find_db_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='Standard', family='Gen5', capacity=10),
+            allow_reset_family=True).name, 'S0')
+        self.assertEqual(client.list_by_location.call_count, 1)
+
+        # a new process resolves skus from the capabilities cached on disk
+        _SKU_INDEXES.clear()
+        mock_get_capabilities_operations.reset_mock()
+        self.assertEqual(_find_db_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='Standard', capacity=10)).name, 'S0')
+        self.assertFalse(mock_get_capabilities_operations.called)
+
+        # a sku which is not in the cached capabilities is looked up in refreshed capabilities
+        client.list_by_location.return_value = _location_capabilities(
+            ('Standard', [_slo('S0', 'Standard', 10, status='Default'), _slo('S2', 'Standard', 50)]))
+        self.assertEqual(_find_db_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='Standard', capacity=50)).name, 'S2')
+        with self.assertRaises(CLIError):
+            _find_db_sku_from_capabilities(self.cli_ctx, 'westus', Sku(name=None, tier='Premium', capacity=125))
+        self.assertEqual(client.list_by_location.call_count, 1)
+
+    @mock.patch('azure.cli.command_modules.sql.custom.get_sql_capabilities_operations', autospec=True)
+    def test_find_managed_instance_sku_from_cached_capabilities(self, mock_get_capabilities_operations):
+        client = mock_get_capabilities_operations.return_value
+        client.list_by_location.return_value = _location_capabilities()
+
+        self.assertEqual(_find_managed_instance_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, tier='GeneralPurpose')).name, 'GP_Gen5')
+        self.assertEqual(_find_managed_instance_sku_from_capabilities(
+            self.cli_ctx, 'westus', Sku(name=None, family='Gen4')).name, 'GP_Gen4')
+        self.assertEqual(client.list_by_location.call_count, 1)
+
+    def test_list_capabilities_cached(self):
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = self.cli_ctx
+        client = mock.MagicMock()
+        client.list_by_location.side_effect = lambda *_: _location_capabilities(
+            ('Standard', [_slo('S0', 'Standard', 10), _slo('S1', 'Standard', 20)]))
+
+        # the cached capabilities are not modified by filters
+        self.assertEqual([e.name for e in db_list_capabilities(cmd, client, 'westus', service_objective='S9')], [])
+        editions = db_list_capabilities(cmd, client, 'westus')
+        self.assertEqual([slo.name for slo in editions[0].supported_service_level_objectives], ['S0', 'S1'])
+        self.assertEqual(client.list_by_location.call_count, 1)
+
+        db_list_capabilities(cmd, client, 'westus', refresh=True)
+        self.assertEqual(client.list_by_location.call_count, 2)
+
+        # capabilities are cached per subscription
+        self.cli_ctx.data['subscription_id'] = '11111111-1111-1111-1111-111111111111'
+        db_list_capabilities(cmd, client, 'westus')
+        self.assertEqual(client.list_by_location.call_count, 3)
+
+        # the cache is disabled by a zero TTL
+        self.cli_ctx.config.getint.return_value = 0
+        db_list_capabilities(cmd, client, 'westus')
+        self.assertEqual(client.list_by_location.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -293,6 +293,32 @@ helps['storage blob upload-batch'] = """
           short-summary: Required if the blob has an active lease
 """
 
+helps['storage blob sync'] = """
+    type: command
+    short-summary: Upload the files of a local directory that are missing or have changed in a blob container.
+    long-summary: The destination is listed once and a file is uploaded only when its size differs from the blob, or
+                  when it was modified after the blob was last written. Use --check-md5 to compare the content hashes
+                  instead of the modification times.
+    parameters:
+        - name: --source -s
+          type: string
+          short-summary: The directory where the files to be synced are located.
+        - name: --destination -d
+          type: string
+          short-summary: The blob container where the files will be uploaded.
+          long-summary: The destination can be the container URL or the container name. When the destination is the container URL, the storage
+                        account name will be parsed from the URL.
+        - name: --pattern
+          type: string
+          short-summary: The pattern used for globbing files or blobs in the source. The supported patterns are '*', '?', '[seq]', and '[!seq]'.
+        - name: --dryrun
+          type: bool
+          short-summary: Show the summary of the operations to be taken instead of actually uploading or deleting the blobs.
+    examples:
+        - name: Upload the changed files of a directory and delete the blobs of removed files.
+          text: az storage blob sync -s ./build -d mycontainer --destination-path artifacts --delete-destination
+"""
+
 helps['storage blob download-batch'] = """
     type: command
     short-summary: Download blobs from a blob container recursively.
@@ -59,6 +59,13 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                                     action='store_true', validator=add_progress_callback)
     socket_timeout_type = CLIArgumentType(help='The socket timeout(secs), used by the service to regulate data flow.',
                                           type=int)
+    batch_workers_type = CLIArgumentType(options_list='--max-workers', type=int, arg_group='Transfer Control',
+                                         help='Number of blobs transferred concurrently. Defaults to the '
+                                              '`storage.batch_workers` configuration, or 1.')
+    batch_journal_type = CLIArgumentType(options_list='--journal', arg_group='Transfer Control',
+                                         completer=FilesCompleter(),
+                                         help='File recording the completed blobs. When the command is run again '
+                                              'with the same journal, blobs recorded in it are skipped.')
 
     sas_help = 'The permissions the SAS grants. Allowed values: {}. Do not use if a stored access policy is ' \
                'referenced with --id that specifies this value. Can be combined.'
@@ -262,22 +269,33 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                    arg_type=get_enum_type(get_blob_tier_names(self.cli_ctx, 'PremiumPageBlobTier')),
                    min_api='2017-04-17')
 
-    with self.argument_context('storage blob upload-batch') as c:
-        from .sdkutil import get_blob_types
+    from .sdkutil import get_blob_types
+    t_blob_content_settings = self.get_sdk('blob.models#ContentSettings')
+    for scope in ['storage blob upload-batch', 'storage blob sync']:
+        with self.argument_context(scope) as c:
+            c.register_content_settings_argument(t_blob_content_settings, update=False, arg_group='Content Control')
+            c.ignore('source_files', 'destination_container_name')
+
+            c.argument('source', options_list=('--source', '-s'))
+            c.argument('destination', options_list=('--destination', '-d'))
+            c.argument('max_connections', type=int,
+                       help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+            c.argument('maxsize_condition', arg_group='Content Control')
+            c.argument('validate_content', action='store_true', min_api='2016-05-31', arg_group='Content Control')
+            c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
+            c.argument('max_workers', batch_workers_type)
+            c.extra('no_progress', progress_type)
+            c.extra('socket_timeout', socket_timeout_type)
 
-        t_blob_content_settings = self.get_sdk('blob.models#ContentSettings')
-        c.register_content_settings_argument(t_blob_content_settings, update=False, arg_group='Content Control')
-        c.ignore('source_files', 'destination_container_name')
+    with self.argument_context('storage blob upload-batch') as c:
+        c.argument('journal', batch_journal_type)
 
-        c.argument('source', options_list=('--source', '-s'))
-        c.argument('destination', options_list=('--destination', '-d'))
-        c.argument('max_connections', type=int,
-                   help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
-        c.argument('maxsize_condition', arg_group='Content Control')
-        c.argument('validate_content', action='store_true', min_api='2016-05-31', arg_group='Content Control')
-        c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
-        c.extra('no_progress', progress_type)
-        c.extra('socket_timeout', socket_timeout_type)
+    with self.argument_context('storage blob sync') as c:
+        c.argument('check_md5', action='store_true',
+                   help='Compare the Content-MD5 of the blobs with the local files instead of the last modified time '
+                        'when the sizes match. Blobs without a Content-MD5 are compared by last modified time.')
+        c.argument('delete_destination', action='store_true',
+                   help='Delete the blobs under the destination path that match the pattern but have no local file.')
 
     with self.argument_context('storage blob download') as c:
         c.argument('file_path', options_list=('--file', '-f'), type=file_type, completer=FilesCompleter())
@@ -296,6 +314,8 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('socket_timeout', socket_timeout_type)
         c.argument('max_connections', type=int,
                    help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+        c.argument('max_workers', batch_workers_type)
+        c.argument('journal', batch_journal_type)
 
     with self.argument_context('storage blob delete') as c:
         from .sdkutil import get_delete_blob_snapshot_type_names
@@ -307,6 +327,8 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('delete_snapshots', arg_type=get_enum_type(get_delete_blob_snapshot_type_names()),
                    help='Required if the blob has associated snapshots.')
         c.argument('lease_id', help='Required if the blob has an active lease.')
+        c.argument('max_workers', batch_workers_type)
+        c.argument('journal', batch_journal_type)
 
     with self.argument_context('storage blob lease') as c:
         c.argument('lease_duration', type=int)
@@ -115,6 +115,7 @@ def load_command_table(self, _):  # pylint: disable=too-many-locals, too-many-st
                                  doc_string_source='blob#BlockBlobService.create_blob_from_path')
         g.storage_custom_command('upload-batch', 'storage_blob_upload_batch',
                                  validator=process_blob_upload_batch_parameters)
+        g.storage_custom_command('sync', 'storage_blob_sync', validator=process_blob_upload_batch_parameters)
         g.storage_custom_command('download-batch', 'storage_blob_download_batch',
                                  validator=process_blob_download_batch_parameters)
         g.storage_custom_command('delete-batch', 'storage_blob_delete_batch',
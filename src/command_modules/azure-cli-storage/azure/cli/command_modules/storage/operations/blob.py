@@ -14,7 +14,9 @@ from azure.cli.command_modules.storage.util import (create_blob_service_from_sto
                                                     create_short_lived_container_sas,
                                                     filter_none, collect_blobs, collect_files,
                                                     mkdir_p, guess_content_type, normalize_blob_file_path,
-                                                    check_precondition_success)
+                                                    check_precondition_success, _match_path)
+from azure.cli.command_modules.storage.transfer import (get_batch_workers, configure_connection_pool,
+                                                        run_batch_transfer, TransferJournal)
 from azure.cli.command_modules.storage.url_quote_util import encode_for_url, make_encoded_file_url_and_params
 
 
@@ -110,8 +112,8 @@ def storage_blob_copy_batch(cmd, client, source_client, destination_container=No
 
 
 # pylint: disable=unused-argument
-def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False,
-                                progress_callback=None, max_connections=2):
+def storage_blob_download_batch(cmd, client, source, destination, source_container_name, pattern=None, dryrun=False,
+                                progress_callback=None, max_connections=2, max_workers=None, journal=None):
 
     def _download_blob(blob_service, container, destination_folder, normalized_blob_name, blob_name):
         # TODO: try catch IO exception
@@ -121,10 +123,20 @@ def storage_blob_download_batch(client, source, destination, source_container_na
             mkdir_p(destination_folder)
 
         blob = blob_service.get_blob_to_path(container, blob_name, destination_path, max_connections=max_connections,
-                                             progress_callback=progress_callback)
+                                             progress_callback=blob_progress_callback)
         return blob.name
 
     source_blobs = collect_blobs(client, source_container_name, pattern)
+
+    if dryrun:
+        logger = get_logger(__name__)
+        logger.warning('download action: from %s to %s', source, destination)
+        logger.warning('    pattern %s', pattern)
+        logger.warning('  container %s', source_container_name)
+        logger.warning(' operations')
+        _log_dryrun_blobs(logger, source_blobs)
+        return []
+
     blobs_to_download = {}
     for blob_name in source_blobs:
         # remove starting path seperator and normalize
@@ -136,19 +148,20 @@ def storage_blob_download_batch(client, source, destination, source_container_na
                            'command instead to download individual blobs.'.format(normalized_blob_name))
         blobs_to_download[normalized_blob_name] = blob_name
 
-    if dryrun:
-        logger = get_logger(__name__)
-        logger.warning('download action: from %s to %s', source, destination)
-        logger.warning('    pattern %s', pattern)
-        logger.warning('  container %s', source_container_name)
-        logger.warning('      total %d', len(source_blobs))
-        logger.warning(' operations')
-        for b in source_blobs:
-            logger.warning('  - %s', b)
-        return []
+    max_workers = get_batch_workers(cmd.cli_ctx, max_workers)
+    configure_connection_pool(client, max_workers, max_connections)
+    # concurrent downloads report the aggregated progress of the batch instead of the progress of each blob
+    blob_progress_callback = progress_callback if max_workers == 1 else None
+
+    def _download_item(blob_normed):
+        return True, _download_blob(client, source_container_name, destination, blob_normed,
+                                    blobs_to_download[blob_normed])
 
-    return list(_download_blob(client, source_container_name, destination, blob_normed, blobs_to_download[blob_normed])
-                for blob_normed in blobs_to_download)
+    results, _ = run_batch_transfer(
+        [(blobs_to_download[blob_normed], blob_normed) for blob_normed in blobs_to_download], _download_item,
+        max_workers=max_workers, progress_callback=progress_callback, description='download',
+        journal=TransferJournal(journal, 'download-batch {}'.format(source_container_name)) if journal else None)
+    return results
 
 
 def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
@@ -157,7 +170,7 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None, progress_callback=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_workers=None, journal=None):
     def _create_return_result(blob_name, blob_content_settings, upload_result=None):
         blob_name = normalize_blob_file_path(destination_path, blob_name)
         return {
@@ -184,7 +197,13 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
         def _upload_blob(*args, **kwargs):
             return upload_blob(*args, **kwargs)
 
-        for src, dst in source_files or []:
+        max_workers = get_batch_workers(cmd.cli_ctx, max_workers)
+        configure_connection_pool(client, max_workers, max_connections)
+        # concurrent uploads report the aggregated progress of the batch instead of the progress of each blob
+        blob_progress_callback = progress_callback if max_workers == 1 else None
+
+        def _upload_file(source_file):
+            src, dst = source_file
             logger.warning('uploading %s', src)
             guessed_content_settings = guess_content_type(src, content_settings, t_content_settings)
 
@@ -193,19 +212,101 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                                            blob_type=blob_type, content_settings=guessed_content_settings,
                                            metadata=metadata, validate_content=validate_content,
                                            maxsize_condition=maxsize_condition, max_connections=max_connections,
-                                           lease_id=lease_id, progress_callback=progress_callback,
+                                           lease_id=lease_id, progress_callback=blob_progress_callback,
                                            if_modified_since=if_modified_since,
                                            if_unmodified_since=if_unmodified_since, if_match=if_match,
                                            if_none_match=if_none_match, timeout=timeout)
-            if include:
-                results.append(_create_return_result(dst, guessed_content_settings, result))
+            return include, _create_return_result(dst, guessed_content_settings, result) if include else None
+
+        source_files = source_files or []
+        results, num_failures = run_batch_transfer(
+            [(normalize_blob_file_path(destination_path, dst), (src, dst)) for src, dst in source_files],
+            _upload_file, max_workers=max_workers, progress_callback=progress_callback, description='upload',
+            journal=TransferJournal(journal, 'upload-batch {}'.format(destination_container_name)) if journal else None)
 
-        num_failures = len(source_files) - len(results)
         if num_failures:
             logger.warning('%s of %s files not uploaded due to "Failed Precondition"', num_failures, len(source_files))
     return results
 
 
+def storage_blob_sync(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
+                      source_files=None, destination_path=None, destination_container_name=None, blob_type=None,
+                      content_settings=None, metadata=None, validate_content=False, maxsize_condition=None,
+                      max_connections=2, progress_callback=None, timeout=None, dryrun=False, check_md5=False,
+                      delete_destination=False, max_workers=None):
+    """Upload the files of a local directory that are missing or have changed in a blob container."""
+    logger = get_logger(__name__)
+
+    local_files = {}
+    for src, dst in source_files or []:
+        local_files[normalize_blob_file_path(destination_path, dst)] = (src, dst)
+
+    # list the destination once, restricted to the virtual directory the files are synced to
+    prefix = normalize_blob_file_path(destination_path, '') + '/' if destination_path else None
+    unchanged, orphans = set(), []
+    for blob in client.list_blobs(destination_container_name, prefix=prefix):
+        if blob.name in local_files:
+            if _blob_is_current(blob, local_files[blob.name][0], check_md5):
+                unchanged.add(blob.name)
+        elif delete_destination and (not pattern or
+                                     _match_path(blob.name[len(prefix or ''):], pattern.lstrip('/'))):
+            orphans.append(blob.name)
+
+    changed_files = [local_files[name] for name in local_files if name not in unchanged]
+    logger.warning('%d of %d files changed, %d orphaned blobs', len(changed_files), len(local_files), len(orphans))
+
+    results = []
+    if changed_files:
+        results = storage_blob_upload_batch(cmd, client, source, destination, pattern=pattern,
+                                            source_files=changed_files, destination_path=destination_path,
+                                            destination_container_name=destination_container_name,
+                                            blob_type=blob_type, content_settings=content_settings,
+                                            metadata=metadata, validate_content=validate_content,
+                                            maxsize_condition=maxsize_condition, max_connections=max_connections,
+                                            progress_callback=progress_callback, timeout=timeout, dryrun=dryrun,
+                                            max_workers=max_workers)
+
+    if orphans:
+        if dryrun:
+            for blob_name in orphans:
+                logger.warning('  - delete %s', blob_name)
+        else:
+            @check_precondition_success
+            def _delete_blob(blob_name):
+                return client.delete_blob(destination_container_name, blob_name, timeout=timeout)
+
+            run_batch_transfer([(blob_name, blob_name) for blob_name in orphans], _delete_blob,
+                               max_workers=get_batch_workers(cmd.cli_ctx, max_workers), description='delete')
+
+    return results
+
+
+def _blob_is_current(blob, file_path, check_md5=False):
+    import calendar
+
+    file_stat = os.stat(file_path)
+    if blob.properties.content_length != file_stat.st_size:
+        return False
+
+    content_md5 = blob.properties.content_settings.content_md5
+    if check_md5 and content_md5:
+        return content_md5 == _get_file_md5(file_path)
+
+    # the blob is current when it was written after the last modification of the local file
+    return calendar.timegm(blob.properties.last_modified.utctimetuple()) >= int(file_stat.st_mtime)
+
+
+def _get_file_md5(file_path):
+    import base64
+    import hashlib
+
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('utf-8')
+
+
 def upload_blob(cmd, client, container_name, blob_name, file_path, blob_type=None, content_settings=None, metadata=None,
                 validate_content=False, maxsize_condition=None, max_connections=2, lease_id=None, tier=None,
                 if_modified_since=None, if_unmodified_since=None, if_match=None, if_none_match=None, timeout=None,
@@ -305,9 +406,9 @@ def show_blob(cmd, client, container_name, blob_name, snapshot=None, lease_id=No
     return blob
 
 
-def storage_blob_delete_batch(client, source, source_container_name, pattern=None, lease_id=None,
+def storage_blob_delete_batch(cmd, client, source, source_container_name, pattern=None, lease_id=None,
                               delete_snapshots=None, if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_workers=None, journal=None):
     @check_precondition_success
     def _delete_blob(blob_name):
         delete_blob_args = {
@@ -324,22 +425,39 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
         return client.delete_blob(**delete_blob_args)
 
     logger = get_logger(__name__)
-    source_blobs = list(collect_blobs(client, source_container_name, pattern))
+    source_blobs = collect_blobs(client, source_container_name, pattern)
 
     if dryrun:
         logger.warning('delete action: from %s', source)
         logger.warning('    pattern %s', pattern)
         logger.warning('  container %s', source_container_name)
-        logger.warning('      total %d', len(source_blobs))
         logger.warning(' operations')
-        for blob in source_blobs:
-            logger.warning('  - %s', blob)
+        _log_dryrun_blobs(logger, source_blobs)
         return []
 
-    results = [result for include, result in (_delete_blob(blob) for blob in source_blobs) if include]
-    num_failures = len(source_blobs) - len(results)
+    # the blobs are deleted while the container is listed, only the number of blobs is kept
+    listed = {'total': 0}
+
+    def _blobs_to_delete():
+        for blob in source_blobs:
+            listed['total'] += 1
+            yield blob, blob
+
+    max_workers = get_batch_workers(cmd.cli_ctx, max_workers)
+    configure_connection_pool(client, max_workers, 1)
+    _, num_failures = run_batch_transfer(
+        _blobs_to_delete(), _delete_blob, max_workers=max_workers, description='delete',
+        journal=TransferJournal(journal, 'delete-batch {}'.format(source_container_name)) if journal else None)
     if num_failures:
-        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, len(source_blobs))
+        logger.warning('%s of %s blobs not deleted due to "Failed Precondition"', num_failures, listed['total'])
+
+
+def _log_dryrun_blobs(logger, blobs):
+    total = 0
+    for blob in blobs:
+        logger.warning('  - %s', blob)
+        total += 1
+    logger.warning('      total %d', total)
 
 
 def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_container, destination_path,
@@ -0,0 +1,61 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.command_modules.storage.operations.blob import storage_blob_sync
+
+
+def _mock_blob(name, size, last_modified, content_md5=None):
+    blob = mock.MagicMock()
+    blob.name = name
+    blob.properties.content_length = size
+    blob.properties.last_modified = last_modified
+    blob.properties.content_settings.content_md5 = content_md5
+    return blob
+
+
+class TestStorageBlobSync(unittest.TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        for name, content in [('same.txt', b'same'), ('changed.txt', b'changed'), ('new.txt', b'new')]:
+            with open(os.path.join(self.source, name), 'wb') as f:
+                f.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.source, ignore_errors=True)
+
+    @mock.patch('azure.cli.command_modules.storage.operations.blob.storage_blob_upload_batch', autospec=True)
+    def test_storage_blob_sync_uploads_delta_and_deletes_orphans(self, upload_batch):
+        future = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+        client = mock.MagicMock()
+        client.list_blobs.return_value = [_mock_blob('out/same.txt', 4, future),
+                                          _mock_blob('out/changed.txt', 4, future),
+                                          _mock_blob('out/gone.txt', 4, future),
+                                          _mock_blob('out/gone.log', 4, future)]
+        upload_batch.return_value = ['uploaded']
+        cmd = mock.MagicMock()
+        cmd.cli_ctx.config.getint.return_value = 1
+
+        source_files = [(os.path.join(self.source, n), n) for n in ['same.txt', 'changed.txt', 'new.txt']]
+        result = storage_blob_sync(cmd, client, self.source, 'cont', pattern='*.txt', source_files=source_files,
+                                   destination_path='out', destination_container_name='cont',
+                                   delete_destination=True)
+
+        self.assertEqual(result, ['uploaded'])
+        client.list_blobs.assert_called_once_with('cont', prefix='out/')
+        uploaded = sorted(dst for _, dst in upload_batch.call_args[1]['source_files'])
+        self.assertEqual(uploaded, ['changed.txt', 'new.txt'])
+        client.delete_blob.assert_called_once_with('cont', 'out/gone.txt', timeout=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
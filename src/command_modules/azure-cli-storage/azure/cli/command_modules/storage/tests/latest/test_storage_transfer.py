@@ -0,0 +1,75 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from knack.util import CLIError
+
+from azure.cli.command_modules.storage.transfer import run_batch_transfer, TransferJournal
+
+
+class TestBatchTransfer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.temp_dir, 'journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_run_batch_transfer_keeps_order_and_reports_progress(self):
+        lock = threading.Lock()
+        running = {'current': 0, 'peak': 0}
+        all_running = threading.Event()
+
+        def _action(item):
+            with lock:
+                running['current'] += 1
+                running['peak'] = max(running['peak'], running['current'])
+                if running['current'] == 3:
+                    all_running.set()
+            all_running.wait(5)
+            with lock:
+                running['current'] -= 1
+            return item % 5 != 0, item * 2
+
+        progress = []
+        items = [(str(i), i) for i in range(1, 21)]
+        results, skipped = run_batch_transfer(items, _action, max_workers=3,
+                                              progress_callback=lambda c, t: progress.append((c, t)))
+
+        self.assertEqual(results, [i * 2 for i in range(1, 21) if i % 5])
+        self.assertEqual(skipped, 4)
+        self.assertEqual(running['peak'], 3)
+        self.assertEqual(progress[-1], (20, 20))
+
+    def test_run_batch_transfer_summarizes_failures_and_resumes_from_journal(self):
+        attempted = []
+
+        def _action(item):
+            attempted.append(item)
+            if item == 'b':
+                raise ValueError('boom')
+            return True, item
+
+        items = [(i, i) for i in 'abcd']
+        with self.assertRaisesRegexp(CLIError, '1 of 4 items failed to upload'):
+            run_batch_transfer(items, _action, max_workers=2, description='upload',
+                               journal=TransferJournal(self.journal_path, 'upload-batch c'))
+        self.assertEqual(sorted(attempted), ['a', 'b', 'c', 'd'])
+
+        results, _ = run_batch_transfer(items, lambda item: (True, item),
+                                        journal=TransferJournal(self.journal_path, 'upload-batch c'))
+        self.assertEqual(results, ['b'])
+
+        with self.assertRaisesRegexp(CLIError, 'different batch operation'):
+            TransferJournal(self.journal_path, 'delete-batch c')
+
+
+if __name__ == '__main__':
+    unittest.main()
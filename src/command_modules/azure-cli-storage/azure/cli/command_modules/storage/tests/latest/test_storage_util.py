@@ -0,0 +1,52 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import types
+import unittest
+
+import mock
+
+from azure.cli.command_modules.storage.util import collect_blobs
+
+
+class TestStorageUtil(unittest.TestCase):
+    def _mock_blob_service(self, names):
+        def _list_blobs(container, prefix=None):
+            for name in names:
+                if not prefix or name.startswith(prefix):
+                    blob = mock.MagicMock()
+                    blob.name = name
+                    yield blob
+
+        blob_service = mock.MagicMock()
+        blob_service.list_blobs.side_effect = _list_blobs
+        return blob_service
+
+    def test_collect_blobs_pushes_pattern_prefix_to_listing(self):
+        blob_service = self._mock_blob_service(['logs/2018/09/a', 'logs/2018/10/b', 'logs/2018/10/c.txt'])
+
+        blobs = collect_blobs(blob_service, 'cont', 'logs/2018/10/*.txt')
+
+        self.assertIsInstance(blobs, types.GeneratorType)
+        self.assertEqual(list(blobs), ['logs/2018/10/c.txt'])
+        blob_service.list_blobs.assert_called_once_with('cont', prefix='logs/2018/10/')
+
+    def test_collect_blobs_without_prefix(self):
+        blob_service = self._mock_blob_service(['a', 'b/c'])
+
+        self.assertEqual(list(collect_blobs(blob_service, 'cont', '*')), ['a', 'b/c'])
+        self.assertEqual(list(collect_blobs(blob_service, 'cont')), ['a', 'b/c'])
+        blob_service.list_blobs.assert_called_with('cont', prefix=None)
+
+    def test_collect_blobs_without_wildcards(self):
+        blob_service = mock.MagicMock()
+        blob_service.exists.return_value = True
+
+        self.assertEqual(collect_blobs(blob_service, 'cont', 'a/b.txt'), ['a/b.txt'])
+        blob_service.list_blobs.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""Shared scheduler for the storage batch commands.
+
+The batch commands hand the scheduler an iterable of (key, item) pairs and a function that transfers a single item.
+The items are processed by a bounded pool of workers, completed keys are optionally recorded in a journal so that an
+interrupted batch can be resumed, and failures are collected into a summary instead of aborting the whole batch.
+"""
+
+import json
+import os
+import threading
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_WORKERS = 1
+
+# number of pending items queued per worker, keeps memory bounded for very large batches
+_ITEMS_PER_WORKER = 4
+
+
+def get_batch_workers(cli_ctx, max_workers=None):
+    """ Resolve the number of concurrent transfers from the argument or the `storage.batch_workers` configuration. """
+    if max_workers is None:
+        max_workers = cli_ctx.config.getint('storage', 'batch_workers', fallback=DEFAULT_BATCH_WORKERS)
+    if max_workers < 1:
+        raise CLIError('usage error: --max-workers must be a positive integer')
+    return max_workers
+
+
+def configure_connection_pool(client, max_workers, max_connections):
+    """ Size the HTTP connection pool of a storage client so the concurrent transfers can share it.
+
+    Each worker may open up to `max_connections` connections for a single large blob, so the pool is the global cap
+    on the number of connections the batch keeps open to the service.
+    """
+    if max_workers <= 1:
+        return
+    from requests.adapters import HTTPAdapter
+    pool_size = max_workers * max(max_connections or 1, 1)
+    session = client.request_session
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+
+
+class TransferJournal(object):
+    """ Append-only record of the items a batch operation has completed.
+
+    The first line identifies the operation the journal belongs to, every following line holds one JSON encoded
+    item key. Lines are flushed as soon as an item completes, so the journal survives an interrupted command.
+    """
+
+    def __init__(self, path, operation):
+        self.path = os.path.expanduser(path)
+        self.operation = operation
+        self._completed = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    def _load(self):
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, 'r') as f:
+            header = f.readline().strip()
+            if header and header != self._header():
+                raise CLIError("Journal '{}' belongs to a different batch operation ({}). Use a new journal file "
+                               "for this command.".format(self.path, header.lstrip('# ')))
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._completed.add(json.loads(line))
+                except ValueError:
+                    # a line may be truncated when the previous run was killed in the middle of a write
+                    logger.debug("Ignoring malformed journal line '%s'", line)
+        if self._completed:
+            logger.warning('Resuming from journal %s: %d items already completed', self.path, len(self._completed))
+
+    def _header(self):
+        return '# {}'.format(self.operation)
+
+    def __contains__(self, key):
+        return key in self._completed
+
+    def __len__(self):
+        return len(self._completed)
+
+    def record(self, key):
+        with self._lock:
+            if self._file is None:
+                new_file = not os.path.isfile(self.path) or not os.path.getsize(self.path)
+                self._file = open(self.path, 'a')
+                if new_file:
+                    self._file.write(self._header() + '\n')
+            self._file.write(json.dumps(key) + '\n')
+            self._file.flush()
+            self._completed.add(key)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class TransferFailure(object):  # pylint: disable=too-few-public-methods
+    def __init__(self, key, error):
+        self.key = key
+        self.error = error
+
+
+def run_batch_transfer(items, action, max_workers=DEFAULT_BATCH_WORKERS, journal=None, progress_callback=None,
+                       total=None, description='transfer'):
+    """ Apply `action` to every item and return the results in the order of the items.
+
+    :param items: iterable of (key, item) pairs. The key identifies the item in the journal and in error messages.
+    :param action: callable taking an item and returning an (include, result) pair, e.g. a function decorated with
+                   `check_precondition_success`. Results of excluded items and `None` results are not returned, so
+                   operations without output do not accumulate a list as long as the batch.
+    :param int max_workers: number of items transferred concurrently.
+    :param TransferJournal journal: skip the items recorded in the journal and record the completed ones.
+    :param progress_callback: called with (completed, total) items after every item when more than one worker is
+                              used. Serial batches leave progress reporting to the individual transfers.
+    :param int total: number of items, used for progress reporting when `items` has no length.
+    :param str description: verb used in the failure summary.
+    :return: (results, skipped) where `skipped` is the number of items excluded by `action`.
+    """
+    if total is None and hasattr(items, '__len__'):
+        total = len(items)
+
+    pending = ((index, key, item) for index, (key, item) in enumerate(items)
+               if journal is None or key not in journal)
+
+    state = {'completed': 0, 'skipped': 0, 'failures': [], 'results': []}
+    if journal is not None:
+        state['completed'] = len(journal)
+
+    def _complete(index, key, outcome):
+        include, result = outcome
+        if not include:
+            state['skipped'] += 1
+        elif result is not None:
+            state['results'].append((index, result))
+        if journal is not None:
+            journal.record(key)
+        state['completed'] += 1
+        if progress_callback and max_workers > 1:
+            progress_callback(state['completed'], total)
+
+    def _fail(key, ex):
+        logger.error('%s: %s', key, ex)
+        state['failures'].append(TransferFailure(key, ex))
+
+    try:
+        if max_workers <= 1:
+            for index, key, item in pending:
+                try:
+                    outcome = action(item)
+                except Exception as ex:  # pylint: disable=broad-except
+                    _fail(key, ex)
+                    continue
+                _complete(index, key, outcome)
+        else:
+            _run_concurrently(pending, action, max_workers, _complete, _fail)
+    finally:
+        if journal is not None:
+            journal.close()
+
+    failures = state['failures']
+    if failures:
+        attempted = state['completed'] + len(failures)
+        message = '{} of {} items failed to {}.'.format(len(failures), attempted, description)
+        if journal is not None:
+            message += " Run the command again with '--journal {}' to retry only the failed items.".format(
+                journal.path)
+        raise CLIError(message)
+
+    return [result for _, result in sorted(state['results'], key=lambda r: r[0])], state['skipped']
+
+
+def _run_concurrently(pending, action, max_workers, on_complete, on_failure):
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            exhausted = False
+            while in_flight or not exhausted:
+                while not exhausted and len(in_flight) < max_workers * _ITEMS_PER_WORKER:
+                    try:
+                        index, key, item = next(pending)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight[executor.submit(action, item)] = (index, key)
+
+                if not in_flight:
+                    break
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, key = in_flight.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as ex:  # pylint: disable=broad-except
+                        on_failure(key, ex)
+                        continue
+                    on_complete(index, key, outcome)
+        except BaseException:
+            # stop queued transfers on interrupt, the ones already running finish and are lost from the journal
+            for future in in_flight:
+                future.cancel()
+            raise
@@ -10,6 +10,7 @@ import os
 def collect_blobs(blob_service, container, pattern=None):
     """
     List the blobs in the given blob container, filter the blob by comparing their path to the given pattern.
+    The blobs are listed with the literal prefix of the pattern and yielded as they are listed.
     """
     if not blob_service:
         raise ValueError('missing parameter blob_service')
@@ -20,17 +21,18 @@ def collect_blobs(blob_service, container, pattern=None):
     if not _pattern_has_wildcards(pattern):
         return [pattern] if blob_service.exists(container, pattern) else []
 
-    results = []
-    for blob in blob_service.list_blobs(container):
+    return _iterate_blobs(blob_service, container, pattern)
+
+
+def _iterate_blobs(blob_service, container, pattern):
+    for blob in blob_service.list_blobs(container, prefix=_get_pattern_prefix(pattern)):
         try:
             blob_name = blob.name.encode('utf-8') if isinstance(blob.name, unicode) else blob.name
         except NameError:
             blob_name = blob.name
 
         if not pattern or _match_path(blob_name, pattern):
-            results.append(blob_name)
-
-    return results
+            yield blob_name
 
 
 def collect_files(cmd, file_service, share, pattern=None):
@@ -167,6 +169,14 @@ def _pattern_has_wildcards(p):
     return not p or p.find('*') != -1 or p.find('?') != -1 or p.find('[') != -1
 
 
+def _get_pattern_prefix(pattern):
+    """ The part of the pattern before the first wildcard, which can be used to filter a listing on the service. """
+    if not pattern:
+        return None
+    wildcards = [i for i in (pattern.find(c) for c in '*?[') if i != -1]
+    return (pattern[:min(wildcards)] if wildcards else pattern) or None
+
+
 def _match_path(path, pattern):
     from fnmatch import fnmatch
     return fnmatch(path, pattern)
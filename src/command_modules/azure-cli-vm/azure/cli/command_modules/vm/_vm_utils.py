@@ -40,25 +40,11 @@ def read_content_if_is_file(string_or_file):
 
 
 def _resolve_api_version(cli_ctx, provider_namespace, resource_type, parent_path):
+    from azure.cli.core.commands.arm import resolve_api_version
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
     from azure.cli.core.profiles import ResourceType
     client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES)
-    provider = client.providers.get(provider_namespace)
-
-    # If available, we will use parent resource's api-version
-    resource_type_str = (parent_path.split('/')[0] if parent_path else resource_type)
-
-    rt = [t for t in provider.resource_types  # pylint: disable=no-member
-          if t.resource_type.lower() == resource_type_str.lower()]
-    if not rt:
-        raise CLIError('Resource type {} not found.'.format(resource_type_str))
-    if len(rt) == 1 and rt[0].api_versions:
-        npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-        return npv[0] if npv else rt[0].api_versions[0]
-    else:
-        raise CLIError(
-            'API version is required and could not be resolved for resource {}'
-            .format(resource_type))
+    return resolve_api_version(cli_ctx, client, provider_namespace, resource_type, parent_path)
 
 
 def log_pprint_template(template):
@@ -99,12 +85,13 @@ def check_existence(cli_ctx, value, resource_group, provider_namespace, resource
 
 
 def create_keyvault_data_plane_client(cli_ctx):
-    from azure.cli.core._profile import Profile
+    from azure.cli.core._profile import get_token_provider
     from azure.cli.core.profiles import get_api_version, ResourceType
     version = str(get_api_version(cli_ctx, ResourceType.DATA_KEYVAULT))
+    token_provider = get_token_provider(cli_ctx)
 
     def get_token(server, resource, scope):  # pylint: disable=unused-argument
-        return Profile(cli_ctx=cli_ctx).get_login_credentials(resource)[0]._token_retriever()  # pylint: disable=protected-access
+        return token_provider.get_raw_token(resource)[0]
 
     from azure.keyvault import KeyVaultAuthentication, KeyVaultClient
     return KeyVaultClient(KeyVaultAuthentication(get_token), api_version=version)
@@ -684,23 +684,76 @@ def get_vm_details(cmd, resource_group_name, vm_name):
     result = get_instance_view(cmd, resource_group_name, vm_name)
     network_client = get_mgmt_service_client(
         cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+
+    def _get_nic(nic_id):
+        nic_parts = parse_resource_id(nic_id)
+        return network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+
+    def _get_public_ip(public_ip_id):
+        res = parse_resource_id(public_ip_id)
+        return network_client.public_ip_addresses.get(res['resource_group'], res['name'])
+
+    return _set_vm_details(result, _get_nic, _get_public_ip)
+
+
+def _get_vms_details(cmd, vms, resource_group_name=None):
+    """ Details of many VMs: the NICs and public IPs are listed once and joined to the VMs by id, while the instance
+    views are retrieved concurrently. Produces the same output as `get_vm_details` for every VM. The VMs of a
+    resource group are joined to the NICs and public IPs of that group only. """
+    from concurrent.futures import ThreadPoolExecutor
+    from msrestazure.tools import parse_resource_id
+    from azure.cli.command_modules.vm._actions import _get_thread_count
+    from azure.cli.command_modules.vm._vm_utils import get_target_network_api
+    network_client = get_mgmt_service_client(
+        cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+    if resource_group_name:
+        nics = network_client.network_interfaces.list(resource_group_name)
+        public_ips = network_client.public_ip_addresses.list(resource_group_name)
+    else:
+        nics = network_client.network_interfaces.list_all()
+        public_ips = network_client.public_ip_addresses.list_all()
+    nic_lookup = {nic.id.lower(): nic for nic in nics}
+    public_ip_lookup = {pip.id.lower(): pip for pip in public_ips}
+
+    # resources created after the listing, or living in another resource group or subscription, are retrieved
+    # individually
+    def _get_nic(nic_id):
+        nic = nic_lookup.get(nic_id.lower())
+        if nic is None:
+            nic_parts = parse_resource_id(nic_id)
+            nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+        return nic
+
+    def _get_public_ip(public_ip_id):
+        public_ip = public_ip_lookup.get(public_ip_id.lower())
+        if public_ip is None:
+            res = parse_resource_id(public_ip_id)
+            public_ip = network_client.public_ip_addresses.get(res['resource_group'], res['name'])
+        return public_ip
+
+    def _get_details(vm):
+        result = get_instance_view(cmd, _parse_rg_name(vm.id)[0], vm.name)
+        return _set_vm_details(result, _get_nic, _get_public_ip)
+
+    with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+        return list(executor.map(_get_details, vms))
+
+
+def _set_vm_details(result, get_nic, get_public_ip):
     public_ips = []
     fqdns = []
     private_ips = []
     mac_addresses = []
     # pylint: disable=line-too-long,no-member
     for nic_ref in result.network_profile.network_interfaces:
-        nic_parts = parse_resource_id(nic_ref.id)
-        nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+        nic = get_nic(nic_ref.id)
         if nic.mac_address:
             mac_addresses.append(nic.mac_address)
         for ip_configuration in nic.ip_configurations:
             if ip_configuration.private_ip_address:
                 private_ips.append(ip_configuration.private_ip_address)
             if ip_configuration.public_ip_address:
-                res = parse_resource_id(ip_configuration.public_ip_address.id)
-                public_ip_info = network_client.public_ip_addresses.get(res['resource_group'],
-                                                                        res['name'])
+                public_ip_info = get_public_ip(ip_configuration.public_ip_address.id)
                 if public_ip_info.ip_address:
                     public_ips.append(public_ip_info.ip_address)
                 if public_ip_info.dns_settings:
@@ -737,6 +790,9 @@ def list_vm(cmd, resource_group_name=None, show_details=False):
     vm_list = ccf.virtual_machines.list(resource_group_name=resource_group_name) \
         if resource_group_name else ccf.virtual_machines.list_all()
     if show_details:
+        vm_list = list(vm_list)
+        if len(vm_list) > 1:
+            return _get_vms_details(cmd, vm_list, resource_group_name)
         return [get_vm_details(cmd, _parse_rg_name(v.id)[0], v.name) for v in vm_list]
 
     return list(vm_list)
@@ -14,7 +14,7 @@ from azure.cli.command_modules.vm.custom import (enable_boot_diagnostics, disabl
                                                  _LINUX_ACCESS_EXT,
                                                  _WINDOWS_ACCESS_EXT,
                                                  _get_extension_instance_name,
-                                                 get_boot_log)
+                                                 get_boot_log, list_vm)
 from azure.cli.command_modules.vm.custom import \
     (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view)
 
@@ -238,6 +238,56 @@ class TestVmCustom(unittest.TestCase):
         vm_client.virtual_machine_scale_set_vms.list.assert_called_once_with('rg1', 'vmss1', expand='instanceView',
                                                                              select='instanceView')
 
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vm_show_details_joins_network_resources(self, compute_client_factory, network_client_factory):
+        # pylint: disable=line-too-long
+        rg_id = '/subscriptions/sub1/resourceGroups/rg1/providers/'
+
+        def _vm(name):
+            vm = mock.MagicMock()
+            vm.id = rg_id + 'Microsoft.Compute/virtualMachines/' + name
+            vm.name = name
+            nic_ref = mock.MagicMock()
+            nic_ref.id = rg_id + 'Microsoft.Network/networkInterfaces/' + name + 'Nic'
+            vm.network_profile.network_interfaces = [nic_ref]
+            status = mock.MagicMock(code='PowerState/running', display_status='VM running')
+            vm.instance_view.statuses = [status]
+            return vm
+
+        def _nic(name, public_ip_id=None):
+            nic = mock.MagicMock(mac_address='00-0D-3A-' + name)
+            nic.id = (rg_id + 'Microsoft.Network/networkInterfaces/' + name + 'Nic').upper()
+            ip_configuration = mock.MagicMock(private_ip_address='10.0.0.' + name[-1])
+            ip_configuration.public_ip_address = mock.MagicMock(id=public_ip_id) if public_ip_id else None
+            nic.ip_configurations = [ip_configuration]
+            return nic
+
+        public_ip = mock.MagicMock(ip_address='40.0.0.1')
+        public_ip.id = rg_id + 'Microsoft.Network/publicIPAddresses/vm1PublicIP'
+        public_ip.dns_settings.fqdn = 'vm1.westus.cloudapp.azure.com'
+
+        compute_client = compute_client_factory.return_value
+        compute_client.virtual_machines.list.return_value = [_vm('vm1'), _vm('vm2')]
+        compute_client.virtual_machines.get.side_effect = lambda rg, name, expand: _vm(name)
+        network_client = network_client_factory.return_value
+        network_client.network_interfaces.list.return_value = [_nic('vm1', public_ip.id), _nic('vm2')]
+        network_client.public_ip_addresses.list.return_value = [public_ip]
+
+        result = list_vm(_get_test_cmd(), 'rg1', show_details=True)
+
+        self.assertEqual([(r.name, r.power_state, r.public_ips, r.fqdns, r.private_ips, r.mac_addresses) for r in result],
+                         [('vm1', 'VM running', '40.0.0.1', 'vm1.westus.cloudapp.azure.com', '10.0.0.1', '00-0D-3A-vm1'),
+                          ('vm2', 'VM running', '', '', '10.0.0.2', '00-0D-3A-vm2')])
+        self.assertEqual(compute_client.virtual_machines.get.call_count, 2)
+        network_client.network_interfaces.get.assert_not_called()
+        network_client.public_ip_addresses.get.assert_not_called()
+        # the network resources are listed in the resource group of the VMs only
+        network_client.network_interfaces.list.assert_called_once_with('rg1')
+        network_client.public_ip_addresses.list.assert_called_once_with('rg1')
+        network_client.network_interfaces.list_all.assert_not_called()
+        network_client.public_ip_addresses.list_all.assert_not_called()
+
     # pylint: disable=line-too-long
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._compute_client_factory', autospec=True)
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._get_keyvault_key_url', autospec=True)